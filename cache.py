@@ -0,0 +1,195 @@
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Environment variable naming the directory for shared_cache's disk tier
+CACHE_DIR_VARIABLE = "CPU_SCHEDULER_CACHE_DIR"
+
+@dataclass
+class CachedRun:
+    """Everything a run leaves behind: per-process results, schedule and metrics.
+    
+    schedule holds the (process_index, start, end) arrays of a ColumnarSchedule,
+    or None for metrics-only runs. metrics is filled in once get_metrics() has
+    been computed for the run.
+    """
+    remaining_time: np.ndarray
+    start_time: np.ndarray
+    completion_time: np.ndarray
+    context_switches: int
+    schedule: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    metrics: Optional[Dict[str, float]] = None
+    
+    def __post_init__(self):
+        # Hits hand these arrays out without copying, so nobody may write to them
+        for array in self._arrays():
+            array.flags.writeable = False
+            
+    def _arrays(self):
+        arrays = [self.remaining_time, self.start_time, self.completion_time]
+        if self.schedule is not None:
+            arrays.extend(self.schedule)
+        return arrays
+        
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self._arrays())
+        
+    def save(self, file):
+        arrays = {
+            'remaining_time': self.remaining_time,
+            'start_time': self.start_time,
+            'completion_time': self.completion_time,
+            'context_switches': np.array(self.context_switches),
+            'metrics': np.array(json.dumps(self.metrics))
+        }
+        if self.schedule is not None:
+            arrays['process_index'], arrays['start'], arrays['end'] = self.schedule
+        np.savez(file, **arrays)
+        
+    @classmethod
+    def load(cls, path: str) -> 'CachedRun':
+        with np.load(path) as data:
+            schedule = None
+            if 'process_index' in data:
+                schedule = (data['process_index'], data['start'], data['end'])
+            return cls(
+                data['remaining_time'],
+                data['start_time'],
+                data['completion_time'],
+                int(data['context_switches']),
+                schedule,
+                json.loads(data['metrics'].item())
+            )
+
+class ResultCache:
+    """Two-tier cache of simulation results keyed by content hash.
+    
+    The memory tier is an LRU bounded by `max_memory_bytes`. When `directory`
+    is given, entries are also written there as .npz files; the directory is
+    kept under `max_disk_bytes` by deleting the least recently used files.
+    Entries larger than a tier's budget are simply not stored in it.
+    """
+    
+    def __init__(self, max_memory_bytes: int = 256 << 20, directory: str = None,
+                 max_disk_bytes: int = 1 << 30):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.set_directory(directory)
+        
+    def __len__(self):
+        return len(self._memory)
+        
+    def set_directory(self, directory: Optional[str]):
+        """Keep entries on disk in `directory` from now on (None: memory only)"""
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        
+    def fits(self, nbytes: int) -> bool:
+        """Whether an entry of this size would be kept by either tier"""
+        return nbytes <= self.max_memory_bytes or (self.directory is not None and nbytes <= self.max_disk_bytes)
+        
+    def get(self, key: str) -> Optional[CachedRun]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry
+            
+        path = self._path(key)
+        if path is not None and os.path.exists(path):
+            try:
+                entry = CachedRun.load(path)
+            except (OSError, ValueError, KeyError):
+                # Truncated or foreign file: drop it and treat as a miss
+                self._remove_file(path)
+            else:
+                # Mark as recently used for disk eviction
+                os.utime(path)
+                self._remember(key, entry)
+                self.hits += 1
+                return entry
+                
+        self.misses += 1
+        return None
+        
+    def put(self, key: str, entry: CachedRun):
+        self._remember(key, entry)
+        path = self._path(key)
+        if path is None or entry.nbytes > self.max_disk_bytes:
+            return
+        # Write to a temporary file first so readers never see half an entry
+        handle, temporary = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                entry.save(file)
+            os.replace(temporary, path)
+        except OSError:
+            self._remove_file(temporary)
+            return
+        self._evict_disk()
+        
+    def clear(self):
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.npz'):
+                    self._remove_file(os.path.join(self.directory, name))
+                    
+    def _path(self, key):
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"{key}.npz")
+        
+    def _remember(self, key, entry):
+        """Insert into the memory tier, evicting least recently used entries"""
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old.nbytes
+        if entry.nbytes > self.max_memory_bytes:
+            return
+        self._memory[key] = entry
+        self._memory_bytes += entry.nbytes
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+            
+    def _evict_disk(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        # Oldest first
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            self._remove_file(path)
+            total -= size
+            
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# Cache used by every Scheduler unless it is given another one (or None). It also
+# keeps results on disk, across runs, in the directory named by CACHE_DIR_VARIABLE.
+shared_cache = ResultCache(directory=os.environ.get(CACHE_DIR_VARIABLE) or None)
@@ -0,0 +1,328 @@
+"""Headless entry point: run workloads, convert them and export simulation results.
+
+    python cli.py run trace.cpuw --algorithm "Round Robin" --quantum 4
+    python cli.py --cache-dir ~/.cache/cpu-scheduler run trace.cpuw
+    python cli.py run --generate 1000000 --arrivals mmpp --output metrics.csv
+    python cli.py run --generate 1000000 --rate 5 --cores 64 --balance-interval 100
+    python cli.py sweep trace.cpuw --quanta 1:100:5 --tune p99_response
+    python cli.py experiment --processes 1000 --rate 0.09 --metric avg_waiting --tolerance 0.02
+    python cli.py cluster --generate 1000000 --rate 50 --nodes 256 --dispatcher power-of-two
+    python cli.py convert trace.csv trace.cpuw
+    python cli.py export trace.cpuw --algorithm "Round Robin" --quantum 4 \
+        --results results.csv --schedule schedule.jsonl
+
+Workloads may be CSV, JSON Lines (.jsonl/.ndjson) or binary (.cpuw) files.
+Nothing here imports tkinter or matplotlib, and the simulator modules (and
+with them NumPy) are only imported once a command actually runs.
+"""
+import argparse
+import sys
+
+# Metrics shown by `run` in its text table, with their column headings
+SUMMARY_COLUMNS = (
+    ("avg_waiting", "avg wait"),
+    ("avg_turnaround", "avg turnaround"),
+    ("avg_response", "avg response"),
+    ("p99_response", "p99 response"),
+    ("cpu_utilization", "cpu %"),
+    ("throughput", "throughput"),
+    ("context_switches", "switches")
+)
+
+# Extra columns for multicore runs
+MULTICORE_COLUMNS = (
+    ("min_core_utilization", "min core %"),
+    ("max_core_utilization", "max core %"),
+    ("migrations", "migrations")
+)
+
+# Extra columns for cluster runs
+CLUSTER_COLUMNS = (
+    ("min_node_utilization", "min node %"),
+    ("max_node_utilization", "max node %")
+)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="CPU scheduling simulator without the GUI")
+    parser.add_argument("--cache-dir", metavar="DIR",
+                        help="keep simulation results in DIR and reuse them in later runs "
+                             "(default: $CPU_SCHEDULER_CACHE_DIR, if set)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run = commands.add_parser("run", help="simulate a workload and report its metrics")
+    source = run.add_mutually_exclusive_group(required=True)
+    source.add_argument("workload", nargs="?", help="workload file")
+    source.add_argument("--generate", type=int, metavar="N", help="use a synthetic workload of N processes")
+    run.add_argument("--algorithm", action="append",
+                     help="algorithm to run (repeat for several; default: all of them)")
+    run.add_argument("--quantum", type=positive_int, default=2, help="Round Robin time quantum")
+    run.add_argument("--output", help="also write the metrics to this .json, .jsonl or .csv file")
+    run.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    run.add_argument("--no-cache", action="store_true", help="always simulate, never reuse cached results")
+    run.add_argument("--workers", type=int, default=None,
+                     help="processes running the algorithms in parallel (default: one per CPU)")
+    add_multicore_arguments(run)
+    add_synthetic_arguments(run)
+    
+    sweep = commands.add_parser("sweep", help="run Round Robin over a range of time quanta")
+    source = sweep.add_mutually_exclusive_group(required=True)
+    source.add_argument("workload", nargs="?", help="workload file")
+    source.add_argument("--generate", type=int, metavar="N", help="use a synthetic workload of N processes")
+    sweep.add_argument("--quanta", default=None, metavar="LOW:HIGH[:STEP]",
+                       help="quanta to run (default: 1 to the longest burst in about 50 steps)")
+    sweep.add_argument("--tune", metavar="METRIC",
+                       help="instead search the range for the quantum with the best METRIC, e.g. avg_waiting")
+    sweep.add_argument("--workers", type=int, default=None, help="parallel processes (default: one per CPU)")
+    sweep.add_argument("--output", help="also write the metrics to this .json, .jsonl or .csv file")
+    sweep.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    add_synthetic_arguments(sweep)
+    
+    experiment = commands.add_parser("experiment", help="compare algorithms over many random workloads")
+    experiment.add_argument("--algorithm", action="append",
+                            help="algorithm to run (repeat for several; default: all of them)")
+    experiment.add_argument("--metric", action="append",
+                            help="metric to estimate (repeat for several; default: avg_waiting and p99_response)")
+    experiment.add_argument("--quantum", type=positive_int, default=2, help="Round Robin time quantum")
+    experiment.add_argument("--processes", type=int, default=1000, help="processes per workload")
+    experiment.add_argument("--confidence", type=float, default=0.95, help="confidence level of the intervals")
+    experiment.add_argument("--tolerance", type=float, default=0.02,
+                            help="stop once every interval is within this fraction of its mean")
+    experiment.add_argument("--min-runs", type=int, default=10)
+    experiment.add_argument("--max-runs", type=int, default=1000)
+    experiment.add_argument("--workers", type=int, default=None, help="parallel processes (default: one per CPU)")
+    experiment.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    add_synthetic_arguments(experiment)
+    
+    cluster = commands.add_parser("cluster", help="simulate a fleet of nodes fed by a dispatcher")
+    source = cluster.add_mutually_exclusive_group(required=True)
+    source.add_argument("workload", nargs="?", help="workload file")
+    source.add_argument("--generate", type=int, metavar="N", help="use a synthetic workload of N processes")
+    cluster.add_argument("--algorithm", default="FCFS", help="algorithm every node runs")
+    cluster.add_argument("--quantum", type=positive_int, default=2, help="Round Robin time quantum")
+    cluster.add_argument("--nodes", type=int, default=16, help="number of nodes")
+    cluster.add_argument("--dispatcher", default="least-loaded", help="round-robin, least-loaded or power-of-two")
+    cluster.add_argument("--window", type=int, default=100, help="synchronization window in time units")
+    cluster.add_argument("--workers", type=int, default=None,
+                         help="worker processes (default: one per CPU, 0 for none)")
+    cluster.add_argument("--per-node", action="store_true", help="also report every node's metrics")
+    cluster.add_argument("--output", help="also write the metrics to this .json, .jsonl or .csv file")
+    cluster.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    add_synthetic_arguments(cluster)
+    
+    convert = commands.add_parser("convert", help="convert a CSV/JSON Lines workload to the binary format")
+    convert.add_argument("source")
+    convert.add_argument("destination")
+    convert.add_argument("--batch-size", type=int, default=1 << 16, help="processes parsed at a time")
+    
+    export = commands.add_parser("export", help="simulate a workload and export its schedule and results")
+    export.add_argument("workload")
+    export.add_argument("--algorithm", default="FCFS")
+    export.add_argument("--quantum", type=positive_int, default=2, help="Round Robin time quantum")
+    export.add_argument("--results", help="per-process results file (.csv or .jsonl)")
+    export.add_argument("--schedule", help="schedule file (.csv or .jsonl)")
+    add_multicore_arguments(export)
+    return parser
+
+def positive_int(text):
+    """argparse type for options that must be at least 1, like the time quantum"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return value
+
+def add_synthetic_arguments(parser):
+    group = parser.add_argument_group("synthetic workloads")
+    group.add_argument("--arrivals", default="poisson", help="poisson or mmpp")
+    group.add_argument("--rate", type=float, default=0.1, help="mean arrivals per time unit")
+    group.add_argument("--bursts", default="exponential", help="exponential, pareto or lognormal")
+    group.add_argument("--mean-burst", type=float, default=10.0)
+    group.add_argument("--seed", type=int, default=None)
+
+def add_multicore_arguments(parser):
+    group = parser.add_argument_group("multicore")
+    group.add_argument("--cores", type=positive_int, default=1, help="number of simulated cores")
+    group.add_argument("--placement", default="least-loaded", help="least-loaded or round-robin")
+    group.add_argument("--no-steal", action="store_true", help="idle cores do not steal waiting processes")
+    group.add_argument("--balance-interval", type=int, default=None, metavar="T",
+                       help="rebalance the run queues every T time units")
+
+def multicore_scheduler(args, algorithm):
+    """MulticoreScheduler configured from the command line options"""
+    from smp import MulticoreScheduler
+    return MulticoreScheduler(algorithm, args.cores, args.quantum, args.placement,
+                              not args.no_steal, args.balance_interval)
+
+def load_source(args):
+    """The workload named on the command line, or the synthetic one asked for"""
+    if args.generate is not None:
+        from synthetic import generate_workload
+        return generate_workload(args.generate, arrivals=args.arrivals, rate=args.rate, bursts=args.bursts,
+                                 mean_burst=args.mean_burst, seed=args.seed)
+    from workload import read_workload
+    return read_workload(args.workload)
+
+def run_command(args) -> int:
+    from scheduler import ALGORITHMS
+    
+    algorithms = args.algorithm or list(ALGORITHMS)
+    unknown = [name for name in algorithms if name not in ALGORITHMS]
+    if unknown:
+        raise ValueError(f"Unknown algorithm: {unknown[0]} (choose from {', '.join(ALGORITHMS)})")
+        
+    table = load_source(args)
+    if args.cores > 1:
+        rows = []
+        for algorithm in algorithms:
+            multicore = multicore_scheduler(args, algorithm)
+            multicore.set_processes(table)
+            rows.append({'algorithm': algorithm, **multicore.run(metrics_only=True)})
+    else:
+        from cache import shared_cache
+        from compare import compare_algorithms
+        rows = compare_algorithms(table, algorithms, args.quantum, args.workers,
+                                  None if args.no_cache else shared_cache)
+                                  
+    report(args, rows)
+    return 0
+
+def sweep_command(args) -> int:
+    from compare import sweep_quantum, tune_quantum
+    table = load_source(args)
+    longest = int(table.burst_time.max()) if len(table) else 1
+    low, high, step = 1, longest, max(longest // 50, 1)
+    if args.quanta:
+        try:
+            bounds = [int(value) for value in args.quanta.split(":")]
+            low, high = bounds[:2]
+            step = bounds[2] if len(bounds) > 2 else 1
+        except ValueError:
+            raise ValueError(f"Invalid quantum range: {args.quanta} (expected LOW:HIGH or LOW:HIGH:STEP)") from None
+    if args.tune:
+        best, rows = tune_quantum(table, args.tune, low, high, workers=args.workers)
+        print(f"Best quantum for {args.tune}: {best} ({len(rows)} quanta simulated)")
+    else:
+        rows = sweep_quantum(table, range(low, high + 1, step), args.workers)
+    report(args, rows, key='time_quantum')
+    return 0
+
+def experiment_command(args) -> int:
+    from experiment import run_experiment
+    from scheduler import ALGORITHMS
+    workload = {'n': args.processes, 'arrivals': args.arrivals, 'rate': args.rate,
+                'bursts': args.bursts, 'mean_burst': args.mean_burst}
+    metrics = args.metric or ["avg_waiting", "p99_response"]
+    result = run_experiment(args.algorithm or ALGORITHMS, metrics, workload, args.quantum, args.confidence,
+                            args.tolerance, args.min_runs, args.max_runs, args.workers, args.seed)
+    if args.json:
+        import json
+        print(json.dumps({'runs': result.runs, 'converged': result.converged,
+                          'stats': result.stats, 'wins': result.wins}, indent=2))
+        return 0
+        
+    state = "converged" if result.converged else "did not converge"
+    print(f"{result.runs} workloads, {state} (intervals at {args.confidence:.0%} confidence)")
+    headings = ["algorithm"] + metrics + [f"best {metrics[0]}"]
+    lines = [[algorithm] + [f"{mean:.2f} ± {high - mean:.2f}" for mean, _, high in stats.values()] +
+             [str(result.wins[algorithm])] for algorithm, stats in result.stats.items()]
+    print_lines(headings, lines)
+    return 0
+
+def cluster_command(args) -> int:
+    from cluster import simulate_cluster
+    result = simulate_cluster(load_source(args), args.nodes, args.algorithm, args.quantum, args.dispatcher,
+                              args.window, args.workers, args.seed)
+    rows = [{'algorithm': f"{args.algorithm} x {args.nodes}", **result.metrics}]
+    if args.per_node:
+        rows += [{'algorithm': f"node {node}", **metrics} for node, metrics in enumerate(result.node_metrics)]
+    report(args, rows)
+    return 0
+
+def report(args, rows, key='algorithm'):
+    """Write the metric rows to --output if given, and print them as JSON or a table"""
+    if args.output:
+        write_rows(args.output, rows)
+    if args.json:
+        import json
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows, key)
+
+def print_table(rows, key='algorithm'):
+    """Print the summary metrics of each row as an aligned text table, labelled by `key`"""
+    columns = SUMMARY_COLUMNS + (MULTICORE_COLUMNS if 'migrations' in rows[0] else ())
+    columns += CLUSTER_COLUMNS if 'min_node_utilization' in rows[0] else ()
+    headings = [key.replace("_", " ")] + [heading for _, heading in columns]
+    lines = [[str(row[key])] + [format_cell(row.get(name, "")) for name, _ in columns] for row in rows]
+    print_lines(headings, lines)
+
+def print_lines(headings, lines):
+    """Print rows of cells aligned under their headings, the first column to the left"""
+    widths = [max(len(line[i]) for line in [headings] + lines) for i in range(len(headings))]
+    for line in [headings] + lines:
+        print("  ".join(cell.ljust(width) if i == 0 else cell.rjust(width)
+                        for i, (cell, width) in enumerate(zip(line, widths))))
+
+def format_cell(value):
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+def write_rows(path, rows):
+    """Write metric rows as JSON, JSON Lines or CSV, chosen by extension"""
+    import json
+    with open(path, "w", newline="") as file:
+        if path.lower().endswith(".json"):
+            json.dump(rows, file, indent=2)
+        elif path.lower().endswith((".jsonl", ".ndjson")):
+            file.writelines(json.dumps(row) + "\n" for row in rows)
+        else:
+            import csv
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+def convert_command(args) -> int:
+    from workload import convert_workload
+    count = convert_workload(args.source, args.destination, args.batch_size)
+    print(f"Wrote {count} processes to {args.destination}")
+    return 0
+
+def export_command(args) -> int:
+    from scheduler import Scheduler
+    from workload import export_results, export_schedule, read_workload
+    scheduler = Scheduler()
+    scheduler.set_processes(read_workload(args.workload))
+    scheduler.set_algorithm(args.algorithm, args.quantum)
+    if args.cores > 1:
+        multicore = multicore_scheduler(args, args.algorithm)
+        multicore.set_processes(scheduler.table)
+        schedule = multicore.run().compress()
+        scheduler.load_results(multicore.table, schedule)
+    else:
+        schedule = scheduler.run(event_driven=True, fast_forward=True, compress=True, columnar=True)
+    if args.results:
+        export_results(args.results, scheduler.table)
+    if args.schedule:
+        export_schedule(args.schedule, schedule)
+    return 0
+
+COMMANDS = {
+    "run": run_command,
+    "sweep": sweep_command,
+    "experiment": experiment_command,
+    "cluster": cluster_command,
+    "convert": convert_command,
+    "export": export_command
+}
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        if args.cache_dir:
+            from cache import shared_cache
+            shared_cache.set_directory(args.cache_dir)
+        return COMMANDS[args.command](args)
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+import heapq
+import math
+import multiprocessing
+import os
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from metrics import MetricsAccumulator
+from online import OnlineScheduler
+from scheduler import ALGORITHMS, UNSET, Process, ProcessTable
+
+# Ways the dispatcher can route an arrival to a node
+DISPATCHERS = ("round-robin", "least-loaded", "power-of-two")
+
+@dataclass
+class ClusterResult:
+    """Outcome of simulate_cluster.
+    
+    table holds the per-process results for the whole fleet and node[i] is
+    the node process i was sent to. metrics are fleet-wide, in the form of
+    Scheduler.get_metrics, and node_metrics[k] are those of node k alone.
+    """
+    table: ProcessTable
+    node: np.ndarray
+    metrics: Dict[str, float]
+    node_metrics: List[Dict[str, float]]
+
+class _NodeShard:
+    """The nodes simulated by one worker, each an OnlineScheduler"""
+    
+    def __init__(self, nodes, algorithm, time_quantum):
+        # Nothing is edited after the fact, so no checkpoints are needed
+        self.schedulers = {node: OnlineScheduler(algorithm, time_quantum, checkpoint_interval=math.inf)
+                           for node in nodes}
+        # Fleet-wide index of each process, in the order the node received them
+        self.indices = {node: [] for node in nodes}
+        
+    def advance(self, time, batches):
+        """Submit each node's new arrivals, simulate up to `time` and report the backlogs"""
+        for node, (indices, arrival, burst, priority) in batches.items():
+            scheduler = self.schedulers[node]
+            self.indices[node].extend(indices)
+            for index, arrival_time, burst_time, value in zip(indices, arrival, burst, priority):
+                scheduler.submit(Process(index, arrival_time, burst_time, value))
+        backlogs = {}
+        for node, scheduler in self.schedulers.items():
+            scheduler.advance_to(time)
+            backlogs[node] = scheduler.backlog
+        return backlogs
+        
+    def finish(self):
+        """Run every node to completion and return its results"""
+        results = {}
+        for node, scheduler in self.schedulers.items():
+            scheduler.run_to_completion()
+            arrival = np.array(scheduler.arrival, dtype=np.int64)
+            burst = np.array(scheduler.burst, dtype=np.int64)
+            start = np.array(scheduler.start, dtype=np.int64)
+            completion = np.array(scheduler.completion, dtype=np.int64)
+            accumulator = MetricsAccumulator()
+            accumulator.add(arrival, burst, start, completion, UNSET)
+            order = scheduler.schedule.process_index
+            switches = int(np.count_nonzero(order[1:] != order[:-1]))
+            results[node] = (np.array(self.indices[node], dtype=np.int64), start, completion,
+                             accumulator, switches)
+        return results
+
+def _serve(connection, nodes, algorithm, time_quantum):
+    """Worker process: run a shard of nodes on the requests sent over `connection`.
+    
+    Each reply is ("ok", result), or ("error", repr(exception)) once the shard
+    has failed, so the parent can raise it instead of finding the pipe closed.
+    """
+    try:
+        shard = _NodeShard(nodes, algorithm, time_quantum)
+        while True:
+            try:
+                request = connection.recv()
+            except EOFError:
+                # The parent gave up on the simulation
+                return
+            if request[0] == "advance":
+                connection.send(("ok", shard.advance(request[1], request[2])))
+            else:
+                connection.send(("ok", shard.finish()))
+                return
+    except Exception as exc:
+        connection.send(("error", repr(exc)))
+    finally:
+        connection.close()
+
+def _receive(shard):
+    """Result of a shard's last request, raising the error of a failed worker"""
+    try:
+        status, result = shard.recv()
+    except EOFError:
+        raise RuntimeError("A cluster worker exited unexpectedly") from None
+    if status == "error":
+        raise RuntimeError(f"A cluster worker failed: {result}")
+    return result
+
+class _LocalShard:
+    """A shard simulated in the calling process, with the same interface as a worker"""
+    
+    def __init__(self, nodes, algorithm, time_quantum):
+        self.shard = _NodeShard(nodes, algorithm, time_quantum)
+        self.reply = None
+        
+    def send(self, request):
+        if request[0] == "advance":
+            self.reply = ("ok", self.shard.advance(request[1], request[2]))
+        else:
+            self.reply = ("ok", self.shard.finish())
+            
+    def recv(self):
+        return self.reply
+        
+    def close(self):
+        pass
+
+def simulate_cluster(processes, nodes: int, algorithm: str, time_quantum: int = None,
+                     dispatcher: str = "least-loaded", window: int = 100,
+                     workers: int = None, seed: int = None) -> ClusterResult:
+    """Simulate a fleet of `nodes` machines, each scheduling its own processes.
+    
+    A dispatcher sends every arrival to one node: "round-robin" in turn,
+    "least-loaded" to the node with the fewest unfinished processes, and
+    "power-of-two" to the less loaded of two nodes picked at random (with
+    `seed`). Each node runs `algorithm` on its own OnlineScheduler.
+    
+    Nodes are spread over `workers` processes (default: one per CPU, 0 runs
+    everything in this process) and simulated in parallel with conservative
+    time windows. All arrivals of a window of `window` time units are routed
+    first, using the node backlogs reported at the start of the window plus
+    what was routed since. Then every node simulates up to the end of the
+    window before the next one is routed. The result does not depend on the
+    number of workers.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if dispatcher not in DISPATCHERS:
+        raise ValueError(f"Unknown dispatcher: {dispatcher}")
+    if nodes < 1:
+        raise ValueError("A cluster needs at least one node")
+    if window <= 0:
+        raise ValueError("The time window must be positive")
+    # Checked here, since a worker could only report it once it has started
+    if algorithm == "Round Robin" and (time_quantum is None or time_quantum <= 0):
+        raise ValueError("Round Robin needs a positive time quantum")
+    table = processes.copy() if isinstance(processes, ProcessTable) else ProcessTable.from_processes(processes)
+    n = len(table)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, nodes)
+    
+    # Node k is simulated by shard k % number of shards
+    shard_count = max(workers, 1)
+    shard_nodes = [list(range(shard, nodes, shard_count)) for shard in range(shard_count)]
+    children = []
+    if workers == 0:
+        shards = [_LocalShard(shard_nodes[0], algorithm, time_quantum)]
+    else:
+        context = multiprocessing.get_context()
+        shards = []
+        for members in shard_nodes:
+            parent, child = context.Pipe()
+            worker = context.Process(target=_serve, args=(child, members, algorithm, time_quantum), daemon=True)
+            worker.start()
+            child.close()
+            shards.append(parent)
+            children.append(worker)
+            
+    order = np.argsort(table.arrival_time, kind='stable')
+    arrival = table.arrival_time[order]
+    node = np.empty(n, dtype=np.int64)
+    backlog = [0] * nodes
+    rng = np.random.default_rng(seed)
+    dealt = 0
+    
+    def advance(time, routed):
+        """One synchronization round: hand out the routed arrivals and run every node to `time`"""
+        for shard, members in zip(shards, shard_nodes):
+            batches = {}
+            for member in members:
+                indices = routed.get(member)
+                if indices is not None:
+                    batches[member] = (indices.tolist(), table.arrival_time[indices].tolist(),
+                                       table.burst_time[indices].tolist(), table.priority[indices].tolist())
+            shard.send(("advance", time, batches))
+        for shard in shards:
+            for member, count in _receive(shard).items():
+                backlog[member] = count
+                
+    try:
+        position = 0
+        window_start = 0
+        while position < n:
+            if arrival[position] >= window_start + window:
+                # Skip the empty windows, letting the nodes catch up first
+                window_start = int(arrival[position]) // window * window
+                advance(window_start, {})
+            window_end = window_start + window
+            stop = int(np.searchsorted(arrival, window_end, side='left'))
+            batch = order[position:stop]
+            
+            # Route the window's arrivals on the backlogs known at its start
+            if dispatcher == "round-robin":
+                targets = (dealt + np.arange(len(batch))) % nodes
+                dealt = (dealt + len(batch)) % nodes
+            elif dispatcher == "least-loaded":
+                targets = np.empty(len(batch), dtype=np.int64)
+                heap = [(count, member) for member, count in enumerate(backlog)]
+                heapq.heapify(heap)
+                for k in range(len(batch)):
+                    count, member = heap[0]
+                    targets[k] = member
+                    heapq.heapreplace(heap, (count + 1, member))
+            else:
+                targets = np.empty(len(batch), dtype=np.int64)
+                estimate = list(backlog)
+                for k, (first, second) in enumerate(rng.integers(nodes, size=(len(batch), 2)).tolist()):
+                    member = second if estimate[second] < estimate[first] else first
+                    targets[k] = member
+                    estimate[member] += 1
+            node[batch] = targets
+            
+            # Group the batch by node, keeping arrival order within each node
+            grouping = np.argsort(targets, kind='stable')
+            members, starts = np.unique(targets[grouping], return_index=True)
+            routed = dict(zip(members.tolist(), np.split(batch[grouping], starts[1:])))
+            advance(window_end, routed)
+            position = stop
+            window_start = window_end
+            
+        for shard in shards:
+            shard.send(("finish",))
+        results = {}
+        for shard in shards:
+            results.update(_receive(shard))
+    finally:
+        # Closing the pipes lets workers that are still waiting for a request exit
+        for shard in shards:
+            shard.close()
+        for worker in children:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+                
+    # Gather the per-process results and merge the nodes' metrics
+    fleet = MetricsAccumulator()
+    node_metrics = []
+    busy = np.zeros(nodes, dtype=np.int64)
+    switches = 0
+    for member in range(nodes):
+        indices, start, completion, accumulator, context_switches = results[member]
+        table.start_time[indices] = start
+        table.completion_time[indices] = completion
+        fleet.merge(accumulator)
+        metrics = accumulator.result()
+        metrics['context_switches'] = context_switches
+        metrics['processes'] = len(indices)
+        node_metrics.append(metrics)
+        busy[member] = accumulator.total_burst
+        switches += context_switches
+    done = table.completion_time != UNSET
+    table.remaining_time[done] = 0
+    started = table.start_time != UNSET
+    table.response_time[started] = table.start_time[started] - table.arrival_time[started]
+    
+    metrics = fleet.result()
+    metrics['cpu_utilization'] /= nodes
+    utilization = busy / fleet.makespan * 100 if fleet.makespan > 0 else np.zeros(nodes)
+    metrics['min_node_utilization'] = float(utilization.min())
+    metrics['max_node_utilization'] = float(utilization.max())
+    metrics['context_switches'] = switches
+    metrics['processes'] = n
+    return ClusterResult(table, node, metrics, node_metrics)
@@ -0,0 +1,166 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from cache import ResultCache, shared_cache
+from scheduler import ALGORITHMS, ProcessTable, Scheduler
+
+# Metrics where a larger value is better; everything else is minimized
+HIGHER_IS_BETTER = ("cpu_utilization", "throughput", "fairness")
+
+# Shared memory attached by a pool worker, and the workload columns viewed onto it
+_segment = None
+_columns = None
+
+def _layout(buffer, n, runs):
+    """Views onto a shared block: arrival, burst and priority, then start and completion per run"""
+    block = np.ndarray((3 + 2 * runs, n), dtype=np.int64, buffer=buffer)
+    return block[:3], block[3:].reshape(runs, 2, n)
+
+def _attach(name, n, runs):
+    """Pool initializer: map the workload once per worker instead of once per task"""
+    global _segment, _columns
+    _segment = shared_memory.SharedMemory(name=name)
+    _columns = _layout(_segment.buf, n, runs)
+
+def _simulate(table, algorithm, time_quantum, results):
+    """Run one algorithm metrics-only and store its start and completion times in `results`"""
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(table)
+    scheduler.set_algorithm(algorithm, time_quantum)
+    metrics = scheduler.run(event_driven=True, fast_forward=True, metrics_only=True)
+    results[0] = scheduler.table.start_time
+    results[1] = scheduler.table.completion_time
+    return metrics
+
+def _run_shared(slot, algorithm, time_quantum):
+    """Pool task: simulate on the shared workload, writing the results into its slot"""
+    (arrival, burst, priority), results = _columns
+    return _simulate(ProcessTable(arrival, burst, priority), algorithm, time_quantum, results[slot])
+
+def compare_algorithms(processes, algorithms=ALGORITHMS, time_quantum: int = 2,
+                       workers: int = None, cache: Optional[ResultCache] = shared_cache) -> List[Dict[str, float]]:
+    """Run several algorithms on one workload in a process pool.
+    
+    Returns one row per algorithm, in the order given: {'algorithm': name}
+    followed by its Scheduler.get_metrics() metrics. Runs found in `cache`
+    are not simulated again, and new runs are added to it.
+    
+    The workload is copied once into a shared memory block that every worker
+    maps, and the workers write the per-process results back into the same
+    block, so nothing of size O(processes) is pickled. `workers` defaults to
+    one per CPU; with one worker (or one run to do) everything runs in this
+    process.
+    """
+    unknown = [name for name in algorithms if name not in ALGORITHMS]
+    if unknown:
+        raise ValueError(f"Unknown algorithm: {unknown[0]}")
+    runs = [(algorithm, time_quantum) for algorithm in algorithms]
+    return [{'algorithm': algorithm, **metrics}
+            for algorithm, metrics in zip(algorithms, run_parallel(processes, runs, workers, cache))]
+
+def run_parallel(processes, runs, workers: int = None,
+                 cache: Optional[ResultCache] = shared_cache) -> List[Dict[str, float]]:
+    """Metrics of each (algorithm, time_quantum) run on one workload, as compare_algorithms does it"""
+    table = processes if isinstance(processes, ProcessTable) else ProcessTable.from_processes(processes)
+    schedulers = []
+    for algorithm, time_quantum in runs:
+        scheduler = Scheduler(cache)
+        scheduler.set_processes(table)
+        scheduler.set_algorithm(algorithm, time_quantum)
+        schedulers.append(scheduler)
+    metrics = [scheduler.cached_metrics() for scheduler in schedulers]
+    missing = [k for k, found in enumerate(metrics) if found is None]
+    
+    n = len(table)
+    workers = min(workers or os.cpu_count() or 1, len(missing))
+    if workers <= 1 or n == 0:
+        for k in missing:
+            results = np.empty((2, n), dtype=np.int64)
+            found = _simulate(table, *runs[k], results)
+            schedulers[k].load_metrics_run(results[0], results[1], found['context_switches'], found)
+            metrics[k] = found
+    else:
+        segment = shared_memory.SharedMemory(create=True, size=8 * (3 + 2 * len(missing)) * n)
+        columns = results = None
+        try:
+            columns, results = _layout(segment.buf, n, len(missing))
+            columns[:] = (table.arrival_time, table.burst_time, table.priority)
+            with ProcessPoolExecutor(workers, initializer=_attach,
+                                     initargs=(segment.name, n, len(missing))) as pool:
+                futures = [pool.submit(_run_shared, slot, *runs[k]) for slot, k in enumerate(missing)]
+                for slot, (k, future) in enumerate(zip(missing, futures)):
+                    found = future.result()
+                    start, completion = results[slot]
+                    schedulers[k].load_metrics_run(start, completion, found['context_switches'], found)
+                    metrics[k] = found
+        finally:
+            # The views must go before the block can be closed
+            columns = results = start = completion = None
+            segment.close()
+            segment.unlink()
+    return metrics
+
+def sweep_quantum(processes, quanta, workers: int = None,
+                  cache: Optional[ResultCache] = shared_cache) -> List[Dict[str, float]]:
+    """Round Robin metrics for each time quantum, as rows {'time_quantum': q, ...metrics}"""
+    quanta = [int(q) for q in quanta]
+    if any(q <= 0 for q in quanta):
+        raise ValueError("Time quanta must be positive")
+    runs = [("Round Robin", q) for q in quanta]
+    return [{'time_quantum': q, **metrics}
+            for q, metrics in zip(quanta, run_parallel(processes, runs, workers, cache))]
+
+def tune_quantum(processes, objective: str = "avg_waiting", low: int = 1, high: int = None,
+                 points: int = 8, workers: int = None, cache: Optional[ResultCache] = shared_cache):
+    """Search for the Round Robin time quantum with the best `objective`.
+    
+    `objective` is a metric name; it is maximized for the metrics in
+    HIGHER_IS_BETTER and minimized otherwise. The search evaluates `points`
+    quanta (at least 4) spread geometrically over [low, high] (high defaults
+    to the longest burst, beyond which Round Robin behaves like FCFS), then
+    repeatedly zooms in on the interval around the best one until it is
+    down to consecutive integers. Each round is one parallel sweep, and
+    quanta evaluated before (in this search or any earlier one) come from
+    the cache. Returns (best quantum, rows of every quantum evaluated,
+    sorted by quantum).
+    """
+    table = processes if isinstance(processes, ProcessTable) else ProcessTable.from_processes(processes)
+    if high is None:
+        high = int(table.burst_time.max()) if len(table) else low
+    if not 1 <= low <= high:
+        raise ValueError("The quantum range must satisfy 1 <= low <= high")
+    sign = -1 if objective in HIGHER_IS_BETTER else 1
+    evaluated = {}
+    
+    def score(q):
+        # Ties go to the larger quantum, which costs fewer context switches
+        return (sign * evaluated[q][objective], -q)
+        
+    # With 3 points the interval around a best middle point is the whole range again
+    points = max(points, 4)
+    exhaustive = False
+    while True:
+        exhaustive = exhaustive or high - low < points
+        if exhaustive:
+            grid = np.arange(low, high + 1)
+        else:
+            grid = np.unique(np.geomspace(low, high, points).round().astype(np.int64))
+        new = [q for q in grid.tolist() if q not in evaluated]
+        for row in sweep_quantum(table, new, workers, cache):
+            if objective not in row:
+                raise ValueError(f"Unknown objective: {objective}")
+            evaluated[row['time_quantum']] = row
+        if exhaustive:
+            break
+        # Zoom in on the neighbours of the best quantum of this grid
+        position = min(range(len(grid)), key=lambda k: score(int(grid[k])))
+        narrowed = int(grid[max(position - 1, 0)]), int(grid[min(position + 1, len(grid) - 1)])
+        # Rounding may leave too few distinct quanta to narrow the range; then try all of it
+        exhaustive = narrowed == (low, high)
+        low, high = narrowed
+    best = min(evaluated, key=score)
+    return best, [evaluated[q] for q in sorted(evaluated)]
@@ -0,0 +1,123 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+import numpy as np
+
+from compare import HIGHER_IS_BETTER
+from metrics import RunningStats, empty_metrics
+from scheduler import ALGORITHMS, Scheduler
+from synthetic import generate_workload
+
+@dataclass
+class ExperimentResult:
+    """Outcome of run_experiment.
+    
+    stats[algorithm][metric] is (mean, low, high): the mean over all runs and
+    its confidence interval. wins[algorithm] counts the workloads on which
+    the algorithm had the best value of the first metric, the highest for
+    the metrics in HIGHER_IS_BETTER and the lowest otherwise (ties count for
+    every algorithm sharing it). converged tells whether the intervals got
+    tight enough before max_runs.
+    """
+    runs: int
+    converged: bool
+    stats: Dict[str, Dict[str, Tuple[float, float, float]]]
+    wins: Dict[str, int] = field(default_factory=dict)
+
+def _replicate(seed, workload, algorithms, time_quantum, metrics):
+    """One run of the experiment: draw a workload and measure every algorithm on it"""
+    table = generate_workload(seed=seed, **workload)
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(table)
+    values = []
+    for algorithm in algorithms:
+        scheduler.set_algorithm(algorithm, time_quantum)
+        found = scheduler.run(event_driven=True, fast_forward=True, metrics_only=True)
+        values.append([found[name] for name in metrics])
+    return np.array(values, dtype=np.float64)
+
+def run_experiment(algorithms=ALGORITHMS, metrics=("avg_waiting", "p99_response"),
+                   workload: Dict = None, time_quantum: int = 2, confidence: float = 0.95,
+                   tolerance: float = 0.02, min_runs: int = 10, max_runs: int = 1000,
+                   workers: int = None, seed: int = None, progress=None) -> ExperimentResult:
+    """Compare algorithms over many random workloads, stopping once the answer is known.
+    
+    Every run draws a workload with generate_workload(**workload) (by
+    default 1000 processes with its default distributions) and simulates
+    each algorithm on it. The metrics are folded into running means and
+    variances as the runs come in, and the experiment stops as soon as, after
+    at least `min_runs` runs, every confidence interval's half-width is
+    within `tolerance` of its mean, or after `max_runs` runs.
+    
+    Runs are spread over `workers` processes (default: one per CPU; 0 or 1
+    runs them here). Each run's workload is seeded from `seed` and its run
+    number, and results are folded in run order, so the outcome, including
+    where it stops, does not depend on the number of workers. `progress`, if
+    given, is called with the runs done and the current result after each
+    run.
+    """
+    unknown = [name for name in algorithms if name not in ALGORITHMS]
+    if unknown:
+        raise ValueError(f"Unknown algorithm: {unknown[0]}")
+    known = set(empty_metrics()) | {'context_switches'}
+    unknown = [name for name in metrics if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown metric: {unknown[0]}")
+    if not 1 <= min_runs <= max_runs:
+        raise ValueError("Need 1 <= min_runs <= max_runs")
+    algorithms, metrics = list(algorithms), list(metrics)
+    workload = {'n': 1000, **(workload or {})}
+    # Independent streams: run r draws from the child sequence with spawn key (r,)
+    entropy = np.random.SeedSequence(seed).entropy
+    seeds = (np.random.SeedSequence(entropy, spawn_key=(r,)) for r in range(max_runs))
+    stats = {algorithm: RunningStats() for algorithm in algorithms}
+    wins = np.zeros(len(algorithms), dtype=np.int64)
+    best = np.max if metrics[0] in HIGHER_IS_BETTER else np.min
+    
+    def fold(values):
+        """Add one run's values; True once every interval is tight enough"""
+        for algorithm, row in zip(algorithms, values):
+            stats[algorithm].add(row)
+        first = values[:, 0]
+        wins[:] += first == best(first)
+        done = stats[algorithms[0]].count
+        if progress is not None:
+            progress(done, result(False))
+        if done < min_runs:
+            return False
+        return all(np.all(stat.half_width(confidence) <= tolerance * np.abs(stat.mean)) for stat in stats.values())
+        
+    def result(converged):
+        table = {}
+        for algorithm, stat in stats.items():
+            half = stat.half_width(confidence)
+            table[algorithm] = {name: (float(mean), float(mean - width), float(mean + width))
+                                for name, mean, width in zip(metrics, stat.mean, half)}
+        return ExperimentResult(stats[algorithms[0]].count, converged, table,
+                                dict(zip(algorithms, wins.tolist())))
+                                
+    workers = min(workers or os.cpu_count() or 1, max_runs)
+    if workers <= 1:
+        for run_seed in seeds:
+            if fold(_replicate(run_seed, workload, algorithms, time_quantum, metrics)):
+                return result(True)
+        return result(False)
+        
+    with ProcessPoolExecutor(workers) as pool:
+        # Keep every worker busy with a couple of runs queued, but no more,
+        # so little is wasted once the intervals are tight
+        pending = []
+        for run_seed in seeds:
+            pending.append(pool.submit(_replicate, run_seed, workload, algorithms, time_quantum, metrics))
+            if len(pending) < 2 * workers:
+                continue
+            if fold(pending.pop(0).result()):
+                pool.shutdown(cancel_futures=True)
+                return result(True)
+        for future in pending:
+            if fold(future.result()):
+                pool.shutdown(cancel_futures=True)
+                return result(True)
+    return result(False)
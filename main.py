@@ -1,14 +1,18 @@
+import os
 import tkinter as tk
-from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from tkinter import ttk, messagebox, filedialog
 import numpy as np
-from scheduler import Process, Scheduler
+from scheduler import ColumnarSchedule, Process, ProcessTable, Scheduler
+from online import OnlineScheduler
+from smp import MulticoreScheduler
+from synthetic import ARRIVAL_MODELS, BURST_MODELS, generate_workload
+from workload import export_results, export_schedule, read_workload
 import time
-from task_manager import TaskManagerWindow
 
 class CPUSchedulerGUI:
+    # Rows listed in the process table after importing a workload
+    PROCESS_TREE_LIMIT = 1000
+    
     def __init__(self, root):
         self.root = root
         self.root.title("CPU Scheduling Simulator")
@@ -40,6 +44,8 @@ class CPUSchedulerGUI:
         
         # Initialize scheduler
         self.scheduler = Scheduler()
+        # Simulation behind the results on screen, kept so edits can be folded in
+        self.online = None
         
         # Set default algorithm
         self.selected_algorithm = 'FCFS'
@@ -119,7 +125,7 @@ class CPUSchedulerGUI:
         # Delete process button
         self.delete_btn = ttk.Button(self.left_frame, text="Delete Selected Process", command=self.delete_process)
         self.delete_btn.grid(row=2, column=0, pady=5)
-            
+        
     def create_algorithm_selection(self):
         """Create the algorithm selection section"""
         # Algorithm selection section
@@ -143,6 +149,12 @@ class CPUSchedulerGUI:
         control_frame = ttk.LabelFrame(self.left_frame, text="Controls")
         control_frame.grid(row=4, column=0, sticky="ew", padx=5, pady=5)
         
+        # Number of simulated CPU cores
+        ttk.Label(control_frame, text="Cores:").grid(row=0, column=0, padx=5, pady=5)
+        self.cores_var = tk.StringVar(value="1")
+        self.cores_entry = ttk.Entry(control_frame, textvariable=self.cores_var)
+        self.cores_entry.grid(row=0, column=1, padx=5, pady=5)
+        
         # Time Quantum for RR
         ttk.Label(control_frame, text="Time Quantum:").grid(row=1, column=0, padx=5, pady=5)
         self.time_quantum_var = tk.StringVar(value="2")
@@ -156,10 +168,31 @@ class CPUSchedulerGUI:
         self.reset_btn = ttk.Button(control_frame, text="Reset", command=self.reset_simulation)
         self.reset_btn.grid(row=3, column=0, columnspan=2, pady=5)
         
+        # Workload files
+        self.import_btn = ttk.Button(control_frame, text="Import Workload", command=self.import_workload)
+        self.import_btn.grid(row=4, column=0, padx=5, pady=5)
+        
+        self.export_btn = ttk.Button(control_frame, text="Export Results", command=self.export_simulation)
+        self.export_btn.grid(row=4, column=1, padx=5, pady=5)
+        
+        self.generate_btn = ttk.Button(control_frame, text="Generate Workload", command=self.open_generator_dialog)
+        self.generate_btn.grid(row=5, column=0, columnspan=2, pady=5)
+        
+        # Every algorithm on the same workload, in parallel
+        self.compare_btn = ttk.Button(control_frame, text="Compare All Algorithms", command=self.compare_algorithms)
+        self.compare_btn.grid(row=6, column=0, columnspan=2, pady=5)
+        
+        # Round Robin over a range of time quanta
+        self.sweep_btn = ttk.Button(control_frame, text="Quantum Sweep", command=self.open_quantum_sweep)
+        self.sweep_btn.grid(row=7, column=0, columnspan=2, pady=5)
+        
     def on_algorithm_change(self, event=None):
         """Handle algorithm selection change"""
         self.selected_algorithm = self.algorithm_var.get()
         
+        # Results on screen belong to the previous algorithm, so edits stop updating them
+        self.online = None
+        
         # Enable/disable time quantum based on algorithm
         if self.selected_algorithm == 'Round Robin':
             self.time_quantum_entry.config(state='normal')
@@ -177,7 +210,7 @@ class CPUSchedulerGUI:
             self.priority_note.grid_remove()
             
         # Update the visualization if we have a schedule
-        if hasattr(self, 'scheduler') and self.scheduler.schedule:
+        if hasattr(self, 'scheduler') and len(self.scheduler.schedule):
             self.update_visualization(self.scheduler.schedule)
             
     def create_visualization_section(self):
@@ -190,23 +223,15 @@ class CPUSchedulerGUI:
         self.gantt_frame = ttk.LabelFrame(self.visualization_frame, text="Gantt Chart")
         self.gantt_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Increase the size of the Gantt chart
-        self.gantt_fig = plt.Figure(figsize=(8, 4))
-        self.gantt_ax = self.gantt_fig.add_subplot(111)
-        self.gantt_canvas = FigureCanvasTkAgg(self.gantt_fig, master=self.gantt_frame)
-        self.gantt_canvas.draw()
-        self.gantt_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
         # Create metrics visualization
         self.metrics_frame = ttk.LabelFrame(self.visualization_frame, text="Scheduling Metrics")
         self.metrics_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Increase the size of the metrics chart
-        self.metrics_fig = plt.Figure(figsize=(8, 3))
-        self.metrics_ax = self.metrics_fig.add_subplot(111)
-        self.metrics_canvas = FigureCanvasTkAgg(self.metrics_fig, master=self.metrics_frame)
-        self.metrics_canvas.draw()
-        self.metrics_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # The figures are created by create_charts() once there is something to draw
+        self.gantt_canvas = None
+        
+        # The comparison table is created by show_comparison() the first time it is needed
+        self.comparison_frame = None
         
         # Create performance metrics section
         self.performance_frame = ttk.LabelFrame(self.visualization_frame, text="Performance Metrics")
@@ -222,6 +247,37 @@ class CPUSchedulerGUI:
         self.throughput_label = ttk.Label(self.performance_frame, textvariable=self.throughput_var)
         self.throughput_label.pack(anchor=tk.W, padx=5, pady=2)
         
+        # Tail latency
+        self.tail_latency_var = tk.StringVar(value="Waiting p50/p95/p99: - / - / -")
+        self.tail_latency_label = ttk.Label(self.performance_frame, textvariable=self.tail_latency_var)
+        self.tail_latency_label.pack(anchor=tk.W, padx=5, pady=2)
+        
+        # Fairness
+        self.fairness_var = tk.StringVar(value="Fairness (Jain): -")
+        self.fairness_label = ttk.Label(self.performance_frame, textvariable=self.fairness_var)
+        self.fairness_label.pack(anchor=tk.W, padx=5, pady=2)
+        
+    def create_charts(self):
+        """Create the Gantt and metrics figures, importing matplotlib on first use"""
+        if self.gantt_canvas is not None:
+            return
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        # Increase the size of the Gantt chart
+        self.gantt_fig = plt.Figure(figsize=(8, 4))
+        self.gantt_ax = self.gantt_fig.add_subplot(111)
+        self.gantt_canvas = FigureCanvasTkAgg(self.gantt_fig, master=self.gantt_frame)
+        self.gantt_canvas.draw()
+        self.gantt_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        # Increase the size of the metrics chart
+        self.metrics_fig = plt.Figure(figsize=(8, 3))
+        self.metrics_ax = self.metrics_fig.add_subplot(111)
+        self.metrics_canvas = FigureCanvasTkAgg(self.metrics_fig, master=self.metrics_frame)
+        self.metrics_canvas.draw()
+        self.metrics_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
     def create_task_manager_section(self):
         # Task Manager section
         self.task_manager_frame = ttk.Frame(self.left_frame)
@@ -279,7 +335,7 @@ class CPUSchedulerGUI:
             if "Priority" in self.selected_algorithm and priority < 1:
                 messagebox.showerror("Error", "Priority must be greater than 0")
                 return
-            
+                
             # Create process object
             process = Process(
                 pid=pid,
@@ -291,6 +347,11 @@ class CPUSchedulerGUI:
             # Add to process list
             self.processes.append(process)
             
+            # Fold it into the results on screen, re-simulating from the last checkpoint before it arrives
+            if self.online is not None:
+                self.online.insert(process)
+                self.show_online_results()
+                
             # Update process table
             self.process_tree.insert('', 'end', values=(
                 pid,
@@ -321,11 +382,158 @@ class CPUSchedulerGUI:
         pid = self.process_tree.item(selected_item[0], "values")[0]
         
         # Remove from process list
+        removed = [index for index, p in enumerate(self.processes) if p.pid == pid]
         self.processes = [p for p in self.processes if p.pid != pid]
         
         # Remove from treeview
         self.process_tree.delete(selected_item[0])
+        
+        # Update the results on screen from the last checkpoint before the process arrived
+        if self.online is not None:
+            if self.processes:
+                for index in reversed(removed):
+                    self.online.remove(index)
+                self.show_online_results()
+            else:
+                self.online = None
+                
+    def import_workload(self):
+        """Replace the process list with a CSV, JSON Lines or binary workload file"""
+        path = filedialog.askopenfilename(
+            title="Import Workload",
+            filetypes=[("Workload files", "*.csv *.jsonl *.ndjson *.cpuw"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            table = read_workload(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not import {os.path.basename(path)}: {str(e)}")
+            return
+        self.set_workload(table)
+        
+    def set_workload(self, table):
+        """Replace the process list with the processes of a ProcessTable.
+        
+        The table is kept as it is (a memory-mapped one stays unread) and
+        Process objects are only built once editing or the online simulation
+        needs them; comparisons, sweeps and recommendations run on the table.
+        """
+        self.reset_simulation()
+        self.workload = table
+        
+        # Listing every row of a large trace would freeze the window, so only the first rows are shown
+        shown = min(len(table), self.PROCESS_TREE_LIMIT)
+        for pid, arrival_time, burst_time, priority in zip(
+                table.pid[:shown].tolist(), table.arrival_time[:shown].tolist(),
+                table.burst_time[:shown].tolist(), table.priority[:shown].tolist()):
+            self.process_tree.insert('', 'end', values=(
+                self.display_pid(pid),
+                arrival_time,
+                burst_time,
+                priority if "Priority" in self.selected_algorithm else "-"
+            ))
+        if len(table) > self.PROCESS_TREE_LIMIT:
+            messagebox.showinfo("Workload", f"Loaded {len(table)} processes; "
+                                f"the list shows the first {self.PROCESS_TREE_LIMIT}.")
             
+        self.process_counter = len(table) + 1
+        self.pid_var.set(f"P{self.process_counter}")
+        
+    @staticmethod
+    def display_pid(pid):
+        """Numeric pids get the "P" prefix used for processes typed in by hand"""
+        return pid if isinstance(pid, str) else f"P{pid}"
+        
+    @property
+    def processes(self):
+        """Process objects of the workload, built from an imported table on first use"""
+        if self.workload is not None:
+            table = self.workload
+            self._processes = [
+                Process(self.display_pid(pid), arrival_time, burst_time, priority)
+                for pid, arrival_time, burst_time, priority in zip(
+                    table.pid.tolist(), table.arrival_time.tolist(), table.burst_time.tolist(), table.priority.tolist())
+            ]
+            self.workload = None
+        return self._processes
+        
+    @processes.setter
+    def processes(self, processes):
+        self.workload = None
+        self._processes = processes
+        
+    def current_workload(self):
+        """The imported ProcessTable while no Process objects were needed, else the process list"""
+        return self.workload if self.workload is not None else self.processes
+        
+    def open_generator_dialog(self):
+        """Ask for synthetic workload parameters and load the generated processes"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Generate Workload")
+        dialog.transient(self.root)
+        
+        fields = [
+            ("Processes:", tk.StringVar(value="100")),
+            ("Arrival rate:", tk.StringVar(value="0.1")),
+            ("Mean burst:", tk.StringVar(value="10")),
+            ("Priority levels:", tk.StringVar(value="5")),
+            ("Seed:", tk.StringVar(value="1"))
+        ]
+        for row, (label, var) in enumerate(fields):
+            ttk.Label(dialog, text=label).grid(row=row, column=0, padx=5, pady=5, sticky="w")
+            ttk.Entry(dialog, textvariable=var, width=12).grid(row=row, column=1, padx=5, pady=5)
+            
+        arrivals_var = tk.StringVar(value=ARRIVAL_MODELS[0])
+        ttk.Label(dialog, text="Arrivals:").grid(row=len(fields), column=0, padx=5, pady=5, sticky="w")
+        ttk.Combobox(dialog, textvariable=arrivals_var, values=ARRIVAL_MODELS, state="readonly",
+                     width=10).grid(row=len(fields), column=1, padx=5, pady=5)
+        bursts_var = tk.StringVar(value=BURST_MODELS[0])
+        ttk.Label(dialog, text="Bursts:").grid(row=len(fields) + 1, column=0, padx=5, pady=5, sticky="w")
+        ttk.Combobox(dialog, textvariable=bursts_var, values=BURST_MODELS, state="readonly",
+                     width=10).grid(row=len(fields) + 1, column=1, padx=5, pady=5)
+                     
+        def generate():
+            try:
+                count, rate, mean_burst, levels, seed = (var.get() for _, var in fields)
+                table = generate_workload(
+                    int(count), arrivals=arrivals_var.get(), rate=float(rate),
+                    bursts=bursts_var.get(), mean_burst=float(mean_burst),
+                    priorities=int(levels), seed=int(seed)
+                )
+            except ValueError as e:
+                messagebox.showerror("Error", f"Invalid workload parameters: {str(e)}", parent=dialog)
+                return
+            dialog.destroy()
+            self.set_workload(table)
+            
+        ttk.Button(dialog, text="Generate", command=generate).grid(
+            row=len(fields) + 2, column=0, columnspan=2, pady=10)
+            
+    def export_simulation(self):
+        """Write the per-process results and the schedule of the last simulation"""
+        if not len(self.scheduler.schedule):
+            messagebox.showerror("Error", "Run a simulation before exporting its results.")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export Results",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")]
+        )
+        if not path:
+            return
+            
+        # The schedule goes next to the results, e.g. results.csv and results_schedule.csv
+        stem, extension = os.path.splitext(path)
+        schedule_path = f"{stem}_schedule{extension}"
+        try:
+            export_results(path, self.scheduler.table)
+            export_schedule(schedule_path, self.scheduler.schedule)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not export results: {str(e)}")
+            return
+        messagebox.showinfo("Export Results", f"Saved {os.path.basename(path)} and {os.path.basename(schedule_path)}")
+        
     def start_simulation(self):
         """Start the CPU scheduling simulation"""
         if not self.processes:
@@ -347,40 +555,210 @@ class CPUSchedulerGUI:
                 messagebox.showerror("Error", "Time quantum must be a valid integer.")
                 return
                 
-        # Run the scheduling algorithm
         try:
-            # Create a copy of processes to avoid modifying the original list
-            process_copies = [Process(p.pid, p.arrival_time, p.burst_time, p.priority) for p in self.processes]
-            
-            # Set up the scheduler with the copied processes
-            self.scheduler.processes = process_copies
+            cores = int(self.cores_var.get())
+            if cores <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "The number of cores must be a positive integer.")
+            return
             
+        # Run the scheduling algorithm
+        try:
             # Run the appropriate scheduling algorithm
-            if algorithm == 'FCFS':
-                schedule = self.scheduler.fcfs()
-            elif algorithm == 'SJF':
-                schedule = self.scheduler.sjf()
-            elif algorithm == 'SJF Preemptive':
-                schedule = self.scheduler.sjf_preemptive()
-            elif algorithm == 'Round Robin':
-                schedule = self.scheduler.round_robin(time_quantum)
-            elif algorithm == 'Priority':
-                schedule = self.scheduler.priority()
-            elif algorithm == 'Priority Preemptive':
-                schedule = self.scheduler.priority_preemptive()
-            else:
+            if algorithm not in self.algorithm_combo['values']:
                 messagebox.showerror("Error", "Invalid algorithm selected.")
                 return
                 
-            # Update the visualization with the schedule
-            self.update_visualization(schedule)
-            
-            # Update the task manager with process states
-            self.update_task_manager()
+            if cores > 1:
+                self.show_multicore_results(algorithm, cores, time_quantum)
+                return
+                
+            # Simulate online, so later edits to the process list resume from a checkpoint
+            self.online = OnlineScheduler(algorithm, time_quantum)
+            for process in self.processes:
+                self.online.submit(process)
+            self.show_online_results()
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred during simulation: {str(e)}")
             
+    def show_online_results(self):
+        """Finish the online simulation and display its results"""
+        self.online.run_to_completion()
+        
+        # Merge consecutive slices so the Gantt chart draws one bar per run
+        schedule = self.online.schedule.compress()
+        self.scheduler.set_algorithm(self.online.algorithm, self.online.time_quantum)
+        self.scheduler.load_results(self.online.to_table(), schedule)
+        
+        # Update the visualization with the schedule
+        self.update_visualization(schedule)
+        
+        # Update the task manager with process states
+        self.update_task_manager()
+        
+    def show_multicore_results(self, algorithm, cores, time_quantum):
+        """Simulate on several cores and display the results, one Gantt lane per core"""
+        # The online engine models a single CPU, so edits no longer update these results
+        self.online = None
+        multicore = MulticoreScheduler(algorithm, cores, time_quantum)
+        multicore.set_processes(self.processes)
+        schedule = multicore.run().compress()
+        self.scheduler.set_algorithm(algorithm, time_quantum)
+        self.scheduler.load_results(multicore.table, schedule)
+        
+        self.update_visualization(schedule)
+        self.update_task_manager()
+        
+    def compare_algorithms(self):
+        """Run every algorithm on the current processes and show their metrics side by side"""
+        if not self.current_workload():
+            messagebox.showerror("Error", "Please add at least one process before comparing algorithms.")
+            return
+        try:
+            time_quantum = int(self.time_quantum_var.get())
+            if time_quantum <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Time quantum must be a positive integer.")
+            return
+            
+        from compare import compare_algorithms
+        self.root.config(cursor="watch")
+        self.root.update_idletasks()
+        try:
+            rows = compare_algorithms(self.current_workload(), self.algorithm_combo['values'], time_quantum)
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred during the comparison: {str(e)}")
+            return
+        finally:
+            self.root.config(cursor="")
+        self.show_comparison(rows)
+        
+    def show_comparison(self, rows):
+        """Fill the comparison table: one column per algorithm, one row per metric"""
+        # Metrics listed, with whether a higher value is better
+        metrics = [
+            ("Avg Waiting", 'avg_waiting', False),
+            ("Avg Turnaround", 'avg_turnaround', False),
+            ("Avg Response", 'avg_response', False),
+            ("p99 Waiting", 'p99_waiting', False),
+            ("p99 Response", 'p99_response', False),
+            ("CPU Utilization %", 'cpu_utilization', True),
+            ("Throughput", 'throughput', True),
+            ("Fairness (Jain)", 'fairness', True),
+            ("Context Switches", 'context_switches', False)
+        ]
+        algorithms = [row['algorithm'] for row in rows]
+        columns = ("Metric",) + tuple(algorithms) + ("Best",)
+        if self.comparison_frame is None:
+            self.comparison_frame = ttk.LabelFrame(self.visualization_frame, text="Algorithm Comparison (single CPU)")
+            self.comparison_frame.pack(fill=tk.X, padx=5, pady=5, before=self.performance_frame)
+            self.comparison_tree = ttk.Treeview(self.comparison_frame, show="headings", height=len(metrics))
+            self.comparison_tree.pack(fill=tk.X, expand=True)
+        self.comparison_tree.configure(columns=columns)
+        for col in columns:
+            self.comparison_tree.heading(col, text=col)
+            self.comparison_tree.column(col, width=120 if col in ("Metric", "Best") else 90, anchor=tk.CENTER)
+        self.comparison_tree.delete(*self.comparison_tree.get_children())
+        
+        for label, name, higher_is_better in metrics:
+            values = [row.get(name, 0) for row in rows]
+            best = max(values) if higher_is_better else min(values)
+            cells = [f"{value:.2f}" if isinstance(value, float) else str(value) for value in values]
+            winners = [algorithm for algorithm, value in zip(algorithms, values) if value == best]
+            winners = "All" if len(winners) == len(algorithms) else ", ".join(winners)
+            self.comparison_tree.insert('', 'end', values=[label] + cells + [winners])
+            
+    def open_quantum_sweep(self):
+        """Plot Round Robin's metrics against the time quantum and search for the best quantum"""
+        if not self.current_workload():
+            messagebox.showerror("Error", "Please add at least one process before sweeping the time quantum.")
+            return
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Round Robin Quantum Sweep")
+        dialog.transient(self.root)
+        
+        settings = ttk.Frame(dialog)
+        settings.pack(fill=tk.X, padx=5, pady=5)
+        workload = self.current_workload()
+        if isinstance(workload, ProcessTable):
+            longest = int(workload.burst_time.max())
+        else:
+            longest = max(process.burst_time for process in workload)
+        fields = [
+            ("From:", tk.StringVar(value="1")),
+            ("To:", tk.StringVar(value=str(longest))),
+            ("Step:", tk.StringVar(value=str(max(longest // 50, 1))))
+        ]
+        for column, (label, var) in enumerate(fields):
+            ttk.Label(settings, text=label).grid(row=0, column=2 * column, padx=5, pady=5)
+            ttk.Entry(settings, textvariable=var, width=8).grid(row=0, column=2 * column + 1, padx=5, pady=5)
+        objectives = ("avg_waiting", "avg_turnaround", "avg_response", "p99_waiting", "p99_response",
+                      "context_switches", "fairness", "throughput")
+        objective_var = tk.StringVar(value=objectives[0])
+        ttk.Label(settings, text="Objective:").grid(row=1, column=0, padx=5, pady=5)
+        ttk.Combobox(settings, textvariable=objective_var, values=objectives, state="readonly",
+                     width=16).grid(row=1, column=1, columnspan=3, padx=5, pady=5, sticky="w")
+        result_var = tk.StringVar(value="")
+        ttk.Label(dialog, textvariable=result_var, foreground="blue").pack(anchor=tk.W, padx=5)
+        
+        figure = Figure(figsize=(7, 6))
+        axes = figure.subplots(3, 1, sharex=True)
+        canvas = FigureCanvasTkAgg(figure, master=dialog)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        def plot(rows, best=None):
+            quanta = [row['time_quantum'] for row in rows]
+            for ax, (name, label) in zip(axes, (('avg_waiting', "Avg Waiting"), ('p99_response', "p99 Response"),
+                                                ('context_switches', "Context Switches"))):
+                ax.clear()
+                ax.plot(quanta, [row[name] for row in rows], marker='o', markersize=3)
+                ax.set_ylabel(label)
+                ax.grid(linestyle='--', alpha=0.7)
+                if best is not None:
+                    ax.axvline(best, color='#e74c3c', linestyle='--')
+            axes[-1].set_xlabel("Time Quantum")
+            figure.tight_layout()
+            canvas.draw()
+            
+        def run(search):
+            from compare import sweep_quantum, tune_quantum
+            try:
+                low, high, step = (int(var.get()) for _, var in fields)
+                if not 1 <= low <= high or step <= 0:
+                    raise ValueError("the range must satisfy 1 <= From <= To and Step > 0")
+                dialog.config(cursor="watch")
+                dialog.update_idletasks()
+                if search:
+                    objective = objective_var.get()
+                    best, rows = tune_quantum(self.current_workload(), objective, low, high)
+                    value = next(row[objective] for row in rows if row['time_quantum'] == best)
+                    # The tuned quantum becomes the one used by Start Simulation
+                    self.time_quantum_var.set(str(best))
+                    result_var.set(f"Best quantum for {objective}: {best} ({value:.2f}), "
+                                   f"found with {len(rows)} runs")
+                    plot(rows, best)
+                else:
+                    rows = sweep_quantum(self.current_workload(), range(low, high + 1, step))
+                    result_var.set(f"Swept {len(rows)} quanta")
+                    plot(rows)
+            except ValueError as e:
+                messagebox.showerror("Error", f"Invalid sweep: {str(e)}", parent=dialog)
+            finally:
+                dialog.config(cursor="")
+                
+        buttons = ttk.Frame(settings)
+        buttons.grid(row=1, column=4, columnspan=2, padx=5, pady=5)
+        ttk.Button(buttons, text="Sweep", command=lambda: run(False)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons, text="Auto-tune", command=lambda: run(True)).pack(side=tk.LEFT, padx=2)
+        
     def update_visualization(self, schedule):
+        self.create_charts()
+        
         # Clear previous plots
         self.gantt_ax.clear()
         self.metrics_ax.clear()
@@ -404,41 +782,48 @@ class CPUSchedulerGUI:
         # Sort processes by start time for consistent coloring
         processes = sorted(self.processes, key=lambda p: p.arrival_time)
         
+        import matplotlib.pyplot as plt
+        
         # Create color map
         colors = plt.cm.get_cmap('tab10', len(processes))
         process_colors = {p.pid: colors(i) for i, p in enumerate(processes)}
         
-        # Draw each process execution
-        for slot in schedule:
-            process = slot['process']
-            start = slot['start']
-            end = slot['end']
-            
-            self.gantt_ax.barh(
-                y=0, 
-                width=end-start, 
-                left=start, 
-                height=0.5, 
-                color=process_colors[process.pid],
-                edgecolor='black'
-            )
+        if isinstance(schedule, ColumnarSchedule):
+            self.draw_columnar_gantt_chart(schedule, process_colors)
+            max_time = schedule.makespan
+        else:
+            # Draw each process execution
+            for slot in schedule:
+                process = slot['process']
+                start = slot['start']
+                end = slot['end']
+                
+                self.gantt_ax.barh(
+                    y=0, 
+                    width=end-start, 
+                    left=start, 
+                    height=0.5, 
+                    color=process_colors[process.pid],
+                    edgecolor='black'
+                )
+                
+                # Add process ID text
+                self.gantt_ax.text(
+                    x=start + (end-start)/2,
+                    y=0,
+                    s=process.pid,
+                    ha='center',
+                    va='center',
+                    color='black',
+                    fontweight='bold'
+                )
+            max_time = max(slot['end'] for slot in schedule)
             
-            # Add process ID text
-            self.gantt_ax.text(
-                x=start + (end-start)/2,
-                y=0,
-                s=process.pid,
-                ha='center',
-                va='center',
-                color='black',
-                fontweight='bold'
-            )
+        # Set y-axis (multicore schedules label one lane per core instead)
+        if getattr(schedule, 'core', None) is None:
+            self.gantt_ax.set_yticks([])
             
-        # Set y-axis
-        self.gantt_ax.set_yticks([])
-        
         # Set x-axis
-        max_time = max(slot['end'] for slot in schedule)
         self.gantt_ax.set_xlim(0, max_time)
         self.gantt_ax.set_xlabel("Time")
         
@@ -449,8 +834,58 @@ class CPUSchedulerGUI:
         handles = [plt.Rectangle((0,0),1,1, color=process_colors[p.pid]) for p in processes]
         self.gantt_ax.legend(handles, [p.pid for p in processes], loc='upper right')
         
+    def draw_columnar_gantt_chart(self, schedule, process_colors):
+        """Draw a ColumnarSchedule with one broken_barh call per process and core"""
+        # One lane per core, all on lane 0 for a single CPU
+        lanes = schedule.core if schedule.core is not None else np.zeros(len(schedule), dtype=np.int64)
+        
+        # Group slices by lane and process without leaving NumPy
+        groups = lanes * len(schedule.pids) + schedule.process_index
+        order = np.argsort(groups, kind='stable')
+        indices = schedule.process_index[order]
+        group_lanes = lanes[order]
+        starts = schedule.start[order]
+        durations = (schedule.end - schedule.start)[order]
+        bounds = np.flatnonzero(np.diff(groups[order])) + 1
+        
+        for group_indices, group_starts, group_durations, lane in zip(
+                np.split(indices, bounds), np.split(starts, bounds), np.split(durations, bounds),
+                np.split(group_lanes, bounds)):
+            if not len(group_indices):
+                continue
+            pid = schedule.pids[group_indices[0]]
+            self.gantt_ax.broken_barh(
+                list(zip(group_starts.tolist(), group_durations.tolist())),
+                (lane[0] - 0.25, 0.5),
+                facecolors=process_colors[pid],
+                edgecolor='black'
+            )
+            
+        if schedule.core is not None:
+            utilization = schedule.core_utilization()
+            self.gantt_ax.set_yticks(range(schedule.cores))
+            self.gantt_ax.set_yticklabels([f"Core {core} ({utilization[core]:.0f}%)" for core in range(schedule.cores)])
+            self.gantt_ax.set_ylim(schedule.cores - 0.5, -0.5)
+            
+        # Label the segments only while the text stays readable
+        if len(schedule) <= 100:
+            for index, start, end, lane in zip(schedule.process_index.tolist(), schedule.start.tolist(),
+                                               schedule.end.tolist(), lanes.tolist()):
+                self.gantt_ax.text(
+                    x=start + (end-start)/2,
+                    y=lane,
+                    s=schedule.pids[index],
+                    ha='center',
+                    va='center',
+                    color='black',
+                    fontweight='bold'
+                )
+                
     def draw_metrics(self):
         """Draw performance metrics"""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
         try:
             metrics = self.scheduler.get_metrics()
             
@@ -539,7 +974,7 @@ class CPUSchedulerGUI:
                 va='bottom',
                 fontsize=9
             )
-        
+            
         # Set labels and title
         self.metrics_ax.set_title('Scheduling Metrics')
         self.metrics_ax.set_xticks(x)
@@ -560,12 +995,18 @@ class CPUSchedulerGUI:
         self.avg_waiting_var.set(f"{metrics.get('avg_waiting', 0):.2f}")
         self.avg_response_var.set(f"{metrics.get('avg_response', 0):.2f}")
         
-        # Calculate CPU utilization
-        if self.scheduler.schedule:
-            total_time = max(slot['end'] for slot in self.scheduler.schedule)
-            total_burst = sum(p.burst_time for p in self.processes)
-            utilization = (total_burst / total_time) * 100 if total_time > 0 else 0
-            self.cpu_util_var.set(f"{utilization:.2f}%")
+        # CPU utilization
+        if len(self.scheduler.schedule):
+            self.cpu_util_var.set(f"{metrics.get('cpu_utilization', 0):.2f}%")
+            
+        # Performance metrics panel
+        self.cpu_utilization_var.set(f"CPU Utilization: {metrics.get('cpu_utilization', 0):.2f}%")
+        self.throughput_var.set(f"Throughput: {metrics.get('throughput', 0):.3f} processes/unit time")
+        self.tail_latency_var.set(
+            f"Waiting p50/p95/p99: {metrics.get('p50_waiting', 0):.1f} / "
+            f"{metrics.get('p95_waiting', 0):.1f} / {metrics.get('p99_waiting', 0):.1f}"
+        )
+        self.fairness_var.set(f"Fairness (Jain): {metrics.get('fairness', 0):.3f}")
         
     def update_task_manager(self):
         # Clear previous entries
@@ -599,7 +1040,7 @@ class CPUSchedulerGUI:
                 tat,
                 wt
             ))
-        
+            
         # Update state visualization
         self.update_state_visualization()
         
@@ -682,160 +1123,127 @@ class CPUSchedulerGUI:
                     fill="black",
                     font=("Arial", 8)
                 )
-        
+                
     def reset_simulation(self):
-        self.processes.clear()
+        self.processes = []
+        self.online = None
         self.process_tree.delete(*self.process_tree.get_children())
         self.task_tree.delete(*self.task_tree.get_children())
-        self.gantt_ax.clear()
-        self.metrics_ax.clear()
-        self.gantt_canvas.draw()
-        
+        if self.gantt_canvas is not None:
+            self.gantt_ax.clear()
+            self.metrics_ax.clear()
+            self.gantt_canvas.draw()
+            
         # Reset metrics
         self.avg_turnaround_var.set("0")
         self.avg_waiting_var.set("0")
         self.avg_response_var.set("0")
         self.cpu_util_var.set("0%")
         
+        # The comparison belonged to the old workload
+        if self.comparison_frame is not None:
+            self.comparison_tree.delete(*self.comparison_tree.get_children())
+            
         # Reset process counter
         self.process_counter = 1
         self.pid_var.set(f"P{self.process_counter}")
-
+        
     def suggest_algorithm(self):
-        """Suggest the best scheduling algorithm based on process characteristics"""
-        if not self.processes:
+        """Simulate every algorithm on the current processes and recommend the best one"""
+        if not self.current_workload():
             messagebox.showwarning("No Processes", "Please add some processes first!")
             return
+        try:
+            time_quantum = max(int(self.time_quantum_var.get()), 1)
+        except ValueError:
+            time_quantum = 2
             
-        # Analyze process characteristics
-        total_processes = len(self.processes)
-        avg_burst_time = sum(p.burst_time for p in self.processes) / total_processes
-        avg_arrival_time = sum(p.arrival_time for p in self.processes) / total_processes
-        burst_variance = sum((p.burst_time - avg_burst_time) ** 2 for p in self.processes) / total_processes
-        has_priority = any(p.priority > 0 for p in self.processes)
-        arrival_pattern = "Bulk" if all(p.arrival_time == 0 for p in self.processes) else "Scattered"
-        burst_pattern = "Uniform" if burst_variance < 5 else "Varied"
-        
-        # Initialize scores for each algorithm
-        scores = {
-            "FCFS": 0,
-            "SJF": 0,
-            "Priority": 0,
-            "Round Robin": 0,
-            "SJF Preemptive": 0,
-            "Priority Preemptive": 0
-        }
+        from recommend import recommend
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Algorithm Recommendation")
+        dialog.geometry("700x400")
+        
+        settings = ttk.Frame(dialog)
+        settings.pack(fill=tk.X, padx=10, pady=5)
+        objectives = ("avg_waiting", "avg_turnaround", "avg_response", "p99_waiting", "p99_response",
+                      "fairness", "context_switches")
+        objective_var = tk.StringVar(value=objectives[0])
+        ttk.Label(settings, text="Rank by:").pack(side=tk.LEFT, padx=5)
+        objective_combo = ttk.Combobox(settings, textvariable=objective_var, values=objectives,
+                                       state="readonly", width=16)
+        objective_combo.pack(side=tk.LEFT, padx=5)
+        
+        summary_var = tk.StringVar(value="")
+        ttk.Label(dialog, textvariable=summary_var, font=("Arial", 10, "bold")).pack(anchor=tk.W, padx=10)
+        details_var = tk.StringVar(value="")
+        ttk.Label(dialog, textvariable=details_var).pack(anchor=tk.W, padx=10, pady=(0, 5))
+        
+        columns = ("Rank", "Algorithm", "Objective", "Avg Waiting", "Avg Response", "p99 Response", "Switches")
+        ranking_tree = ttk.Treeview(dialog, columns=columns, show="headings", height=6)
+        for col in columns:
+            ranking_tree.heading(col, text=col)
+            ranking_tree.column(col, width=130 if col == "Algorithm" else 85, anchor=tk.CENTER)
+        ranking_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        suggestion = {}
+        
+        def rank(event=None):
+            objective = objective_var.get()
+            try:
+                result = recommend(self.current_workload(), objective, time_quantum=time_quantum)
+            except ValueError as e:
+                messagebox.showerror("Error", f"Could not rank the algorithms: {str(e)}", parent=dialog)
+                return
+            suggestion['algorithm'] = result.algorithm
+            ranking_tree.delete(*ranking_tree.get_children())
+            if result.method == "model":
+                # Too many processes to simulate in time: the model only ranks the algorithms
+                ranking_tree.heading("Objective", text="Best on")
+                for position, row in enumerate(result.ranking, 1):
+                    ranking_tree.insert('', 'end', values=(position, row['algorithm'], f"{row['share']:.0%}",
+                                                           "-", "-", "-", "-"))
+                summary_var.set(f"Suggested: {result.algorithm} (best for {objective} on "
+                                f"{result.ranking[0]['share']:.0%} of similar workloads)")
+                details_var.set(f"Predicted from the features of the {result.total} processes by the "
+                                f"trained model in {result.elapsed * 1000:.0f} ms")
+                return
+            ranking_tree.heading("Objective", text=objective)
+            for position, row in enumerate(result.ranking, 1):
+                ranking_tree.insert('', 'end', values=(
+                    position,
+                    row['algorithm'],
+                    f"{row[objective]:.2f}",
+                    f"{row['avg_waiting']:.2f}",
+                    f"{row['avg_response']:.2f}",
+                    f"{row['p99_response']:.2f}",
+                    row['context_switches']
+                ))
+            best, runner_up = result.ranking[0], result.ranking[1] if len(result.ranking) > 1 else None
+            summary = f"Suggested: {result.algorithm} ({objective} = {best[objective]:.2f}"
+            if runner_up is not None:
+                summary += f", next best {runner_up['algorithm']} at {runner_up[objective]:.2f}"
+            summary_var.set(summary + ")")
+            if result.sampled == result.total:
+                scope = f"all {result.total} processes"
+            else:
+                scope = f"{result.sampled} consecutive arrivals out of {result.total} processes"
+            details_var.set(f"Measured by simulating {scope} (Round Robin quantum {time_quantum}) "
+                            f"in {result.elapsed * 1000:.0f} ms")
+                            
+        objective_combo.bind("<<ComboboxSelected>>", rank)
         
-        reasons = []
-        
-        # FCFS Analysis
-        if arrival_pattern == "Bulk":
-            scores["FCFS"] += 30
-            reasons.append("✓ FCFS works well for bulk arrivals")
-        if burst_pattern == "Uniform":
-            scores["FCFS"] += 20
-            reasons.append("✓ FCFS is fair when processes have similar burst times")
-        
-        # SJF Analysis
-        if burst_pattern == "Varied":
-            scores["SJF"] += 35
-            scores["SJF Preemptive"] += 40
-            reasons.append("✓ SJF/SRTF optimal for varied burst times")
-        if avg_burst_time < 10:
-            scores["SJF"] += 15
-            reasons.append("✓ SJF efficient for short processes")
-        
-        # Priority Analysis
-        if has_priority:
-            scores["Priority"] += 35
-            scores["Priority Preemptive"] += 40
-            reasons.append("✓ Priority-based scheduling optimal for prioritized workload")
-        
-        # Round Robin Analysis
-        if arrival_pattern == "Scattered":
-            scores["Round Robin"] += 25
-            reasons.append("✓ Round Robin ensures fairness for scattered arrivals")
-        if total_processes > 5:
-            scores["Round Robin"] += 15
-            reasons.append("✓ Round Robin good for many concurrent processes")
-        
-        # Preemptive vs Non-preemptive
-        if arrival_pattern == "Scattered" and burst_pattern == "Varied":
-            scores["SJF Preemptive"] += 20
-            scores["Priority Preemptive"] += 20
-            reasons.append("✓ Preemptive scheduling better for varied workloads")
-        
-        # Find best algorithm
-        best_algorithm = max(scores.items(), key=lambda x: x[1])
-        algorithm_name = best_algorithm[0]
-        confidence_score = min(best_algorithm[1], 100)
-        
-        # Generate star rating
-        star_rating = "⭐" * (confidence_score // 20)
-        
-        # Create detailed recommendation message
-        recommendation = f"""
-🤖 AI Algorithm Recommendation:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-✨ Suggested Algorithm: {algorithm_name}
-📊 Confidence Score: {confidence_score}/100 {star_rating}
-
-📝 Workload Analysis:
-• Number of Processes: {total_processes}
-• Average Burst Time: {avg_burst_time:.1f}
-• Arrival Pattern: {arrival_pattern}
-• Burst Pattern: {burst_pattern}
-• Priority-based Tasks: {"Yes" if has_priority else "No"}
-
-🎯 Reasoning:
-{chr(10).join(reasons)}
-
-💡 Key Benefits:
-• {"Optimal for priority-based execution" if "Priority" in algorithm_name else
-   "Minimizes average waiting time" if "SJF" in algorithm_name else
-   "Fair CPU distribution" if algorithm_name == "Round Robin" else
-   "Simple and predictable execution"}
-• {"Responsive to high-priority tasks" if "Preemptive" in algorithm_name else
-   "No context switching overhead" if algorithm_name == "FCFS" else
-   "Balanced resource utilization"}
-"""
-        
-        # Show recommendation in a custom dialog
-        recommendation_dialog = tk.Toplevel(self.root)
-        recommendation_dialog.title("AI Algorithm Recommendation")
-        recommendation_dialog.geometry("600x500")
-        
-        # Add text widget with recommendation
-        text_widget = tk.Text(recommendation_dialog, wrap=tk.WORD, padx=10, pady=10)
-        text_widget.pack(fill=tk.BOTH, expand=True)
-        text_widget.insert(tk.END, recommendation)
-        text_widget.config(state=tk.DISABLED)
-        
-        # Add Apply button
         def apply_suggestion():
-            self.algorithm_var.set(algorithm_name)
-            self.on_algorithm_change()
-            recommendation_dialog.destroy()
-            
-        apply_btn = ttk.Button(recommendation_dialog, text="Apply Suggestion", command=apply_suggestion)
-        apply_btn.pack(pady=10)
-        
-    def get_suggestion_reasoning(self, algorithm):
-        if algorithm == 'FCFS':
-            return "- Simple workload with similar process characteristics\n- Good for fairness when processes have similar requirements"
-        elif algorithm == 'SJF':
-            return "- Short burst times detected\n- Minimizes average waiting time\n- Best for workloads with varying burst times"
-        elif algorithm == 'Round Robin':
-            return "- Large number of processes detected\n- Provides fair CPU time sharing\n- Good for interactive systems"
-        elif algorithm == 'Priority':
-            return "- Processes with different priorities detected\n- Critical processes can be executed first\n- Good for systems with varying process importance"
-        elif algorithm == 'SJF Preemptive':
-            return "- Short burst times detected\n- Minimizes average waiting time\n- Best for workloads with varying burst times and high priority processes"
-        elif algorithm == 'Priority Preemptive':
-            return "- Processes with different priorities detected\n- Critical processes can be executed first\n- Good for systems with varying process importance and high priority processes"
+            if 'algorithm' in suggestion:
+                self.algorithm_var.set(suggestion['algorithm'])
+                self.on_algorithm_change()
+            dialog.destroy()
+            
+        ttk.Button(dialog, text="Apply Suggestion", command=apply_suggestion).pack(pady=10)
+        rank()
         
     def open_task_manager(self):
         """Open the task manager window"""
+        from task_manager import TaskManagerWindow
         task_manager = TaskManagerWindow(parent=self.root, scheduler=self.scheduler)
         
         # Pass the current algorithm and processes to the task manager
@@ -844,7 +1252,7 @@ class CPUSchedulerGUI:
             task_manager.set_current_algorithm(current_algo)
             
         task_manager.show()
-        
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = CPUSchedulerGUI(root)
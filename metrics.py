@@ -0,0 +1,182 @@
+import math
+from statistics import NormalDist
+from typing import Dict
+
+import numpy as np
+
+class QuantileSketch:
+    """Bounded-memory quantile sketch for non-negative values.
+    
+    Values fall into logarithmic buckets (the DDSketch layout), so every
+    quantile is reported within `relative_accuracy` of the true value while the
+    memory stays fixed at a couple of thousand counters, however many values
+    are added. Zero gets its own counter and the maximum is tracked exactly.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        # Enough buckets for any int64 value
+        self.counts = np.zeros(int(math.ceil(math.log(2.0 ** 63) / self.log_gamma)) + 1, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+        self.max = 0
+        
+    def add(self, values):
+        """Add an array (or any iterable) of values"""
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return
+        positive = values[values > 0]
+        self.zero_count += values.size - positive.size
+        self.count += values.size
+        self.max = max(self.max, values.max().item())
+        if positive.size:
+            buckets = np.ceil(np.log(positive) / self.log_gamma).astype(np.int64)
+            np.clip(buckets, 0, len(self.counts) - 1, out=buckets)
+            self.counts += np.bincount(buckets, minlength=len(self.counts))
+            
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch with the same accuracy into this one"""
+        self.counts += other.counts
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.max = max(self.max, other.max)
+        
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank - self.zero_count, side='right'))
+        # Midpoint of the bucket in the relative sense, capped by the exact maximum
+        return min(2 * self.gamma ** bucket / (self.gamma + 1), self.max)
+
+class MetricsAccumulator:
+    """Scheduling metrics gathered in one streaming pass over processes.
+    
+    Feed it processes in chunks with add(); only running sums and two quantile
+    sketches are kept, so the memory does not grow with the number of processes.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.completed = 0
+        self.total_turnaround = 0
+        self.total_waiting = 0
+        self.total_response = 0
+        self.total_burst = 0
+        self.makespan = 0
+        # Sums for Jain's fairness index over burst / turnaround
+        self.fairness_sum = 0.0
+        self.fairness_sum_squares = 0.0
+        self.waiting = QuantileSketch(relative_accuracy)
+        self.response = QuantileSketch(relative_accuracy)
+        
+    def add(self, arrival, burst, start, completion, unset=-1):
+        """Add a chunk of processes given as arrays.
+        
+        Processes whose completion is `unset` count towards the CPU's work
+        but not towards the time metrics.
+        """
+        self.total_burst += int(np.sum(burst))
+        done = completion != unset
+        if not np.any(done):
+            return
+        arrival, burst, start, completion = arrival[done], burst[done], start[done], completion[done]
+        
+        turnaround = completion - arrival
+        waiting = turnaround - burst
+        response = start - arrival
+        
+        self.completed += len(turnaround)
+        self.total_turnaround += int(turnaround.sum())
+        self.total_waiting += int(waiting.sum())
+        self.total_response += int(response.sum())
+        self.makespan = max(self.makespan, int(completion.max()))
+        
+        share = burst[turnaround > 0] / turnaround[turnaround > 0]
+        self.fairness_sum += float(share.sum())
+        self.fairness_sum_squares += float(np.dot(share, share))
+        
+        self.waiting.add(waiting)
+        self.response.add(response)
+        
+    def merge(self, other: 'MetricsAccumulator'):
+        """Fold in another accumulator, e.g. one filled in another process"""
+        self.completed += other.completed
+        self.total_turnaround += other.total_turnaround
+        self.total_waiting += other.total_waiting
+        self.total_response += other.total_response
+        self.total_burst += other.total_burst
+        self.makespan = max(self.makespan, other.makespan)
+        self.fairness_sum += other.fairness_sum
+        self.fairness_sum_squares += other.fairness_sum_squares
+        self.waiting.merge(other.waiting)
+        self.response.merge(other.response)
+        
+    def result(self) -> Dict[str, float]:
+        if not self.completed:
+            return empty_metrics()
+        metrics = {
+            'avg_turnaround': self.total_turnaround / self.completed,
+            'avg_waiting': self.total_waiting / self.completed,
+            'avg_response': self.total_response / self.completed,
+            'cpu_utilization': (self.total_burst / self.makespan) * 100 if self.makespan > 0 else 0,
+            'throughput': self.completed / self.makespan if self.makespan > 0 else 0.0,
+            'fairness': (self.fairness_sum ** 2 / (self.completed * self.fairness_sum_squares)
+                         if self.fairness_sum_squares > 0 else 1.0)
+        }
+        for name, sketch in (('waiting', self.waiting), ('response', self.response)):
+            metrics[f'p50_{name}'] = sketch.quantile(0.50)
+            metrics[f'p95_{name}'] = sketch.quantile(0.95)
+            metrics[f'p99_{name}'] = sketch.quantile(0.99)
+            metrics[f'max_{name}'] = float(sketch.max)
+        return metrics
+
+class RunningStats:
+    """Running mean and variance of a stream of values (Welford's algorithm).
+    
+    Values may be NumPy arrays, which are tracked element-wise, so one
+    instance can follow several metrics at once. Nothing but the count, the
+    mean and the sum of squared deviations is kept.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean = self.mean + delta / self.count
+        self.m2 = self.m2 + delta * (value - self.mean)
+        
+    @property
+    def variance(self):
+        """Sample variance (infinite until there are two values)"""
+        if self.count < 2:
+            return np.full(np.shape(self.m2), math.inf)
+        return self.m2 / (self.count - 1)
+        
+    def half_width(self, confidence: float = 0.95):
+        """Half-width of the normal-approximation confidence interval of the mean"""
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return z * np.sqrt(self.variance / max(self.count, 1))
+
+def empty_metrics() -> Dict[str, float]:
+    """Metrics reported when nothing has completed"""
+    metrics = {
+        'avg_turnaround': 0.0,
+        'avg_waiting': 0.0,
+        'avg_response': 0.0,
+        'cpu_utilization': 0.0,
+        'throughput': 0.0,
+        'fairness': 0.0
+    }
+    for name in ('waiting', 'response'):
+        for stat in ('p50', 'p95', 'p99', 'max'):
+            metrics[f'{stat}_{name}'] = 0.0
+    return metrics
@@ -0,0 +1,219 @@
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+from scheduler import ALGORITHMS
+
+# Workload features seen by the model, in column order. None depends on the number of
+# processes, so a model trained on small workloads carries over to huge ones.
+FEATURES = ("load", "burst_cv", "log_burst_sd", "gap_cv", "bulk_arrivals", "priority_levels", "quantum_ratio")
+
+# Objectives answered by another objective's tree: turnaround is waiting plus the
+# fixed burst, so both rank the algorithms the same way
+ALIASES = {'avg_turnaround': 'avg_waiting'}
+
+# Where train_model.py writes the model and load_model() looks for it
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model.npz")
+
+def extract_features(table, time_quantum: int = 2, max_samples: int = 1 << 18,
+                     chunk_size: int = 1 << 14) -> np.ndarray:
+    """The FEATURES of a workload as a float64 vector.
+    
+    Each column is read once, a chunk at a time, and only running sums are
+    kept. Workloads of more than `max_samples` processes are read as evenly
+    spaced chunks totalling about `max_samples` processes, so the cost does
+    not grow with the workload; every feature is a ratio or a spread, which
+    such a sample estimates well. Interarrival gaps are taken within chunks
+    in arrival order, so a workload not stored in that order has its arrival
+    times sorted first.
+    """
+    n = len(table)
+    if n > max_samples:
+        count = max(max_samples // chunk_size, 1)
+        starts = np.linspace(0, n - chunk_size, count).astype(np.int64).tolist()
+    else:
+        starts = range(0, n, chunk_size)
+        
+    # Sums of bursts, of squared bursts, of log bursts and of their squares
+    total = burst_sum = burst_squares = log_sum = log_squares = 0.0
+    levels = set()
+    for lo in starts:
+        burst = table.burst_time[lo:lo + chunk_size].astype(np.float64)
+        log_burst = np.log(np.maximum(burst, 1))
+        total += len(burst)
+        burst_sum += burst.sum()
+        burst_squares += burst @ burst
+        log_sum += log_burst.sum()
+        log_squares += log_burst @ log_burst
+        if len(levels) <= 16:
+            levels.update(np.unique(table.priority[lo:lo + chunk_size]).tolist())
+            
+    gap_sums = _gap_sums(table.arrival_time, starts, chunk_size)
+    if gap_sums is None:
+        gap_sums = _gap_sums(np.sort(table.arrival_time), starts, chunk_size)
+    gaps, gap_sum, gap_squares, zero_gaps = gap_sums
+    
+    burst_mean, burst_sd = _spread(burst_sum, burst_squares, total)
+    _, log_sd = _spread(log_sum, log_squares, total)
+    gap_mean, gap_sd = _spread(gap_sum, gap_squares, gaps)
+    return np.array([
+        # Offered load: work arriving per time unit, capped for arrivals all at once
+        min(burst_mean / gap_mean, 10.0) if gap_mean > 0 else 10.0,
+        burst_sd / burst_mean if burst_mean > 0 else 0.0,
+        log_sd,
+        gap_sd / gap_mean if gap_mean > 0 else 0.0,
+        zero_gaps / gaps if gaps else 1.0,
+        min(len(levels), 16),
+        time_quantum / burst_mean if burst_mean > 0 else 1.0
+    ])
+
+def _gap_sums(arrival_time, starts, chunk_size):
+    """Count, sum, sum of squares and zeros of the gaps within chunks; None if out of order"""
+    gaps = gap_sum = gap_squares = zero_gaps = 0.0
+    for lo in starts:
+        gap = np.diff(arrival_time[lo:lo + chunk_size])
+        if np.any(gap < 0):
+            return None
+        gap = gap.astype(np.float64)
+        gaps += len(gap)
+        gap_sum += gap.sum()
+        gap_squares += gap @ gap
+        zero_gaps += np.count_nonzero(gap == 0)
+    return gaps, gap_sum, gap_squares, zero_gaps
+
+def _spread(values, squares, count):
+    """Mean and standard deviation from running sums"""
+    if not count:
+        return 0.0, 0.0
+    mean = values / count
+    return mean, np.sqrt(max(squares / count - mean * mean, 0.0))
+
+class DecisionTree:
+    """A classification tree stored as flat arrays.
+    
+    Node k splits on feature[k] <= threshold[k] towards left[k], otherwise
+    right[k]; leaves have feature -1. counts[k] holds how many training
+    samples of each class reached node k.
+    """
+    
+    def __init__(self, feature, threshold, left, right, counts):
+        self.feature = np.asarray(feature, dtype=np.int64)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int64)
+        self.right = np.asarray(right, dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        
+    @classmethod
+    def fit(cls, X, y, classes: int, max_depth: int = 8, min_leaf: int = 10) -> 'DecisionTree':
+        """Grow a tree on features X and class indices y by the Gini criterion"""
+        X, y = np.asarray(X, dtype=np.float64), np.asarray(y, dtype=np.int64)
+        feature, threshold, left, right, counts = [], [], [], [], []
+        one_hot = np.eye(classes, dtype=np.int64)[y]
+        
+        def grow(rows, depth):
+            node = len(feature)
+            histogram = one_hot[rows].sum(axis=0)
+            for column, value in ((feature, -1), (threshold, 0.0), (left, -1), (right, -1), (counts, histogram)):
+                column.append(value)
+            size = len(rows)
+            if depth == max_depth or size < 2 * min_leaf or histogram.max() == size:
+                return node
+            # Gini impurity is lowest where sum(counts^2) / size summed over both sides is highest
+            best, split = (histogram @ histogram) / size, None
+            for f in range(X.shape[1]):
+                order = rows[np.argsort(X[rows, f], kind='stable')]
+                values = X[order, f]
+                below = np.cumsum(one_hot[order], axis=0)[:-1]
+                above = histogram - below
+                sizes = np.arange(1, size)
+                score = (below * below).sum(axis=1) / sizes + (above * above).sum(axis=1) / (size - sizes)
+                valid = (sizes >= min_leaf) & (size - sizes >= min_leaf) & (values[:-1] < values[1:])
+                if not np.any(valid):
+                    continue
+                k = int(np.argmax(np.where(valid, score, -np.inf)))
+                if score[k] > best + 1e-9:
+                    best, split = score[k], (f, (values[k] + values[k + 1]) / 2)
+            if split is None:
+                return node
+            feature[node], threshold[node] = split
+            goes_left = X[rows, split[0]] <= split[1]
+            left[node] = grow(rows[goes_left], depth + 1)
+            right[node] = grow(rows[~goes_left], depth + 1)
+            return node
+            
+        grow(np.arange(len(y)), 0)
+        return cls(feature, threshold, left, right, np.array(counts))
+        
+    def leaves(self, X) -> np.ndarray:
+        """Leaf reached by each row of X"""
+        X = np.atleast_2d(X)
+        node = np.zeros(len(X), dtype=np.int64)
+        rows = np.arange(len(X))
+        while True:
+            inner = self.feature[node] >= 0
+            if not np.any(inner):
+                return node
+            goes_left = X[rows, np.maximum(self.feature[node], 0)] <= self.threshold[node]
+            node = np.where(inner, np.where(goes_left, self.left[node], self.right[node]), node)
+            
+    def predict_proba(self, X) -> np.ndarray:
+        """Share of each class among the training samples in the leaf of each row"""
+        counts = self.counts[self.leaves(X)]
+        return counts / counts.sum(axis=1, keepdims=True)
+        
+    def predict(self, X) -> np.ndarray:
+        return np.argmax(self.counts[self.leaves(X)], axis=1)
+        
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {'feature': self.feature, 'threshold': self.threshold, 'left': self.left,
+                'right': self.right, 'counts': self.counts}
+
+class RecommenderModel:
+    """One DecisionTree per objective, each predicting the best of ALGORITHMS"""
+    
+    def __init__(self, trees: Dict[str, DecisionTree], classes=ALGORITHMS):
+        self.trees = trees
+        self.classes = tuple(classes)
+        
+    def predict(self, table, objective: str, time_quantum: int = 2) -> Dict[str, float]:
+        """Share of similar training workloads on which each algorithm was best, highest first"""
+        shares = self.trees[ALIASES.get(objective, objective)].predict_proba(extract_features(table, time_quantum))[0]
+        order = np.argsort(-shares, kind='stable')
+        return {self.classes[k]: float(shares[k]) for k in order}
+        
+    def supports(self, objective: str) -> bool:
+        return ALIASES.get(objective, objective) in self.trees
+        
+    def save(self, path: str = MODEL_PATH):
+        arrays = {'classes': np.array(self.classes), 'features': np.array(FEATURES)}
+        for objective, tree in self.trees.items():
+            for name, array in tree.arrays().items():
+                arrays[f"{objective}.{name}"] = array
+        np.savez_compressed(path, **arrays)
+        
+    @classmethod
+    def load(cls, path: str = MODEL_PATH) -> 'RecommenderModel':
+        with np.load(path) as data:
+            if tuple(data['features'].tolist()) != FEATURES:
+                raise ValueError(f"{path} was trained on other features; retrain it with train_model.py")
+            trees = {}
+            for key in data.files:
+                objective, _, name = key.rpartition(".")
+                if objective and name == 'feature':
+                    trees[objective] = DecisionTree(*(data[f"{objective}.{part}"]
+                                                      for part in ('feature', 'threshold', 'left', 'right', 'counts')))
+            return cls(trees, data['classes'].tolist())
+
+# Loaded by load_model() on first use; False once it turned out to be missing or unreadable
+_model = None
+
+def load_model() -> Optional[RecommenderModel]:
+    """The bundled model, or None if there is none"""
+    global _model
+    if _model is None:
+        try:
+            _model = RecommenderModel.load()
+        except (OSError, ValueError, KeyError):
+            _model = False
+    return _model or None
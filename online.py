@@ -0,0 +1,363 @@
+import bisect
+import heapq
+import math
+from array import array
+from collections import deque
+from typing import Dict
+
+import numpy as np
+
+from metrics import MetricsAccumulator
+from scheduler import ALGORITHMS, UNSET, ColumnarSchedule, Process, ProcessTable
+
+class OnlineScheduler:
+    """Scheduler that accepts new processes while the simulation is running.
+    
+    The clock, ready queue and schedule so far are kept between calls:
+    submit() queues a process in O(log n) and advance_to() only simulates the
+    interval from the current clock to the requested time. Processes are
+    served exactly as Scheduler would serve them had they all been known
+    up front.
+    
+    Every `checkpoint_interval` events (or more sparsely while the ready
+    queue is long) a small checkpoint is taken, so insert() and remove() can
+    edit the workload in the past and re-simulate from the last checkpoint
+    before the edit instead of from time 0.
+    """
+    
+    def __init__(self, algorithm: str, time_quantum: int = None, checkpoint_interval: int = 1024):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if algorithm == "Round Robin" and (time_quantum is None or time_quantum <= 0):
+            raise ValueError("Round Robin needs a positive time quantum")
+        self.algorithm = algorithm
+        self.time_quantum = time_quantum
+        self.preemptive = algorithm in ("SJF Preemptive", "Priority Preemptive")
+        self.clock = 0
+        
+        # Per-process columns, grown by submit()
+        self.pid = []
+        self.arrival = []
+        self.burst = []
+        self.priority = []
+        self.remaining = []
+        self.start = []
+        self.completion = []
+        
+        # Submitted processes that have not arrived yet, as (arrival, index)
+        self._pending = []
+        # Ready processes: a deque for Round Robin, otherwise a (key, seq, index) heap
+        self._ready = deque() if algorithm == "Round Robin" else []
+        self._seq = 0
+        self._running = None
+        self._segment_start = 0
+        self._slice_end = None
+        # Round Robin process waiting to go back behind the new arrivals
+        self._requeue = None
+        
+        # Committed schedule slices
+        self._slice_index = array('q')
+        self._slice_start = array('q')
+        self._slice_end_times = array('q')
+        
+        # Checkpoints in clock order, starting with the empty state at time 0
+        self.checkpoint_interval = checkpoint_interval
+        self._events = 0
+        self._checkpoints = [self._checkpoint()]
+        self._checkpoint_clocks = [0]
+        
+    def __len__(self):
+        return len(self.arrival)
+        
+    @property
+    def backlog(self) -> int:
+        """Submitted processes that have not finished by the current clock"""
+        queued = len(self._pending) + len(self._ready)
+        return queued + (self._running is not None) + (self._requeue is not None)
+        
+    def submit(self, process: Process) -> int:
+        """Queue a process and return its index. It may not arrive in the past."""
+        if process.arrival_time < self.clock:
+            raise ValueError(f"Process {process.pid} arrives at {process.arrival_time}, "
+                             f"before the current clock ({self.clock})")
+        index = len(self.arrival)
+        self.pid.append(process.pid)
+        self.arrival.append(process.arrival_time)
+        self.burst.append(process.burst_time)
+        self.priority.append(process.priority)
+        self.remaining.append(process.burst_time)
+        self.start.append(UNSET)
+        self.completion.append(UNSET)
+        heapq.heappush(self._pending, (process.arrival_time, index))
+        return index
+        
+    def advance_to(self, time):
+        """Simulate from the current clock up to `time`.
+        
+        Scheduling decisions due exactly at `time` are left for the next
+        call, because processes arriving at that instant may still be
+        submitted.
+        """
+        if time < self.clock:
+            raise ValueError(f"Cannot go back from {self.clock} to {time}")
+        while self.clock < time:
+            self._events += 1
+            if self._events >= max(self.checkpoint_interval, len(self._ready)):
+                self._take_checkpoint()
+            # Without preemption arrivals only matter once the CPU is free; admitting
+            # them then keeps Round Robin's arrival batches independent of `time`
+            if self._running is None or self.preemptive:
+                self._admit()
+                
+            if self._running is None:
+                if not self._dispatch():
+                    # CPU is idle, jump to the next arrival
+                    if self._pending and self._pending[0][0] < time:
+                        self.clock = self._pending[0][0]
+                        continue
+                    if time != math.inf:
+                        self.clock = time
+                    break
+            elif self.preemptive:
+                self._maybe_preempt()
+                
+            self._run(time)
+            
+    def run_to_completion(self):
+        """Simulate until every submitted process has finished"""
+        self.advance_to(math.inf)
+        
+    def insert(self, process: Process) -> int:
+        """Add a process at the end of the list, even one arriving in the past.
+        
+        The simulation is rewound to the last checkpoint before its arrival and
+        run forward again to the current clock.
+        """
+        clock = self.clock
+        if process.arrival_time < clock:
+            self._restore(self._last_checkpoint(process.arrival_time))
+        index = self.submit(process)
+        self.advance_to(clock)
+        return index
+        
+    def remove(self, index: int):
+        """Delete the process at `index`; later processes move down by one"""
+        if not 0 <= index < len(self):
+            raise IndexError("process index out of range")
+        clock = self.clock
+        checkpoint = self._last_checkpoint(min(self.arrival[index], clock))
+        
+        for column in (self.pid, self.arrival, self.burst, self.priority,
+                       self.remaining, self.start, self.completion):
+            del column[index]
+        # The process had not arrived at the checkpoint, so it appears in no
+        # earlier slice or ready queue; only the indices above it shift
+        for kept in self._checkpoints:
+            kept[-1] = [self._renumber(entry, index) for entry in kept[-1]]
+            for position in (2, 5):
+                if kept[position] is not None and kept[position] > index:
+                    kept[position] -= 1
+        slices = np.array(self._slice_index, dtype=np.int64)[:checkpoint[1]]
+        slices -= slices > index
+        self._slice_index = array('q', slices.tobytes())
+        
+        self._restore(checkpoint)
+        self.advance_to(clock)
+        
+    def _renumber(self, entry, removed):
+        """Ready-queue entry with indices above `removed` shifted down"""
+        if self.algorithm == "Round Robin":
+            return entry - 1 if entry > removed else entry
+        key, seq, index = entry
+        if index > removed:
+            index -= 1
+            if not self.preemptive:
+                seq = index
+        return key, seq, index
+        
+    def _checkpoint(self):
+        """Everything needed to resume from now that the slices do not record"""
+        return [self.clock, len(self._slice_index), self._running, self._segment_start,
+                self._slice_end, self._requeue, self._seq, list(self._ready)]
+                
+    def _take_checkpoint(self):
+        self._events = 0
+        # Only the first visit to a time is taken, before that time's arrivals are admitted
+        if self._checkpoint_clocks[-1] != self.clock:
+            self._checkpoints.append(self._checkpoint())
+            self._checkpoint_clocks.append(self.clock)
+            
+    def _last_checkpoint(self, time):
+        """Latest checkpoint taken at or before `time`; later ones are dropped"""
+        keep = bisect.bisect_right(self._checkpoint_clocks, time)
+        del self._checkpoints[keep:]
+        del self._checkpoint_clocks[keep:]
+        return self._checkpoints[-1]
+        
+    def _restore(self, checkpoint):
+        """Return to a checkpoint, rebuilding per-process state from the slices before it"""
+        (self.clock, count, self._running, self._segment_start,
+         self._slice_end, self._requeue, self._seq, ready) = checkpoint
+        del self._slice_index[count:]
+        del self._slice_start[count:]
+        del self._slice_end_times[count:]
+        self._ready = deque(ready) if self.algorithm == "Round Robin" else list(ready)
+        self._events = 0
+        
+        n = len(self)
+        index = np.array(self._slice_index, dtype=np.int64)
+        starts = np.array(self._slice_start, dtype=np.int64)
+        ends = np.array(self._slice_end_times, dtype=np.int64)
+        
+        # Slices are in time order, so the first one of a process is its start
+        # and the last one its completion
+        served = np.zeros(n, dtype=np.int64)
+        np.add.at(served, index, ends - starts)
+        start = np.full(n, UNSET, dtype=np.int64)
+        first = np.unique(index, return_index=True)[1]
+        start[index[first]] = starts[first]
+        last_end = np.full(n, UNSET, dtype=np.int64)
+        np.maximum.at(last_end, index, ends)
+        if self._running is not None:
+            served[self._running] += self.clock - self._segment_start
+            if start[self._running] == UNSET:
+                start[self._running] = self._segment_start
+                
+        burst = np.array(self.burst, dtype=np.int64)
+        remaining = burst - served
+        finished = (remaining <= 0) & (last_end != UNSET)
+        completion = np.where(finished, last_end, UNSET)
+        self.remaining = remaining.tolist()
+        self.start = start.tolist()
+        self.completion = completion.tolist()
+        
+        # Whatever is not finished, ready or on the CPU has not arrived yet
+        waiting = ~finished
+        if self.algorithm == "Round Robin":
+            waiting[list(self._ready)] = False
+        else:
+            waiting[[entry[2] for entry in self._ready]] = False
+        for index in (self._running, self._requeue):
+            if index is not None:
+                waiting[index] = False
+        pending = np.flatnonzero(waiting)
+        arrival = np.array(self.arrival, dtype=np.int64)[pending]
+        order = np.lexsort((pending, arrival))
+        # A sorted list is already a valid heap
+        self._pending = list(zip(arrival[order].tolist(), pending[order].tolist()))
+        
+    def _key(self, index):
+        """Ready-queue key: lower runs first"""
+        if self.algorithm == "FCFS":
+            return self.arrival[index]
+        elif self.algorithm == "SJF":
+            return self.burst[index]
+        elif self.algorithm == "SJF Preemptive":
+            return self.remaining[index]
+        # Higher value = higher priority, so negate it for the min-heap
+        return -self.priority[index]
+        
+    def _admit(self):
+        """Move processes that have arrived by now into the ready queue"""
+        pending = self._pending
+        if self.algorithm == "Round Robin":
+            batch = []
+            while pending and pending[0][0] <= self.clock:
+                batch.append(heapq.heappop(pending)[1])
+            # New arrivals go in list order, ahead of the process whose quantum just ended
+            self._ready.extend(sorted(batch))
+            if self._requeue is not None:
+                self._ready.append(self._requeue)
+                self._requeue = None
+            return
+        while pending and pending[0][0] <= self.clock:
+            index = heapq.heappop(pending)[1]
+            if self.preemptive:
+                self._seq += 1
+                heapq.heappush(self._ready, (self._key(index), self._seq, index))
+            else:
+                # Ties go to the earlier process
+                heapq.heappush(self._ready, (self._key(index), index, index))
+                
+    def _dispatch(self) -> bool:
+        """Start the next ready process, if any"""
+        if not self._ready:
+            return False
+        if self.algorithm == "Round Robin":
+            index = self._ready.popleft()
+            self._slice_end = self.clock + min(self.time_quantum, self.remaining[index])
+        else:
+            index = heapq.heappop(self._ready)[2]
+        self._start(index)
+        return True
+        
+    def _start(self, index):
+        self._running = index
+        self._segment_start = self.clock
+        if self.start[index] == UNSET:
+            self.start[index] = self.clock
+            
+    def _maybe_preempt(self):
+        """Switch to a newly arrived process that ranks strictly better"""
+        running = self._running
+        if self._ready and self._ready[0][0] < self._key(running):
+            self._commit(running, self._segment_start, self.clock)
+            # A preempted process stays ahead of equal keys, as in Scheduler
+            self._seq += 1
+            heapq.heappush(self._ready, (self._key(running), -self._seq, running))
+            self._start(heapq.heappop(self._ready)[2])
+            
+    def _run(self, limit):
+        """Run the current process until its next event or `limit`"""
+        index = self._running
+        if self.algorithm == "Round Robin":
+            until = self._slice_end
+        else:
+            until = self.clock + self.remaining[index]
+            if self.preemptive and self._pending:
+                until = min(until, self._pending[0][0])
+        until = min(until, limit)
+        
+        self.remaining[index] -= until - self.clock
+        self.clock = until
+        
+        if self.remaining[index] <= 0:
+            self.completion[index] = self.clock
+            self._commit(index, self._segment_start, self.clock)
+            self._running = None
+        elif self.algorithm == "Round Robin" and self.clock == self._slice_end:
+            # Quantum expired: re-queued after processes arriving meanwhile
+            self._commit(index, self._segment_start, self.clock)
+            self._requeue = index
+            self._running = None
+            
+    def _commit(self, index, start, end):
+        self._slice_index.append(index)
+        self._slice_start.append(start)
+        self._slice_end_times.append(end)
+        
+    @property
+    def schedule(self) -> ColumnarSchedule:
+        """Slices committed so far (the running process's current slice is not included)"""
+        return ColumnarSchedule(
+            np.array(self._slice_index, dtype=np.int64),
+            np.array(self._slice_start, dtype=np.int64),
+            np.array(self._slice_end_times, dtype=np.int64),
+            list(self.pid)
+        )
+        
+    def to_table(self) -> ProcessTable:
+        """Snapshot of the processes and their state as a ProcessTable"""
+        table = ProcessTable(self.arrival, self.burst, self.priority, self.pid)
+        table.write_back(self.remaining, self.start, self.completion)
+        return table
+        
+    def get_metrics(self) -> Dict[str, float]:
+        """Metrics of the processes completed so far, as in Scheduler.get_metrics"""
+        accumulator = MetricsAccumulator()
+        accumulator.add(np.array(self.arrival, dtype=np.int64), np.array(self.burst, dtype=np.int64),
+                        np.array(self.start, dtype=np.int64), np.array(self.completion, dtype=np.int64), UNSET)
+        metrics = accumulator.result()
+        index = np.array(self._slice_index, dtype=np.int64)
+        metrics['context_switches'] = int(np.count_nonzero(index[1:] != index[:-1]))
+        return metrics
@@ -0,0 +1,121 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from cache import ResultCache, shared_cache
+from compare import HIGHER_IS_BETTER, run_parallel
+from scheduler import ALGORITHMS, ProcessTable
+
+# Processes simulated first; the sample then grows by GROWTH while the budget allows
+INITIAL_SAMPLE = 2000
+GROWTH = 4
+# Below this many processes a process pool costs more than it saves
+PARALLEL_THRESHOLD = 50000
+
+# From this many processes on, recommend() asks the trained model instead of simulating
+MODEL_THRESHOLD = 1000000
+
+# Seconds to simulate one process with one algorithm, updated by every run that was not cached
+_cost = 3e-6
+
+@dataclass
+class Recommendation:
+    """Outcome of recommend().
+    
+    With method "simulation", ranking holds one row per candidate, best
+    first: {'algorithm': name} followed by the metrics measured on the
+    sample, and sampled of the workload's total processes were simulated, a
+    contiguous stretch in arrival order. With method "model" nothing was
+    simulated and each row is {'algorithm': name, 'share': s}, s being the
+    share of similar training workloads on which the algorithm was best.
+    """
+    algorithm: str
+    objective: str
+    ranking: List[Dict[str, float]]
+    sampled: int
+    total: int
+    elapsed: float
+    method: str = "simulation"
+
+def _window(table, order, size):
+    """`size` processes arriving consecutively from the middle of the workload"""
+    lo = (len(table) - size) // 2
+    if order is None:
+        rows = slice(lo, lo + size)
+    else:
+        rows = order[lo:lo + size]
+    return ProcessTable(table.arrival_time[rows], table.burst_time[rows], table.priority[rows])
+
+def recommend(processes, objective: str = "avg_waiting", algorithms=ALGORITHMS, time_quantum: int = 2,
+              budget: float = 0.5, workers: int = None, cache: Optional[ResultCache] = shared_cache,
+              use_model: bool = None) -> Recommendation:
+    """Recommend an algorithm by simulating the candidates on the workload.
+    
+    Every candidate is simulated (in parallel, through the result cache) and
+    ranked on `objective`, a metric name that is maximized for the metrics
+    in HIGHER_IS_BETTER and minimized otherwise; ties go to fewer context
+    switches. Large workloads are sampled to fit `budget` seconds: a window
+    of INITIAL_SAMPLE consecutive arrivals from the middle of the workload
+    is simulated first and grown GROWTH times while the time measured so far
+    says the next size still fits. Window sizes are fixed, so asking again
+    (e.g. for another objective) is answered from the cache.
+    
+    Workloads of MODEL_THRESHOLD processes or more (or any workload, with
+    use_model=True) are instead judged in milliseconds by the decision
+    trees of model.py, when the bundled model covers the objective;
+    use_model=False always simulates.
+    """
+    global _cost
+    started = time.perf_counter()
+    unknown = [name for name in algorithms if name not in ALGORITHMS]
+    if unknown:
+        raise ValueError(f"Unknown algorithm: {unknown[0]}")
+    table = processes if isinstance(processes, ProcessTable) else ProcessTable.from_processes(processes)
+    n = len(table)
+    if not n:
+        raise ValueError("There are no processes to simulate")
+    if use_model is None:
+        use_model = n >= MODEL_THRESHOLD
+    if use_model:
+        from model import load_model
+        model = load_model()
+        if model is not None and model.supports(objective):
+            shares = model.predict(table, objective, time_quantum)
+            ranking = [{'algorithm': algorithm, 'share': share} for algorithm, share in shares.items()
+                       if algorithm in algorithms]
+            return Recommendation(ranking[0]['algorithm'], objective, ranking, 0, n,
+                                  time.perf_counter() - started, "model")
+                                  
+    # Windows are taken in arrival order, which most workloads are stored in already
+    order = None
+    if np.any(table.arrival_time[1:] < table.arrival_time[:-1]):
+        order = np.argsort(table.arrival_time, kind='stable')
+    runs = [(algorithm, time_quantum) for algorithm in algorithms]
+    
+    size = min(n, INITIAL_SAMPLE)
+    while True:
+        sample = table if size == n and order is None else _window(table, order, size)
+        misses = len(runs) if cache is None else cache.misses
+        began = time.perf_counter()
+        metrics = run_parallel(sample, runs, workers if size >= PARALLEL_THRESHOLD else 1, cache)
+        spent = time.perf_counter() - began
+        misses = len(runs) if cache is None else cache.misses - misses
+        if objective not in metrics[0]:
+            raise ValueError(f"Unknown objective: {objective}")
+        if misses:
+            _cost = spent / (size * misses)
+        following = min(n, size * GROWTH)
+        # Simulation time grows about linearly with the number of processes. Cached runs
+        # cost nothing, but the projection assumes none are, so every call settles on the
+        # same window sizes for the same budget and finds them in the cache next time.
+        if size == n or _cost * following * len(runs) > budget - (time.perf_counter() - started):
+            break
+        size = following
+        
+    sign = -1 if objective in HIGHER_IS_BETTER else 1
+    ranking = sorted(({'algorithm': algorithm, **found} for algorithm, found in zip(algorithms, metrics)),
+                     key=lambda row: (sign * row[objective], row['context_switches']))
+    return Recommendation(ranking[0]['algorithm'], objective, ranking, size, n,
+                          time.perf_counter() - started)
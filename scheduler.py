@@ -1,8 +1,39 @@
 from dataclasses import dataclass
-from typing import List, Dict, Any
-import copy
+from typing import List, Dict, Any, Optional
+import hashlib
+import heapq
+from array import array
+from collections import deque
+from itertools import islice
 
-class Process:
+import numpy as np
+
+from cache import CachedRun, ResultCache, shared_cache
+from metrics import MetricsAccumulator
+
+# Marks start/completion/response times that have not happened yet
+UNSET = -1
+
+# Names accepted by Scheduler.set_algorithm
+ALGORITHMS = ("FCFS", "SJF", "SJF Preemptive", "Priority", "Priority Preemptive", "Round Robin")
+
+class _ProcessBase:
+    """Behaviour shared by Process and ProcessView, which store their fields differently"""
+    __slots__ = ()
+    
+    def __lt__(self, other):
+        """Comparison method for sorting processes"""
+        if isinstance(other, _ProcessBase):
+            # For Priority scheduling, higher priority value means higher priority
+            if hasattr(self, 'priority') and hasattr(other, 'priority'):
+                return self.priority > other.priority
+            return self.burst_time < other.burst_time
+        return NotImplemented
+
+class Process(_ProcessBase):
+    __slots__ = ('pid', 'arrival_time', 'burst_time', 'priority', 'remaining_time', 'start_time',
+                 'completion_time', 'waiting_time', 'turnaround_time', 'response_time')
+                 
     def __init__(self, pid, arrival_time, burst_time, priority=0):
         self.pid = pid
         self.arrival_time = arrival_time
@@ -15,436 +46,1066 @@ class Process:
         self.turnaround_time = 0
         self.response_time = None
         
-    def __lt__(self, other):
-        """Comparison method for sorting processes"""
-        if isinstance(other, Process):
-            # For Priority scheduling, higher priority value means higher priority
-            if hasattr(self, 'priority') and hasattr(other, 'priority'):
-                return self.priority > other.priority
-            return self.burst_time < other.burst_time
-        return NotImplemented
+    def reset(self):
+        self.remaining_time = self.burst_time
+        self.start_time = None
+        self.completion_time = None
+
+def _column(name, optional=False):
+    """Property reading and writing one cell of a ProcessTable column"""
+    def getter(self):
+        value = getattr(self._table, name)[self._index]
+        if optional and value == UNSET:
+            return None
+        return value.item() if isinstance(value, np.generic) else value
+        
+    def setter(self, value):
+        getattr(self._table, name)[self._index] = UNSET if value is None else value
+        
+    return property(getter, setter)
 
+class ProcessView(_ProcessBase):
+    """A Process backed by one row of a ProcessTable.
+    
+    Views hold no state of their own, so the table makes a new one each time
+    it is indexed; two views of the same row compare equal.
+    """
+    __slots__ = ('_table', '_index')
+    
+    pid = _column('pid')
+    arrival_time = _column('arrival_time')
+    burst_time = _column('burst_time')
+    priority = _column('priority')
+    remaining_time = _column('remaining_time')
+    start_time = _column('start_time', optional=True)
+    completion_time = _column('completion_time', optional=True)
+    response_time = _column('response_time', optional=True)
+    
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+        
+    @property
+    def turnaround_time(self):
+        if self.completion_time is None:
+            return 0
+        return self.completion_time - self.arrival_time
+        
+    @property
+    def waiting_time(self):
+        if self.completion_time is None:
+            return 0
+        return self.turnaround_time - self.burst_time
+        
     def reset(self):
         self.remaining_time = self.burst_time
         self.start_time = None
         self.completion_time = None
+        self.response_time = None
+        
+    def __eq__(self, other):
+        if isinstance(other, ProcessView):
+            return self._table is other._table and self._index == other._index
+        return NotImplemented
+        
+    def __hash__(self):
+        return hash((id(self._table), self._index))
+        
+    def __repr__(self):
+        return f"ProcessView(pid={self.pid!r}, index={self._index})"
+
+class ProcessTable:
+    """Processes stored column-wise as NumPy arrays.
+    
+    arrival_time, burst_time, priority and pid describe the workload and are
+    never modified by a run, so copies share them. remaining_time, start_time,
+    completion_time and response_time hold the result of the last run, with
+    UNSET marking times that have not happened. Indexing the table returns
+    ProcessView objects, so it can be used wherever a list of processes was.
+    
+    The workload columns take 32 bytes per process (memory-mapped ones only
+    as their pages are read) and the run state another 32, which reset()
+    allocates afresh. Running adds little to that: FCFS is vectorized and
+    needs about 40 bytes per process while it runs, and the other algorithms
+    update the run state in place, needing about 20 (plus whatever processes
+    are waiting in the ready queue at once).
+    """
+    
+    def __init__(self, arrival_time, burst_time, priority=None, pid=None):
+        self.arrival_time = np.ascontiguousarray(arrival_time, dtype=np.int64)
+        self.burst_time = np.ascontiguousarray(burst_time, dtype=np.int64)
+        if priority is None:
+            priority = np.zeros(len(self.arrival_time), dtype=np.int64)
+        self.priority = np.ascontiguousarray(priority, dtype=np.int64)
+        if pid is None:
+            pid = np.arange(1, len(self.arrival_time) + 1, dtype=np.int64)
+        elif not isinstance(pid, np.ndarray):
+            # Integer pids get an int64 column, anything else is kept as objects
+            pids = list(pid)
+            if all(isinstance(value, (int, np.integer)) for value in pids):
+                pid = np.array(pids, dtype=np.int64)
+            else:
+                pid = np.empty(len(pids), dtype=object)
+                pid[:] = pids
+        self.pid = pid
+        self._digest = None
+        self.reset()
+        
+    @classmethod
+    def from_processes(cls, processes) -> 'ProcessTable':
+        """Build a table from Process objects"""
+        return cls(
+            [p.arrival_time for p in processes],
+            [p.burst_time for p in processes],
+            [p.priority for p in processes],
+            [p.pid for p in processes]
+        )
+        
+    def copy(self) -> 'ProcessTable':
+        """Cheap clone: workload columns are shared, run state is copied"""
+        clone = ProcessTable.__new__(ProcessTable)
+        clone.arrival_time = self.arrival_time
+        clone.burst_time = self.burst_time
+        clone.priority = self.priority
+        clone.pid = self.pid
+        clone.remaining_time = self.remaining_time.copy()
+        clone.start_time = self.start_time.copy()
+        clone.completion_time = self.completion_time.copy()
+        clone.response_time = self.response_time.copy()
+        clone._digest = self._digest
+        return clone
+        
+    def digest(self) -> str:
+        """Content hash of the workload columns, computed once per table"""
+        if self._digest is None:
+            digest = hashlib.sha256(str(len(self)).encode())
+            for column in (self.arrival_time, self.burst_time, self.priority):
+                digest.update(column)
+            if self.pid.dtype == object:
+                digest.update(repr(self.pid.tolist()).encode())
+            else:
+                digest.update(self.pid)
+            self._digest = digest.hexdigest()
+        return self._digest
+        
+    def reset(self):
+        """Clear the run state"""
+        self.remaining_time = self.burst_time.copy()
+        self.start_time = np.full(len(self), UNSET, dtype=np.int64)
+        self.completion_time = np.full(len(self), UNSET, dtype=np.int64)
+        self.response_time = np.full(len(self), UNSET, dtype=np.int64)
+        
+    def write_back(self, remaining_time, start_time, completion_time):
+        """Store run state kept in Python lists during a simulation"""
+        self.remaining_time[:] = remaining_time
+        self.start_time[:] = start_time
+        self.completion_time[:] = completion_time
+        self.update_response_time()
+        
+    def update_response_time(self):
+        """Derive response times from the start times"""
+        np.subtract(self.start_time, self.arrival_time, out=self.response_time)
+        self.response_time[self.start_time == UNSET] = UNSET
+        
+    def __len__(self):
+        return len(self.arrival_time)
+        
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("process index out of range")
+        return ProcessView(self, index)
+        
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+@dataclass
+class ColumnarSchedule:
+    """Schedule stored as parallel int64 arrays instead of a list of dicts.
+    
+    Slice k runs process number process_index[k] (its pid is
+    pids[process_index[k]]) from start[k] to end[k]. Schedules of several
+    cores also give the core of each slice in core[k], with the slices
+    ordered by core and then by time.
+    """
+    process_index: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    pids: List[Any]
+    core: Optional[np.ndarray] = None
+    cores: int = 1
+    
+    def __len__(self):
+        return len(self.start)
+        
+    @property
+    def makespan(self) -> int:
+        return int(self.end.max()) if len(self) else 0
+        
+    @classmethod
+    def from_slices(cls, slices, pids) -> 'ColumnarSchedule':
+        """Build from an iterable of (process_index, start, end) tuples"""
+        process_index, start, end = array('q'), array('q'), array('q')
+        add_index, add_start, add_end = process_index.append, start.append, end.append
+        for index, slice_start, slice_end in slices:
+            add_index(index)
+            add_start(slice_start)
+            add_end(slice_end)
+        return cls(
+            np.frombuffer(process_index, dtype=np.int64),
+            np.frombuffer(start, dtype=np.int64),
+            np.frombuffer(end, dtype=np.int64),
+            pids
+        )
+        
+    @classmethod
+    def from_rounds(cls, slices, pids) -> 'ColumnarSchedule':
+        """Build from Round Robin slices whose full rounds are left in bulk.
+        
+        Besides (process_index, start, end) tuples, `slices` holds blocks of
+        full rounds as (queue, start, time_quantum, rounds), which are laid
+        out with NumPy rather than one slice at a time.
+        """
+        parts = []
+        process_index, start, end = array('q'), array('q'), array('q')
+        for item in slices:
+            if len(item) == 3:
+                process_index.append(item[0])
+                start.append(item[1])
+                end.append(item[2])
+                continue
+            queue, block_start, time_quantum, rounds = item
+            # Small blocks are cheaper to expand than to hand to NumPy
+            if rounds * len(queue) < 64:
+                for offset in range(rounds * len(queue)):
+                    slice_start = block_start + offset * time_quantum
+                    process_index.append(queue[offset % len(queue)])
+                    start.append(slice_start)
+                    end.append(slice_start + time_quantum)
+                continue
+            parts.append((process_index, start, end))
+            process_index, start, end = array('q'), array('q'), array('q')
+            block_starts = block_start + time_quantum * np.arange(rounds * len(queue), dtype=np.int64)
+            parts.append((np.tile(np.array(queue, dtype=np.int64), rounds), block_starts, block_starts + time_quantum))
+        parts.append((process_index, start, end))
+        columns = [
+            np.concatenate([np.asarray(column, dtype=np.int64) for column in column_parts])
+            for column_parts in zip(*parts)
+        ]
+        return cls(*columns, pids)
+        
+    def compress(self) -> 'ColumnarSchedule':
+        """Merge adjacent slices of the same process into a single segment"""
+        if not len(self):
+            return self
+        # A slice opens a new segment unless it continues the previous one
+        opens = np.ones(len(self), dtype=bool)
+        opens[1:] = (self.process_index[1:] != self.process_index[:-1]) | (self.start[1:] != self.end[:-1])
+        if self.core is not None:
+            opens[1:] |= self.core[1:] != self.core[:-1]
+        closes = np.append(opens[1:], True)
+        core = None if self.core is None else self.core[opens]
+        return ColumnarSchedule(self.process_index[opens], self.start[opens], self.end[closes], self.pids,
+                                core, self.cores)
+                                
+    def core_utilization(self) -> np.ndarray:
+        """Percentage of the makespan each core spent running processes"""
+        if self.core is None or self.makespan <= 0:
+            return np.zeros(self.cores)
+        busy = np.bincount(self.core, weights=self.end - self.start, minlength=self.cores)
+        return busy / self.makespan * 100
+        
+    def migrations(self) -> int:
+        """Times a process runs on a different core than the one it last ran on"""
+        if self.core is None:
+            return 0
+        order = np.lexsort((self.start, self.process_index))
+        index, core = self.process_index[order], self.core[order]
+        return int(np.count_nonzero((index[1:] == index[:-1]) & (core[1:] != core[:-1])))
+        
+    def to_list(self, processes) -> List[Dict[str, Any]]:
+        """Convert to the list-of-dicts form, looking processes up by index"""
+        views = {}
+        return [
+            {'process': views[index] if index in views else views.setdefault(index, processes[index]),
+             'start': start, 'end': end}
+            for index, start, end in zip(self.process_index.tolist(), self.start.tolist(), self.end.tolist())
+        ]
 
 class Scheduler:
-    def __init__(self):
-        self.processes: List[Process] = []
+    def __init__(self, cache: Optional[ResultCache] = shared_cache):
+        self.table: ProcessTable = ProcessTable([], [])
         self.algorithm: str = None
         self.time_quantum: int = None
         self.current_time: int = 0
         self.schedule: List[Dict[str, Any]] = []
+        self.context_switches: int = 0
+        # run() looks results up here before simulating; None turns caching off
+        self.cache = cache
+        # (key, CachedRun) behind the current results, if they came through the cache
+        self._cached_run = None
+        
+    @property
+    def processes(self) -> ProcessTable:
+        """The processes of the current workload, as views onto the table"""
+        return self.table
+        
+    @processes.setter
+    def processes(self, processes):
+        self.set_processes(processes)
         
-    def set_processes(self, processes: List[Process]):
-        self.processes = copy.deepcopy(processes)
+    def set_processes(self, processes):
+        """Load a list of Process objects or a ProcessTable (which is cloned)"""
+        if isinstance(processes, ProcessTable):
+            self.table = processes.copy()
+        else:
+            self.table = ProcessTable.from_processes(processes)
+        self._cached_run = None
+        
+    def load_results(self, table: ProcessTable, schedule):
+        """Adopt a run made elsewhere, e.g. by an OnlineScheduler, as the last run"""
+        self.table = table
+        self.schedule = schedule
+        self.context_switches = self._count_context_switches(schedule)
+        self._cached_run = None
         
     def set_algorithm(self, algorithm: str, time_quantum: int = None):
         self.algorithm = algorithm
         self.time_quantum = time_quantum
         
-    def run(self) -> List[Dict[str, Any]]:
+    def run(self, event_driven: bool = False, fast_forward: bool = False,
+            compress: bool = False, columnar: bool = False, metrics_only: bool = False):
+        """Run the selected algorithm.
+        
+        event_driven and fast_forward select the faster engines for the
+        preemptive algorithms and Round Robin. With compress=True, adjacent
+        slices of the same process are merged into one segment. With
+        columnar=True the schedule is returned as a ColumnarSchedule instead of
+        a list of dicts.
+        
+        With metrics_only=True no schedule is kept at all: the per-process
+        results are still stored and the get_metrics() dict is returned, so
+        memory stays O(processes) however fragmented the schedule is.
+        
+        Results are looked up in self.cache first, keyed by a hash of the
+        workload, the algorithm, the time quantum and the schedule's shape.
+        """
+        self._cached_run = None
+        if self.cache is None:
+            return self._simulate(event_driven, fast_forward, compress, columnar, metrics_only)
+            
+        key = self._cache_key(event_driven, compress, metrics_only)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return self._replay(key, entry, columnar, metrics_only)
+            
+        # Simulate in columnar form so the schedule can be stored as arrays
+        result = self._simulate(event_driven, fast_forward, compress, True, metrics_only)
+        table = self.table
+        if self.cache.fits(3 * table.remaining_time.nbytes + (0 if metrics_only else 3 * 8 * len(result))):
+            entry = CachedRun(
+                table.remaining_time.copy(),
+                table.start_time.copy(),
+                table.completion_time.copy(),
+                self.context_switches,
+                None if metrics_only else (result.process_index, result.start, result.end),
+                dict(result) if metrics_only else None
+            )
+            self.cache.put(key, entry)
+            self._cached_run = (key, entry)
+        if metrics_only or columnar:
+            return result
+        self.schedule = result.to_list(table)
+        return self.schedule
+        
+    def _cache_key(self, event_driven: bool, compress: bool, metrics_only: bool) -> str:
+        """Cache key of running the current workload and algorithm"""
+        # Only the preemptive algorithms slice differently when event driven
+        event_driven = event_driven and self.algorithm in ("SJF Preemptive", "Priority Preemptive")
+        time_quantum = self.time_quantum if self.algorithm == "Round Robin" else None
+        shape = "metrics" if metrics_only else f"event_driven={event_driven},compress={compress}"
+        key = f"{self.table.digest()}|{self.algorithm}|{time_quantum}|{shape}"
+        return hashlib.sha256(key.encode()).hexdigest()
+        
+    def _replay(self, key: str, entry: CachedRun, columnar: bool, metrics_only: bool):
+        """Restore a cached run as if it had just been simulated"""
+        table = self.table
+        table.write_back(entry.remaining_time, entry.start_time, entry.completion_time)
+        self.context_switches = entry.context_switches
+        self._cached_run = (key, entry)
+        if metrics_only:
+            self.schedule = []
+            return dict(entry.metrics)
+        schedule = ColumnarSchedule(*entry.schedule, table.pid)
+        self.schedule = schedule if columnar else schedule.to_list(table)
+        return self.schedule
+        
+    def cached_metrics(self) -> Optional[Dict[str, float]]:
+        """Replay a cached metrics-only run of the current algorithm, or return None.
+        
+        Unlike run(metrics_only=True) this never simulates, so the misses can
+        be handed to other processes.
+        """
+        if self.cache is None:
+            return None
+        key = self._cache_key(False, False, True)
+        entry = self.cache.get(key)
+        return None if entry is None else self._replay(key, entry, False, True)
+        
+    def load_metrics_run(self, start_time, completion_time, context_switches: int, metrics: Dict[str, float]):
+        """Adopt a metrics-only run simulated elsewhere and cache it as run() would"""
+        table = self.table
+        table.write_back(np.where(completion_time == UNSET, table.burst_time, 0), start_time, completion_time)
+        self.schedule = []
+        self.context_switches = context_switches
+        self._cached_run = None
+        if self.cache is not None and self.cache.fits(3 * table.remaining_time.nbytes):
+            key = self._cache_key(False, False, True)
+            entry = CachedRun(
+                table.remaining_time.copy(),
+                table.start_time.copy(),
+                table.completion_time.copy(),
+                context_switches,
+                None,
+                dict(metrics)
+            )
+            self.cache.put(key, entry)
+            self._cached_run = (key, entry)
+            
+    def _simulate(self, event_driven, fast_forward, compress, columnar, metrics_only):
+        """run() without the cache"""
+        if metrics_only:
+            self.schedule = []
+            if self.algorithm == "FCFS":
+                self._fcfs_arrays()
+                # Every process runs once, straight after a different one
+                self.context_switches = max(len(self.table) - 1, 0)
+            else:
+                self.context_switches = self._drain(self._slices(event_driven, fast_forward, expand_rounds=False))
+            return self.get_metrics()
+            
+        if columnar and self.algorithm == "FCFS":
+            # FCFS has a closed form, so skip the per-slice loop entirely
+            self.schedule = ColumnarSchedule(*self._fcfs_arrays(), self.table.pid)
+            self.context_switches = self._count_context_switches(self.schedule)
+            return self.schedule
+            
+        if fast_forward and self.algorithm == "Round Robin":
+            # Fast-forwarded rounds are laid out as arrays instead of slice by slice
+            schedule = self._round_robin_schedule(self.time_quantum)
+            if compress:
+                schedule = schedule.compress()
+            if columnar:
+                self.schedule = schedule
+                self.context_switches = self._count_context_switches(schedule)
+                return schedule
+            return self._record_columnar(schedule)
+            
+        slices = self._slices(event_driven, fast_forward)
+        if compress:
+            slices = self._merge_slices(slices)
+            
+        if columnar:
+            self.schedule = ColumnarSchedule.from_slices(slices, self.table.pid)
+            self.context_switches = self._count_context_switches(self.schedule)
+            return self.schedule
+        return self._record(slices)
+        
+    def iter_schedule(self, event_driven: bool = False, fast_forward: bool = False,
+                      compress: bool = False):
+        """Lazy counterpart of run(): yield each slice as soon as it is decided.
+        
+        Slices are dicts like the entries of run()'s schedule and nothing is
+        kept in memory. The table is reset when iteration starts, and the
+        process state is only settled once the generator is exhausted or
+        closed. Stopping early (close(), or a break once the generator is
+        released) leaves the processes as they were after the last slice
+        handed out.
+        """
+        slices = self._slices(event_driven, fast_forward)
+        table = self.table
+        table.reset()
+        self.schedule = []
+        self.context_switches = 0
+        self._cached_run = None
+        previous = None
+        
+        def slot(index, start, end):
+            nonlocal previous
+            if previous is not None and index != previous:
+                self.context_switches += 1
+            previous = index
+            return {'process': table[index], 'start': start, 'end': end}
+            
+        # With compress, a slice is held back until the next one shows it cannot grow
+        pending = None
+        try:
+            for index, start, end in slices:
+                if not compress:
+                    yield slot(index, start, end)
+                elif pending is not None and pending[0] == index and pending[2] == start:
+                    pending = (index, pending[1], end)
+                else:
+                    last, pending = pending, (index, start, end)
+                    if last is not None:
+                        yield slot(*last)
+            if pending is not None:
+                last, pending = pending, None
+                yield slot(*last)
+        finally:
+            slices.close()
+            if pending is not None:
+                # The engine has already run the held back slice, so take it back
+                index, start, end = pending
+                table.remaining_time[index] += end - start
+                if table.start_time[index] == start:
+                    table.start_time[index] = UNSET
+                if table.completion_time[index] == end:
+                    table.completion_time[index] = UNSET
+                table.update_response_time()
+                
+    def _slices(self, event_driven=False, fast_forward=False, expand_rounds=True):
+        """(process_index, start, end) generator for the selected algorithm"""
         if self.algorithm == "FCFS":
-            return self.fcfs()
+            return self._fcfs_slices()
         elif self.algorithm == "SJF":
-            return self.sjf()
+            return self._non_preemptive_slices(memoryview(self.table.burst_time))
         elif self.algorithm == "Round Robin":
-            return self.round_robin(self.time_quantum)
+            return self._round_robin_slices(self.time_quantum, fast_forward, expand_rounds)
         elif self.algorithm == "Priority":
-            return self.priority()
+            # Higher value = higher priority, so negate it for the min-heap
+            return self._non_preemptive_slices(memoryview(-self.table.priority))
         elif self.algorithm == "Priority Preemptive":
-            return self.priority_preemptive()
+            return self._preemptive_slices(memoryview(-self.table.priority), event_driven)
         elif self.algorithm == "SJF Preemptive":
-            return self.sjf_preemptive()
+            return self._preemptive_slices(None, event_driven)
         else:
             raise ValueError(f"Unknown algorithm: {self.algorithm}")
             
-    def fcfs(self):
-        """First Come First Served scheduling algorithm"""
-        # Sort processes by arrival time
-        sorted_processes = sorted(self.processes, key=lambda p: p.arrival_time)
+    @staticmethod
+    def _drain(slices) -> int:
+        """Run a slice generator to the end without keeping the slices.
         
-        # Reset all processes
-        for process in self.processes:
-            process.reset()
-            
-        current_time = 0
-        schedule = []
+        Returns the number of context switches. Fast-forwarded Round Robin rounds
+        arrive as (queue, start, time_quantum, rounds) and are counted in bulk.
+        """
+        previous = None
+        switches = 0
+        for item in slices:
+            if len(item) == 4:
+                queue, _, _, rounds = item
+                if previous is not None and queue[0] != previous:
+                    switches += 1
+                if len(queue) > 1:
+                    switches += rounds * len(queue) - 1
+                previous = queue[-1]
+            else:
+                if previous is not None and item[0] != previous:
+                    switches += 1
+                previous = item[0]
+        return switches
         
-        for process in sorted_processes:
-            # If there's a gap between processes, advance the time
-            if current_time < process.arrival_time:
-                current_time = process.arrival_time
-                
-            # Set start time if this is the first time the process runs
-            if process.start_time is None:
-                process.start_time = current_time
-                
-            # Add to schedule
-            schedule.append({
-                'process': process,
-                'start': current_time,
-                'end': current_time + process.burst_time
-            })
-            
-            # Update current time
-            current_time += process.burst_time
-            
-            # Set completion time
-            process.completion_time = current_time
-            process.remaining_time = 0
-            
+    @staticmethod
+    def _count_context_switches(schedule) -> int:
+        """Number of times a CPU switches from one process to another"""
+        if isinstance(schedule, ColumnarSchedule):
+            switches = schedule.process_index[1:] != schedule.process_index[:-1]
+            if schedule.core is not None:
+                # Only consecutive slices on the same core are a switch
+                switches &= schedule.core[1:] == schedule.core[:-1]
+            return int(np.count_nonzero(switches))
+        return sum(1 for previous, slot in zip(schedule, islice(schedule, 1, None))
+                   if previous['process'] != slot['process'])
+                   
+    def _record(self, slices) -> List[Dict[str, Any]]:
+        """Store the slices as the current schedule, in list-of-dicts form"""
+        table = self.table
+        # Slices of the same process share one view, kept only as long as the schedule
+        views = {}
+        schedule = [{'process': views[index] if index in views else views.setdefault(index, table[index]),
+                     'start': start, 'end': end} for index, start, end in slices]
         self.schedule = schedule
+        self._cached_run = None
+        self.context_switches = self._count_context_switches(schedule)
         return schedule
         
-    def sjf(self):
-        """Shortest Job First scheduling algorithm (non-preemptive)"""
-        # Reset all processes
-        for process in self.processes:
-            process.reset()
-            
-        # Create a copy of processes
-        remaining_processes = self.processes.copy()
+    def _record_columnar(self, schedule) -> List[Dict[str, Any]]:
+        """Store a ColumnarSchedule as the current schedule, in list-of-dicts form"""
+        self.schedule = schedule.to_list(self.table)
+        self._cached_run = None
+        self.context_switches = self._count_context_switches(schedule)
+        return self.schedule
         
-        current_time = 0
-        schedule = []
+    def _round_robin_schedule(self, time_quantum) -> ColumnarSchedule:
+        """Fast-forwarded Round Robin, with the bulk rounds kept as arrays"""
+        slices = self._round_robin_slices(time_quantum, fast_forward=True, expand_rounds=False)
+        return ColumnarSchedule.from_rounds(slices, self.table.pid)
         
-        while remaining_processes:
-            # Find available processes at current time
-            available_processes = [p for p in remaining_processes if p.arrival_time <= current_time]
-            
-            if not available_processes:
-                # No processes available, advance time to next arrival
-                next_arrival = min(p.arrival_time for p in remaining_processes)
-                current_time = next_arrival
+    @staticmethod
+    def _merge_slices(slices):
+        """Merge adjacent (process_index, start, end) slices of the same process"""
+        pending = None
+        for index, start, end in slices:
+            if pending is not None and pending[0] == index and pending[2] == start:
+                pending = (index, pending[1], end)
                 continue
-                
-            # Find the process with shortest burst time
-            next_process = min(available_processes, key=lambda p: p.burst_time)
+            if pending is not None:
+                yield pending
+            pending = (index, start, end)
+        if pending is not None:
+            yield pending
             
-            # Set start time if this is the first time the process runs
-            if next_process.start_time is None:
-                next_process.start_time = current_time
-                
-            # Add to schedule
-            schedule.append({
-                'process': next_process,
-                'start': current_time,
-                'end': current_time + next_process.burst_time
-            })
-            
-            # Update current time
-            current_time += next_process.burst_time
-            
-            # Set completion time
-            next_process.completion_time = current_time
-            next_process.remaining_time = 0
-            
-            # Remove from remaining processes
-            remaining_processes.remove(next_process)
-            
-        self.schedule = schedule
-        return schedule
+    @staticmethod
+    def compress_schedule(schedule: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge adjacent slices of the same process into a single segment"""
+        compressed = []
+        for slot in schedule:
+            if compressed and compressed[-1]['process'] == slot['process'] and compressed[-1]['end'] == slot['start']:
+                compressed[-1]['end'] = slot['end']
+            else:
+                compressed.append(dict(slot))
+        return compressed
         
-    def round_robin(self, time_quantum):
-        """Round Robin scheduling algorithm"""
-        # Reset all processes
-        for process in self.processes:
-            process.reset()
-            
-        # Create a copy of processes
-        remaining_processes = self.processes.copy()
+    def fcfs(self):
+        """First Come First Served scheduling algorithm"""
+        return self._record(self._fcfs_slices())
         
-        current_time = 0
-        schedule = []
+    def sjf(self):
+        """Shortest Job First scheduling algorithm (non-preemptive)"""
+        return self._record(self._non_preemptive_slices(memoryview(self.table.burst_time)))
         
-        # Sort by arrival time initially
-        ready_queue = []
+    def round_robin(self, time_quantum, fast_forward=False):
+        """Round Robin scheduling algorithm
         
-        while remaining_processes or ready_queue:
-            # Add newly arrived processes to ready queue
-            newly_arrived = [p for p in remaining_processes if p.arrival_time <= current_time]
-            for process in newly_arrived:
-                ready_queue.append(process)
-                remaining_processes.remove(process)
-                
-            if not ready_queue:
-                # No processes in ready queue, advance time to next arrival
-                if remaining_processes:
-                    current_time = min(p.arrival_time for p in remaining_processes)
-                continue
-                
-            # Get next process from ready queue
-            current_process = ready_queue.pop(0)
-            
-            # Set start time if this is the first time the process runs
-            if current_process.start_time is None:
-                current_process.start_time = current_time
-                
-            # Calculate execution time for this quantum
-            execution_time = min(time_quantum, current_process.remaining_time)
-            
-            # Add to schedule
-            schedule.append({
-                'process': current_process,
-                'start': current_time,
-                'end': current_time + execution_time
-            })
-            
-            # Update current time
-            current_time += execution_time
-            
-            # Update remaining time
-            current_process.remaining_time -= execution_time
-            
-            # Check if process is completed
-            if current_process.remaining_time <= 0:
-                current_process.completion_time = current_time
-            else:
-                # Add newly arrived processes before re-adding current process
-                newly_arrived = [p for p in remaining_processes if p.arrival_time <= current_time]
-                for process in newly_arrived:
-                    ready_queue.append(process)
-                    remaining_processes.remove(process)
-                    
-                # Add back to ready queue
-                ready_queue.append(current_process)
-                
-        self.schedule = schedule
-        return schedule
+        With fast_forward=True, whenever no process can arrive or finish during
+        the next k full rounds of the ready queue, those rounds are applied in
+        bulk instead of one quantum at a time. The schedule is the same either way.
+        """
+        if fast_forward:
+            return self._record_columnar(self._round_robin_schedule(time_quantum))
+        return self._record(self._round_robin_slices(time_quantum))
         
     def priority(self):
         """Priority scheduling algorithm (non-preemptive)"""
-        # Reset all processes
-        for process in self.processes:
-            process.reset()
+        # Higher value = higher priority, so negate it for the min-heap
+        return self._record(self._non_preemptive_slices(memoryview(-self.table.priority)))
+        
+    def priority_preemptive(self, event_driven=False):
+        """Priority scheduling algorithm (preemptive)"""
+        return self._record(self._preemptive_slices(memoryview(-self.table.priority), event_driven))
+        
+    def sjf_preemptive(self, event_driven=False):
+        """Shortest Job First scheduling algorithm (preemptive)"""
+        return self._record(self._preemptive_slices(None, event_driven))
+        
+    def _run_state(self):
+        """Reset the table and return memoryviews of its remaining, start and
+        completion columns, which the engines update in place.
+        
+        Indexing a memoryview yields plain ints like a list would, without
+        copying the columns into Python objects.
+        """
+        table = self.table
+        table.reset()
+        return memoryview(table.remaining_time), memoryview(table.start_time), memoryview(table.completion_time)
+        
+    def _arrival_order(self):
+        """Process indices sorted by arrival time (ties in table order) and
+        their arrival times"""
+        arrival = self.table.arrival_time
+        # Traces are usually recorded in arrival order already
+        if np.all(arrival[1:] >= arrival[:-1]):
+            return range(len(arrival)), memoryview(arrival)
+        order = np.argsort(arrival, kind='stable')
+        return memoryview(order), memoryview(arrival[order])
+        
+    def _arrival_argsort(self) -> np.ndarray:
+        arrival = self.table.arrival_time
+        # Traces are usually recorded in arrival order already
+        if np.all(arrival[1:] >= arrival[:-1]):
+            return np.arange(len(arrival))
+        return np.argsort(arrival, kind='stable')
+        
+    def _fcfs_slices(self):
+        order, start, end = self._fcfs_arrays(store=False)
+        committed = 0
+        try:
+            for slot in zip(order.tolist(), start.tolist(), end.tolist()):
+                committed += 1
+                yield slot
+        finally:
+            # Only the processes handed out so far have run
+            self.table.reset()
+            self._store_fcfs(order[:committed], start[:committed], end[:committed])
             
-        # Create a copy of processes
-        remaining_processes = self.processes.copy()
+    def _fcfs_arrays(self, store=True):
+        """Vectorized FCFS, returning the run order and start/end times.
+        
+        end[k] = max(arrival[k], end[k-1]) + burst[k] has a closed form: with S the
+        running sum of bursts, end = S + running max of max(arrival - (S - burst), 0).
+        """
+        table = self.table
+        order = self._arrival_argsort()
+        arrival = table.arrival_time[order]
+        burst = table.burst_time[order]
+        
+        total = np.cumsum(burst)
+        end = total + np.maximum.accumulate(np.maximum(arrival - (total - burst), 0))
+        start = end - burst
+        
+        if store:
+            self._store_fcfs(order, start, end)
+        return order, start, end
+        
+    def _store_fcfs(self, order, start, end):
+        """Store the run state of FCFS processes that have run"""
+        table = self.table
+        table.remaining_time[order] = 0
+        table.start_time[order] = start
+        table.completion_time[order] = end
+        table.response_time[order] = start - table.arrival_time[order]
+        
+    def _round_robin_slices(self, time_quantum, fast_forward=False, expand_rounds=True):
+        if time_quantum is None or time_quantum <= 0:
+            raise ValueError("Round Robin needs a positive time quantum")
+        table = self.table
+        remaining, start, completion = self._run_state()
+        
+        # Arrival cursor over process indices sorted by arrival time
+        arrivals, arrival_times = self._arrival_order()
+        next_arrival = 0
         
         current_time = 0
-        schedule = []
+        ready_queue = deque()
+        current_index = None
+        # Slices to run before trying to fast-forward again, so a long queue is
+        # scanned at most once per round
+        fast_forward_wait = 0
         
-        while remaining_processes:
-            # Find available processes at current time
-            available_processes = [p for p in remaining_processes if p.arrival_time <= current_time]
-            
-            if not available_processes:
-                # No processes available, advance time to next arrival
-                next_arrival = min(p.arrival_time for p in remaining_processes)
-                current_time = next_arrival
-                continue
+        try:
+            while True:
+                # Add newly arrived processes to ready queue (in list order, as before)
+                batch_start = next_arrival
+                while next_arrival < len(arrivals) and arrival_times[next_arrival] <= current_time:
+                    next_arrival += 1
+                ready_queue.extend(sorted(arrivals[batch_start:next_arrival]))
                 
-            # Find the process with highest priority (higher value = higher priority)
-            next_process = max(available_processes, key=lambda p: p.priority)
-            
-            # Set start time if this is the first time the process runs
-            if next_process.start_time is None:
-                next_process.start_time = current_time
+                # Add the preempted process back behind the new arrivals
+                if current_index is not None:
+                    ready_queue.append(current_index)
+                    current_index = None
+                    
+                if not ready_queue:
+                    # No processes in ready queue, advance time to next arrival
+                    if next_arrival == len(arrivals):
+                        break
+                    current_time = arrival_times[next_arrival]
+                    continue
+                    
+                if fast_forward and fast_forward_wait > 0:
+                    fast_forward_wait -= 1
+                elif fast_forward:
+                    rounds = self._full_rounds([remaining[i] for i in ready_queue], time_quantum, current_time,
+                        arrival_times[next_arrival] if next_arrival < len(arrivals) else None)
+                    if rounds > 0:
+                        # Every process in the queue runs a full quantum in each round
+                        round_length = len(ready_queue) * time_quantum
+                        if expand_rounds:
+                            # Apply the slices one at a time, so the state matches the slices
+                            # handed out if the caller stops partway through the block
+                            for r in range(rounds):
+                                for j, index in enumerate(ready_queue):
+                                    slice_start = current_time + r * round_length + j * time_quantum
+                                    if start[index] == UNSET:
+                                        start[index] = slice_start
+                                    remaining[index] -= time_quantum
+                                    yield index, slice_start, slice_start + time_quantum
+                        else:
+                            for j, index in enumerate(ready_queue):
+                                if start[index] == UNSET:
+                                    start[index] = current_time + j * time_quantum
+                                remaining[index] -= rounds * time_quantum
+                            # The caller only needs totals, so report the whole block at once
+                            yield tuple(ready_queue), current_time, time_quantum, rounds
+                        current_time += rounds * round_length
+                        continue
+                    fast_forward_wait = len(ready_queue)
+                    
+                # Get next process from ready queue
+                index = ready_queue.popleft()
                 
-            # Add to schedule
-            schedule.append({
-                'process': next_process,
-                'start': current_time,
-                'end': current_time + next_process.burst_time
-            })
-            
-            # Update current time
-            current_time += next_process.burst_time
-            
-            # Set completion time
-            next_process.completion_time = current_time
-            next_process.remaining_time = 0
-            
-            # Remove from remaining processes
-            remaining_processes.remove(next_process)
+                # Set start time if this is the first time the process runs
+                if start[index] == UNSET:
+                    start[index] = current_time
+                    
+                # Calculate execution time for this quantum
+                execution_time = min(time_quantum, remaining[index])
+                
+                # Update current time
+                slice_start = current_time
+                current_time += execution_time
+                
+                # Update remaining time
+                remaining[index] -= execution_time
+                
+                # Check if process is completed
+                if remaining[index] <= 0:
+                    completion[index] = current_time
+                else:
+                    # Re-queued after any processes that arrived meanwhile
+                    current_index = index
+                    
+                # Add to schedule
+                yield index, slice_start, current_time
+        finally:
+            table.update_response_time()
             
-        self.schedule = schedule
-        return schedule
+    @staticmethod
+    def _full_rounds(remaining_times, time_quantum, current_time, next_arrival):
+        """Number of full Round Robin rounds that can run before any process in
+        the queue finishes or a new process arrives"""
+        # Every process must still have work left after the last round
+        rounds = -(-min(remaining_times) // time_quantum) - 1
+        if next_arrival is not None:
+            # The last slice must end before the next arrival
+            round_length = len(remaining_times) * time_quantum
+            rounds = min(rounds, -(-(next_arrival - current_time) // round_length) - 1)
+        return max(rounds, 0)
         
-    def priority_preemptive(self):
-        """Priority scheduling algorithm (preemptive)"""
-        # Reset all processes
-        for process in self.processes:
-            process.reset()
-            
-        # Create a copy of processes
-        remaining_processes = self.processes.copy()
-        ready_queue = []
+    def _non_preemptive_slices(self, keys):
+        """Non-preemptive scheduling driven by an arrival cursor and a heap.
+        
+        Whenever the CPU becomes free, the arrived process with the lowest key
+        runs to completion. Ties go to the process listed first, so the result is
+        the same as scanning the remaining processes with min().
+        """
+        table = self.table
+        remaining, start, completion = self._run_state()
+        burst = memoryview(table.burst_time)
+        
+        # Arrival cursor over process indices sorted by arrival time
+        arrivals, arrival_times = self._arrival_order()
+        next_arrival = 0
+        
+        # Heap entries are (key, index) so ties go to the earlier process
+        ready_heap = []
         current_time = 0
-        schedule = []
-        
-        while remaining_processes or ready_queue:
-            # Add newly arrived processes to ready queue
-            newly_arrived = [p for p in remaining_processes if p.arrival_time <= current_time]
-            for process in newly_arrived:
-                ready_queue.append(process)
-                remaining_processes.remove(process)
+        
+        try:
+            while next_arrival < len(arrivals) or ready_heap:
+                # Add newly arrived processes to the ready heap
+                while next_arrival < len(arrivals) and arrival_times[next_arrival] <= current_time:
+                    index = arrivals[next_arrival]
+                    heapq.heappush(ready_heap, (keys[index], index))
+                    next_arrival += 1
+                    
+                if not ready_heap:
+                    # No processes available, advance time to next arrival
+                    current_time = arrival_times[next_arrival]
+                    continue
+                    
+                index = heapq.heappop(ready_heap)[1]
                 
-            if not ready_queue:
-                # No processes in ready queue, advance time to next arrival
-                if remaining_processes:
-                    current_time = min(p.arrival_time for p in remaining_processes)
-                continue
+                # Set start time if this is the first time the process runs
+                if start[index] == UNSET:
+                    start[index] = current_time
+                    
+                # Update current time
+                slice_start = current_time
+                current_time += burst[index]
                 
-            # Sort ready queue by priority (higher value = higher priority)
-            ready_queue.sort(key=lambda p: p.priority, reverse=True)
-            
-            # Get highest priority process
-            current_process = ready_queue[0]
-            
-            # Set start time if this is the first time the process runs
-            if current_process.start_time is None:
-                current_process.start_time = current_time
+                # Set completion time
+                completion[index] = current_time
+                remaining[index] = 0
                 
-            # Calculate how long to run this process
-            time_slice = 1  # Run for 1 time unit
-            
-            # Add to schedule
-            schedule.append({
-                'process': current_process,
-                'start': current_time,
-                'end': current_time + time_slice
-            })
-            
-            # Update process state
-            current_process.remaining_time -= time_slice
-            current_time += time_slice
-            
-            # Check if process is completed
-            if current_process.remaining_time <= 0:
-                current_process.completion_time = current_time
-                ready_queue.remove(current_process)
+                # Add to schedule
+                yield index, slice_start, current_time
+        finally:
+            table.update_response_time()
             
-        self.schedule = schedule
-        return schedule
+    def _preemptive_slices(self, keys, event_driven=False):
+        """Preemptive scheduling: the arrived process with the lowest key runs.
         
-    def sjf_preemptive(self):
-        """Shortest Job First scheduling algorithm (preemptive)"""
-        # Reset all processes
-        for process in self.processes:
-            process.reset()
-            
-        # Create a copy of processes
-        remaining_processes = self.processes.copy()
+        `keys` holds a static key per process; None ranks by remaining time.
+        The time-stepped version re-sorts the ready queue and emits a slice every
+        time unit. The event-driven version jumps straight to the next arrival or
+        completion and keeps ready processes in a heap, so its cost grows with the
+        number of events rather than with the total burst time.
+        """
+        if event_driven:
+            return self._preemptive_event_slices(keys)
+        return self._preemptive_tick_slices(keys)
+        
+    def _preemptive_tick_slices(self, keys):
+        table = self.table
+        remaining, start, completion = self._run_state()
+        arrival = memoryview(table.arrival_time)
+        rank = remaining if keys is None else keys
+        
+        # Create a copy of process indices
+        remaining_processes = list(range(len(table)))
         ready_queue = []
         current_time = 0
-        schedule = []
-        
-        while remaining_processes or ready_queue:
-            # Add newly arrived processes to ready queue
-            newly_arrived = [p for p in remaining_processes if p.arrival_time <= current_time]
-            for process in newly_arrived:
-                ready_queue.append(process)
-                remaining_processes.remove(process)
+        
+        try:
+            while remaining_processes or ready_queue:
+                # Add newly arrived processes to ready queue
+                newly_arrived = [i for i in remaining_processes if arrival[i] <= current_time]
+                if newly_arrived:
+                    ready_queue.extend(newly_arrived)
+                    remaining_processes = [i for i in remaining_processes if arrival[i] > current_time]
+                    
+                if not ready_queue:
+                    # No processes in ready queue, advance time to next arrival
+                    if remaining_processes:
+                        current_time = min(arrival[i] for i in remaining_processes)
+                    continue
+                    
+                # Sort ready queue by key (stable, so ties keep their queue order)
+                ready_queue.sort(key=rank.__getitem__)
                 
-            if not ready_queue:
-                # No processes in ready queue, advance time to next arrival
-                if remaining_processes:
-                    current_time = min(p.arrival_time for p in remaining_processes)
-                continue
+                # Get the best process
+                index = ready_queue[0]
                 
-            # Sort ready queue by remaining time
-            ready_queue.sort(key=lambda p: p.remaining_time)
-            
-            # Get process with shortest remaining time
-            current_process = ready_queue[0]
-            
-            # Set start time if this is the first time the process runs
-            if current_process.start_time is None:
-                current_process.start_time = current_time
+                # Set start time if this is the first time the process runs
+                if start[index] == UNSET:
+                    start[index] = current_time
+                    
+                # Calculate how long to run this process
+                time_slice = 1  # Run for 1 time unit
                 
-            # Calculate how long to run this process
-            time_slice = 1  # Run for 1 time unit
-            
-            # Add to schedule
-            schedule.append({
-                'process': current_process,
-                'start': current_time,
-                'end': current_time + time_slice
-            })
-            
-            # Update process state
-            current_process.remaining_time -= time_slice
-            current_time += time_slice
-            
-            # Check if process is completed
-            if current_process.remaining_time <= 0:
-                current_process.completion_time = current_time
-                ready_queue.remove(current_process)
+                # Update process state
+                remaining[index] -= time_slice
+                current_time += time_slice
+                
+                # Check if process is completed
+                if remaining[index] <= 0:
+                    completion[index] = current_time
+                    ready_queue.pop(0)
+                    
+                # Add to schedule
+                yield index, current_time - time_slice, current_time
+        finally:
+            table.update_response_time()
             
-        self.schedule = schedule
-        return schedule
+    def _preemptive_event_slices(self, keys):
+        table = self.table
+        remaining, start, completion = self._run_state()
+        rank = remaining if keys is None else keys
+        
+        # Arrival cursor over process indices sorted by arrival time
+        arrivals, arrival_times = self._arrival_order()
+        next_arrival = 0
+        
+        # Heap entries are (key, seq, index). New arrivals get an increasing seq so
+        # they queue behind equal keys, while a preempted process gets a decreasing
+        # negative seq so it stays ahead of them, matching the stable sort used by
+        # the time-stepped version.
+        ready_heap = []
+        seq = 0
+        current_index = None
+        segment_start = 0
+        current_time = 0
         
-    def suggest_algorithm(self) -> str:
-        """Suggest the best algorithm based on process characteristics"""
-        # Check if there are processes with different priorities
-        priorities = [p.priority for p in self.processes]
-        if len(set(priorities)) > 1:
-            return 'Priority'
+        try:
+            while next_arrival < len(arrivals) or ready_heap or current_index is not None:
+                # Add newly arrived processes to the ready heap
+                while next_arrival < len(arrivals) and arrival_times[next_arrival] <= current_time:
+                    index = arrivals[next_arrival]
+                    seq += 1
+                    heapq.heappush(ready_heap, (rank[index], seq, index))
+                    next_arrival += 1
+                    
+                if current_index is None:
+                    if not ready_heap:
+                        # CPU is idle, jump to the next arrival
+                        current_time = arrival_times[next_arrival]
+                        continue
+                    current_index = heapq.heappop(ready_heap)[2]
+                    segment_start = current_time
+                elif ready_heap and ready_heap[0][0] < rank[current_index]:
+                    # A better process arrived, preempt the running one
+                    yield current_index, segment_start, current_time
+                    seq += 1
+                    heapq.heappush(ready_heap, (rank[current_index], -seq, current_index))
+                    current_index = heapq.heappop(ready_heap)[2]
+                    segment_start = current_time
+                    
+                # Set start time if this is the first time the process runs
+                if start[current_index] == UNSET:
+                    start[current_index] = current_time
+                    
+                # Run until the process completes or the next process arrives
+                run_until = current_time + remaining[current_index]
+                if next_arrival < len(arrivals):
+                    run_until = min(run_until, arrival_times[next_arrival])
+                remaining[current_index] -= run_until - current_time
+                current_time = run_until
+                
+                # Check if process is completed
+                if remaining[current_index] <= 0:
+                    completion[current_index] = current_time
+                    yield current_index, segment_start, current_time
+                    current_index = None
+        finally:
+            table.update_response_time()
             
-        # Check if processes have short burst times
-        burst_times = [p.burst_time for p in self.processes]
-        if all(bt < 5 for bt in burst_times) and len(burst_times) > 1 and max(burst_times) != min(burst_times):
-            return 'SJF'
+    def suggest_algorithm(self, objective: str = "avg_waiting", budget: float = 0.5) -> str:
+        """Algorithm with the best `objective` when simulated on the current workload.
+        
+        See recommend.recommend(); Round Robin uses the current time quantum
+        (2 if none is set) and large workloads are sampled to fit `budget`
+        seconds.
+        """
+        from recommend import recommend
+        return recommend(self.table, objective, time_quantum=self.time_quantum or 2, budget=budget,
+                         cache=self.cache).algorithm
+                         
+    def get_metrics(self, schedule=None, chunk_size: int = 1 << 20) -> Dict[str, float]:
+        """Scheduling metrics of the last run.
+        
+        Besides the average turnaround, waiting and response times and CPU
+        utilization, this reports p50/p95/p99/max waiting and response times,
+        throughput (completed processes per time unit), Jain's fairness index
+        of burst / turnaround and the number of context switches. The table is
+        read in chunks in a single pass and percentiles come from a
+        bounded-memory sketch (within 1%).
+        
+        Context switches are counted from `schedule` (a list of dicts or a
+        ColumnarSchedule) when one is given, otherwise taken from the last run.
+        """
+        cached = self._cached_run if schedule is None else None
+        if cached is not None and cached[1].metrics is not None:
+            return dict(cached[1].metrics)
             
-        # Check for many processes with similar arrival times
-        if len(self.processes) > 5:
-            arrival_times = [p.arrival_time for p in self.processes]
-            if max(arrival_times) - min(arrival_times) < 10:  # If arrivals are clustered
-                return 'Round Robin'
-                
-        # Default to FCFS for simple workloads or when no specific pattern is detected
-        return 'FCFS'
-
-    def get_metrics(self) -> Dict[str, float]:
-        if not self.schedule:
-            return {
-                'avg_turnaround': 0.0,
-                'avg_waiting': 0.0,
-                'avg_response': 0.0,
-                'cpu_utilization': 0.0
-            }
+        table = self.table
+        accumulator = MetricsAccumulator()
+        for lo in range(0, len(table), chunk_size):
+            hi = lo + chunk_size
+            accumulator.add(table.arrival_time[lo:hi], table.burst_time[lo:hi],
+                            table.start_time[lo:hi], table.completion_time[lo:hi], UNSET)
+        metrics = accumulator.result()
+        
+        if schedule is None:
+            metrics['context_switches'] = self.context_switches
+        else:
+            metrics['context_switches'] = self._count_context_switches(schedule)
             
-        total_turnaround = 0
-        total_waiting = 0
-        total_response = 0
-        completed_processes = 0
-        
-        for process in self.processes:
-            # Only calculate metrics for processes that have completed
-            if process.completion_time is not None:
-                completed_processes += 1
-                turnaround = process.completion_time - process.arrival_time
-                waiting = turnaround - process.burst_time
-                response = process.start_time - process.arrival_time if process.start_time is not None else 0
-                
-                total_turnaround += turnaround
-                total_waiting += waiting
-                total_response += response
-        
-        # Avoid division by zero
-        if completed_processes == 0:
-            return {
-                'avg_turnaround': 0.0,
-                'avg_waiting': 0.0,
-                'avg_response': 0.0,
-                'cpu_utilization': 0.0
-            }
+        lanes = self.schedule if schedule is None else schedule
+        if isinstance(lanes, ColumnarSchedule) and lanes.core is not None:
+            # A multicore schedule, e.g. from MulticoreScheduler: the work is shared by its cores
+            metrics['cpu_utilization'] /= lanes.cores
+            utilization = lanes.core_utilization()
+            metrics['min_core_utilization'] = float(utilization.min())
+            metrics['max_core_utilization'] = float(utilization.max())
+            metrics['migrations'] = lanes.migrations()
             
-        avg_turnaround = total_turnaround / completed_processes
-        avg_waiting = total_waiting / completed_processes
-        avg_response = total_response / completed_processes
-        
-        # Calculate CPU utilization
-        total_burst_time = sum(p.burst_time for p in self.processes)
-        total_time = max(p.completion_time for p in self.processes if p.completion_time is not None)
-        cpu_utilization = (total_burst_time / total_time) * 100 if total_time > 0 else 0
-        
-        return {
-            'avg_turnaround': avg_turnaround,
-            'avg_waiting': avg_waiting,
-            'avg_response': avg_response,
-            'cpu_utilization': cpu_utilization
-        }
+        if cached is not None:
+            key, entry = cached
+            entry.metrics = dict(metrics)
+            self.cache.put(key, entry)
+        return metrics
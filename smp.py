@@ -0,0 +1,354 @@
+import heapq
+import math
+from array import array
+from typing import Dict
+
+import numpy as np
+
+from metrics import MetricsAccumulator
+from scheduler import ALGORITHMS, UNSET, ColumnarSchedule, ProcessTable
+
+# Ways MulticoreScheduler can pick the core for a new arrival
+PLACEMENTS = ("least-loaded", "round-robin")
+
+class MulticoreScheduler:
+    """Event-driven simulation of `cores` CPUs, each with its own run queue.
+    
+    Arrivals are put on a core by `placement`: "least-loaded" picks the core
+    with the fewest queued and running processes, "round-robin" deals them
+    out in turn. Each core serves its queue with the selected algorithm, and
+    a process preempted on a core goes back to that core's queue. With
+    steal=True a core that runs out of work takes the next waiting process of
+    the core with the longest queue. Every `balance_interval` time units,
+    waiting processes are pushed from the longest queues to the least loaded
+    cores until no core has two more processes than another.
+    
+    Only arrivals, completions, quantum expiries and balancing ticks are
+    simulated, so the cost grows with the number of events and a little with
+    the number of cores. With one core, processes are served exactly as by
+    Scheduler's event-driven engines.
+    """
+    
+    def __init__(self, algorithm: str, cores: int = 4, time_quantum: int = None,
+                 placement: str = "least-loaded", steal: bool = True, balance_interval: int = None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if algorithm == "Round Robin" and (time_quantum is None or time_quantum <= 0):
+            raise ValueError("Round Robin needs a positive time quantum")
+        if cores < 1:
+            raise ValueError("A multicore simulation needs at least one core")
+        if placement not in PLACEMENTS:
+            raise ValueError(f"Unknown placement: {placement}")
+        if balance_interval is not None and balance_interval <= 0:
+            raise ValueError("The balance interval must be positive")
+        self.algorithm = algorithm
+        self.cores = cores
+        self.time_quantum = time_quantum
+        self.placement = placement
+        self.steal = steal
+        self.balance_interval = balance_interval
+        
+        self.table = ProcessTable([], [])
+        self.affinity = None
+        self.schedule = None
+        self.context_switches = 0
+        # Times a process ran on a different core than the one it last ran on
+        self.migrations = 0
+        # Time each core spent running processes
+        self.busy_time = [0] * cores
+        
+    def set_processes(self, processes, affinity=None):
+        """Load a list of Process objects or a ProcessTable (which is cloned).
+        
+        affinity optionally pins processes to cores: affinity[i] is the core
+        process i must run on, or -1 if it may run on any. Pinned processes
+        are never moved by stealing or balancing.
+        """
+        if isinstance(processes, ProcessTable):
+            table = processes.copy()
+        else:
+            table = ProcessTable.from_processes(processes)
+        if affinity is not None:
+            affinity = np.asarray(affinity, dtype=np.int64)
+            if len(affinity) != len(table):
+                raise ValueError("affinity needs one entry per process")
+            if np.any((affinity < -1) | (affinity >= self.cores)):
+                raise ValueError(f"affinity must be -1 or a core number below {self.cores}")
+        self.table = table
+        self.affinity = affinity
+        
+    def run(self, metrics_only: bool = False):
+        """Simulate the workload and return its schedule as a ColumnarSchedule.
+        
+        The slices are ordered by core and then by time, with the core of
+        each slice in schedule.core. With metrics_only=True no slices are
+        kept and the get_metrics() dict is returned instead.
+        """
+        self.table.reset()
+        slices = None if metrics_only else (array('q'), array('q'), array('q'), array('q'))
+        self._simulate(slices)
+        if metrics_only:
+            self.schedule = None
+            return self.get_metrics()
+        index, start, end, core = (np.frombuffer(column, dtype=np.int64) for column in slices)
+        # Each core's slices were recorded in time order
+        order = np.argsort(core, kind='stable')
+        self.schedule = ColumnarSchedule(index[order], start[order], end[order], self.table.pid,
+                                         core[order], self.cores)
+        return self.schedule
+        
+    def _simulate(self, slices):
+        """Run the event loop, storing (index, start, end, core) slices if given"""
+        # Work on plain lists during the run and store the state at the end
+        table = self.table
+        n = len(table)
+        cores = self.cores
+        algorithm = self.algorithm
+        quantum = self.time_quantum if algorithm == "Round Robin" else None
+        preemptive = algorithm in ("SJF Preemptive", "Priority Preemptive")
+        arrival = table.arrival_time.tolist()
+        remaining = table.burst_time.tolist()
+        start = [UNSET] * n
+        completion = [UNSET] * n
+        
+        # Queue entries are (key, seq, index) as in Scheduler: FCFS and Round Robin
+        # queue in order of arrival (seq), the others by key with ties to the
+        # earlier process, and a preempted process stays ahead of equal keys
+        if algorithm == "SJF":
+            rank = table.burst_time.tolist()
+        elif algorithm == "SJF Preemptive":
+            rank = remaining
+        elif "Priority" in algorithm:
+            # Higher value = higher priority, so negate it for the min-heap
+            rank = (-table.priority).tolist()
+        else:
+            rank = None
+        pinned = None if self.affinity is None else self.affinity.tolist()
+        
+        # Arrival cursor over process indices sorted by arrival time
+        arrivals = np.argsort(table.arrival_time, kind='stable').tolist()
+        next_arrival = 0
+        
+        # Per core: pinned and movable queues, running process and when its slice ends
+        local = [[] for _ in range(cores)]
+        shared = [[] for _ in range(cores)]
+        queued = [0] * cores
+        load = [0] * cores
+        running = [None] * cores
+        segment_start = [0] * cores
+        until = [None] * cores
+        last = [None] * cores
+        idle = set(range(cores))
+        busy = [0] * cores
+        # Pending slice ends as (time, core); entries whose time no longer matches until[core] are stale
+        events = []
+        ran_on = [-1] * n
+        # Processes in the movable queues
+        waiting = 0
+        
+        least_loaded = self.placement == "least-loaded"
+        deal = 0
+        steal = self.steal
+        interval = self.balance_interval
+        next_balance = interval if interval else math.inf
+        if slices is not None:
+            add_index, add_start, add_end, add_core = (column.append for column in slices)
+        seq = 0
+        switches = 0
+        migrations = 0
+        heappush, heappop = heapq.heappush, heapq.heappop
+        
+        try:
+            while True:
+                while events and until[events[0][1]] != events[0][0]:
+                    heappop(events)
+                time = events[0][0] if events else math.inf
+                # While every core is busy, arrivals only matter once one frees up (unless
+                # they can preempt); admitting them then keeps Round Robin's batches as in Scheduler
+                if next_arrival < n and (idle or preemptive):
+                    time = min(time, arrival[arrivals[next_arrival]])
+                if waiting and next_balance < time:
+                    time = next_balance
+                if time == math.inf:
+                    break
+                touched = []
+                
+                # Place newly arrived processes on a core
+                batch_start = next_arrival
+                while next_arrival < n and arrival[arrivals[next_arrival]] <= time:
+                    next_arrival += 1
+                if next_arrival > batch_start:
+                    batch = arrivals[batch_start:next_arrival]
+                    if quantum is not None:
+                        # Round Robin takes each batch in list order, as Scheduler does
+                        batch.sort()
+                    for index in batch:
+                        seq += 1
+                        if rank is None:
+                            entry = (0, seq, index)
+                        elif preemptive:
+                            entry = (rank[index], seq, index)
+                        else:
+                            entry = (rank[index], index, index)
+                        if pinned is not None and pinned[index] >= 0:
+                            core = pinned[index]
+                            heappush(local[core], entry)
+                        else:
+                            if least_loaded:
+                                core = load.index(min(load))
+                            else:
+                                core = deal
+                                deal = (deal + 1) % cores
+                            heappush(shared[core], entry)
+                            queued[core] += 1
+                            waiting += 1
+                        load[core] += 1
+                        touched.append(core)
+                        
+                # Slices ending now: the process completes or, in Round Robin, is re-queued
+                while events and events[0][0] == time:
+                    core = heappop(events)[1]
+                    if until[core] != time:
+                        continue
+                    index = running[core]
+                    remaining[index] -= time - segment_start[core]
+                    busy[core] += time - segment_start[core]
+                    if slices is not None:
+                        add_index(index)
+                        add_start(segment_start[core])
+                        add_end(time)
+                        add_core(core)
+                    running[core] = until[core] = None
+                    idle.add(core)
+                    touched.append(core)
+                    if remaining[index] <= 0:
+                        completion[index] = time
+                        load[core] -= 1
+                        continue
+                    # Quantum expired: back of this core's queue, behind the new arrivals
+                    seq += 1
+                    if pinned is not None and pinned[index] >= 0:
+                        heappush(local[core], (0, seq, index))
+                    else:
+                        heappush(shared[core], (0, seq, index))
+                        queued[core] += 1
+                        waiting += 1
+                        
+                # A new arrival that ranks strictly better preempts the process on its core
+                if preemptive:
+                    for core in touched:
+                        index = running[core]
+                        if index is None:
+                            continue
+                        tops = local[core][:1] + shared[core][:1]
+                        if not tops:
+                            continue
+                        best = min(tops)
+                        elapsed = time - segment_start[core]
+                        key = remaining[index] - elapsed if rank is remaining else rank[index]
+                        if best[0] >= key:
+                            continue
+                        remaining[index] -= elapsed
+                        busy[core] += elapsed
+                        if slices is not None:
+                            add_index(index)
+                            add_start(segment_start[core])
+                            add_end(time)
+                            add_core(core)
+                        running[core] = until[core] = None
+                        idle.add(core)
+                        seq += 1
+                        if pinned is not None and pinned[index] >= 0:
+                            heappush(local[core], (rank[index], -seq, index))
+                        else:
+                            heappush(shared[core], (rank[index], -seq, index))
+                            queued[core] += 1
+                            waiting += 1
+                            
+                if time >= next_balance:
+                    # Push waiting processes from the longest queues to the least loaded cores
+                    while waiting:
+                        source = queued.index(max(queued))
+                        target = load.index(min(load))
+                        if load[source] - load[target] < 2:
+                            break
+                        heappush(shared[target], heappop(shared[source]))
+                        queued[source] -= 1
+                        load[source] -= 1
+                        queued[target] += 1
+                        load[target] += 1
+                        touched.append(target)
+                    next_balance = (time // interval + 1) * interval
+                    
+                # Idle cores start their next process, stealing one if their queues are empty
+                if steal and waiting and idle:
+                    touched.extend(sorted(idle))
+                for core in touched:
+                    if running[core] is not None:
+                        continue
+                    queue = shared[core]
+                    if queue and (not local[core] or queue[0] < local[core][0]):
+                        index = heappop(queue)[2]
+                        queued[core] -= 1
+                        waiting -= 1
+                    elif local[core]:
+                        index = heappop(local[core])[2]
+                    elif steal and waiting:
+                        victim = queued.index(max(queued))
+                        index = heappop(shared[victim])[2]
+                        queued[victim] -= 1
+                        load[victim] -= 1
+                        load[core] += 1
+                        waiting -= 1
+                    else:
+                        continue
+                    idle.discard(core)
+                    running[core] = index
+                    segment_start[core] = time
+                    if start[index] == UNSET:
+                        start[index] = time
+                    if ran_on[index] != core:
+                        if ran_on[index] != -1:
+                            migrations += 1
+                        ran_on[index] = core
+                    if last[core] is not None and last[core] != index:
+                        switches += 1
+                    last[core] = index
+                    end = time + (remaining[index] if quantum is None else min(quantum, remaining[index]))
+                    until[core] = end
+                    heappush(events, (end, core))
+        finally:
+            table.write_back(remaining, start, completion)
+            self.context_switches = switches
+            self.migrations = migrations
+            self.busy_time = busy
+            
+    def core_utilization(self) -> np.ndarray:
+        """Percentage of the makespan each core spent running processes"""
+        makespan = int(self.table.completion_time.max()) if len(self.table) else 0
+        if makespan <= 0:
+            return np.zeros(self.cores)
+        return np.array(self.busy_time, dtype=np.float64) / makespan * 100
+        
+    def get_metrics(self, chunk_size: int = 1 << 20) -> Dict[str, float]:
+        """Scheduler.get_metrics for the last run, plus per-core figures.
+        
+        cpu_utilization is averaged over the cores; min_core_utilization and
+        max_core_utilization show how evenly the work was spread, and
+        migrations counts the times a process ran on a different core than
+        the one it last ran on.
+        """
+        table = self.table
+        accumulator = MetricsAccumulator()
+        for lo in range(0, len(table), chunk_size):
+            hi = lo + chunk_size
+            accumulator.add(table.arrival_time[lo:hi], table.burst_time[lo:hi],
+                            table.start_time[lo:hi], table.completion_time[lo:hi], UNSET)
+        metrics = accumulator.result()
+        metrics['cpu_utilization'] /= self.cores
+        utilization = self.core_utilization()
+        metrics['min_core_utilization'] = float(utilization.min())
+        metrics['max_core_utilization'] = float(utilization.max())
+        metrics['context_switches'] = self.context_switches
+        metrics['migrations'] = self.migrations
+        return metrics
@@ -0,0 +1,107 @@
+import math
+
+import numpy as np
+
+from scheduler import ProcessTable
+
+ARRIVAL_MODELS = ("poisson", "mmpp")
+BURST_MODELS = ("exponential", "pareto", "lognormal")
+
+def generate_workload(n: int, arrivals: str = "poisson", rate: float = 0.1,
+                      burstiness: float = 10.0, sojourn: float = None,
+                      bursts: str = "exponential", mean_burst: float = 10.0,
+                      pareto_shape: float = 2.5, lognormal_sigma: float = 1.0,
+                      priorities: int = 5, zipf_exponent: float = 1.0,
+                      seed: int = None) -> ProcessTable:
+    """Generate a random workload of `n` processes as a ProcessTable.
+    
+    arrivals is "poisson" (rate arrivals per time unit on average) or "mmpp",
+    a two-state Markov-modulated Poisson process with the same mean rate
+    whose busy state is `burstiness` times as intense as its quiet state;
+    each state lasts `sojourn` time units on average (default: long enough
+    for about 1000 arrivals). bursts are "exponential", "pareto" (tail index
+    `pareto_shape`) or "lognormal" (log-space spread `lognormal_sigma`), all
+    scaled to `mean_burst`. Priorities 1..`priorities` follow a Zipf law, so
+    most processes get priority 1 and few get the highest ones. Everything is
+    drawn in bulk from one generator seeded with `seed`.
+    Settings outside these ranges raise ValueError.
+    """
+    if arrivals not in ARRIVAL_MODELS:
+        raise ValueError(f"Unknown arrival model: {arrivals}")
+    if bursts not in BURST_MODELS:
+        raise ValueError(f"Unknown burst model: {bursts}")
+    if n < 0:
+        raise ValueError(f"The number of processes cannot be negative ({n})")
+    # Written as `not x > 0` so NaN is rejected too
+    for name, value in (("rate", rate), ("mean_burst", mean_burst), ("burstiness", burstiness)):
+        if not value > 0:
+            raise ValueError(f"{name} must be positive, got {value}")
+    if sojourn is not None and not sojourn > 0:
+        raise ValueError(f"sojourn must be positive, got {sojourn}")
+    if not pareto_shape > 1:
+        raise ValueError(f"pareto_shape must be above 1 for the mean to exist, got {pareto_shape}")
+    if not lognormal_sigma >= 0:
+        raise ValueError(f"lognormal_sigma cannot be negative, got {lognormal_sigma}")
+    if priorities < 1:
+        raise ValueError(f"Need at least one priority level, got {priorities}")
+    rng = np.random.default_rng(seed)
+    
+    if arrivals == "poisson":
+        arrival_times = np.cumsum(rng.exponential(1 / rate, n))
+    else:
+        arrival_times = _mmpp_arrivals(rng, n, rate, burstiness, sojourn or 1000 / rate)
+        
+    if bursts == "exponential":
+        burst_times = rng.exponential(mean_burst, n)
+    elif bursts == "pareto":
+        # numpy's pareto is the Lomax form; shift and scale it to the wanted mean
+        scale = mean_burst * (pareto_shape - 1) / pareto_shape
+        burst_times = scale * (1 + rng.pareto(pareto_shape, n))
+    else:
+        mu = math.log(mean_burst) - lognormal_sigma ** 2 / 2
+        burst_times = rng.lognormal(mu, lognormal_sigma, n)
+        
+    # Zipf over a bounded number of levels, sampled through the CDF
+    weights = np.cumsum(1 / np.arange(1, priorities + 1) ** zipf_exponent)
+    priority = np.searchsorted(weights, rng.random(n) * weights[-1], side='right') + 1
+    
+    return ProcessTable(
+        arrival_times.astype(np.int64),
+        np.maximum(np.ceil(burst_times), 1).astype(np.int64),
+        priority.astype(np.int64)
+    )
+
+def _mmpp_arrivals(rng, n, rate, burstiness, sojourn):
+    """First n arrival times of a two-state MMPP, quiet state first.
+    
+    Arrivals of each state form a Poisson process on the time spent in that
+    state, so both are drawn as one cumulative sum on their own clock and
+    mapped back into the state's phases of the real timeline.
+    """
+    quiet = 2 * rate / (1 + burstiness)
+    rates = (quiet, quiet * burstiness)
+    # Phases for about 10% more arrivals than needed, doubled until enough
+    cycles = int(1.1 * n / (2 * rate * sojourn)) + 16
+    while True:
+        durations = rng.exponential(sojourn, (cycles, 2))
+        phase_ends = np.cumsum(durations.ravel())
+        phase_starts = phase_ends - durations.ravel()
+        times = []
+        for state in (0, 1):
+            state_ends = np.cumsum(durations[:, state])
+            total = state_ends[-1]
+            expected = rates[state] * total
+            clock = np.cumsum(rng.exponential(1 / rates[state], int(expected + 6 * math.sqrt(expected)) + 16))
+            while clock[-1] < total:
+                clock = np.concatenate([clock, clock[-1] + np.cumsum(rng.exponential(1 / rates[state], len(clock)))])
+            clock = clock[clock < total]
+            # The clock is sorted, so count arrivals per phase instead of searching each one
+            per_phase = np.diff(np.searchsorted(clock, state_ends, side='left'), prepend=0)
+            phase = np.repeat(np.arange(cycles), per_phase)
+            offset = clock - (state_ends[phase] - durations[phase, state])
+            times.append(phase_starts[2 * phase + state] + offset)
+        # Both halves are sorted already, so the stable sort just merges them
+        merged = np.sort(np.concatenate(times), kind='stable')
+        if len(merged) >= n:
+            return merged[:n]
+        cycles *= 2
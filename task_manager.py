@@ -3,10 +3,6 @@ from tkinter import ttk
 import random
 import time
 import threading
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import numpy as np
 
 class TaskManagerWindow:
     def __init__(self, parent=None, scheduler=None):
@@ -34,9 +30,14 @@ class TaskManagerWindow:
         # Process-specific performance data
         self.process_data = {}
         
+        # Execution history for the 3D view, kept even while it is not shown
+        self.process_history = {}
+        self.current_time = 0
+        
         # Create notebook
         self.notebook = ttk.Notebook(self.window)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
         
         # Create tabs
         self.performance_tab = ttk.Frame(self.notebook)
@@ -53,13 +54,18 @@ class TaskManagerWindow:
         self.notebook.add(self.visualization_3d_tab, text="3D Visualization")
         self.notebook.add(self.timeline_tab, text="Timeline Analysis")
         
-        # Initialize tabs
-        self.setup_performance_tab()
-        self.setup_processes_tab()
-        self.setup_metrics_tab()
-        self.setup_queue_tab()
-        self.setup_3d_visualization_tab()
-        self.setup_timeline_tab()
+        # Each tab is built the first time it is selected
+        self.tab_builders = {
+            str(self.performance_tab): self.setup_performance_tab,
+            str(self.processes_tab): self.setup_processes_tab,
+            str(self.metrics_tab): self.setup_metrics_tab,
+            str(self.queue_tab): self.setup_queue_tab,
+            str(self.visualization_3d_tab): self.setup_3d_visualization_tab,
+            str(self.timeline_tab): self.setup_timeline_tab
+        }
+        self.built_tabs = set()
+        # Build the first tab once the window is up, in case no event is sent for it
+        self.window.after_idle(self.on_tab_changed)
         
         # Start monitoring thread
         self.monitor_thread = threading.Thread(target=self.update_metrics)
@@ -69,7 +75,20 @@ class TaskManagerWindow:
         # Bind closing event
         self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
         
+    def on_tab_changed(self, event=None):
+        """Build the selected tab if this is the first time it is shown"""
+        tab = self.notebook.select()
+        if tab and tab not in self.built_tabs:
+            self.tab_builders[tab]()
+            self.built_tabs.add(tab)
+            
+    def is_built(self, tab):
+        return str(tab) in self.built_tabs
+        
     def setup_performance_tab(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
         # System metrics at the top
         metrics_frame = ttk.Frame(self.performance_tab)
         metrics_frame.pack(fill=tk.X, pady=10)
@@ -155,6 +174,9 @@ class TaskManagerWindow:
         self.perf_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
     def setup_processes_tab(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
         # Create treeview for processes
         processes_frame = ttk.Frame(self.processes_tab)
         processes_frame.pack(fill=tk.BOTH, expand=False, padx=10, pady=10)
@@ -225,6 +247,9 @@ class TaskManagerWindow:
         self.process_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
     def setup_metrics_tab(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
         # Create frame for metrics graphs
         metrics_frame = ttk.Frame(self.metrics_tab)
         metrics_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -289,12 +314,15 @@ class TaskManagerWindow:
         
     def setup_3d_visualization_tab(self):
         """Setup the 3D visualization tab"""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
         # Create frame for 3D visualization
         visualization_frame = ttk.Frame(self.visualization_3d_tab)
         visualization_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Create 3D figure
-        self.fig_3d = plt.Figure(figsize=(8, 6), dpi=100)
+        self.fig_3d = Figure(figsize=(8, 6), dpi=100)
         self.ax_3d = self.fig_3d.add_subplot(111, projection='3d')
         self.ax_3d.set_title("3D CPU Scheduling Visualization")
         
@@ -308,10 +336,6 @@ class TaskManagerWindow:
         self.canvas_3d.draw()
         self.canvas_3d.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
-        # Initialize data structures for 3D visualization
-        self.process_history = {}  # Store process execution history
-        self.current_time = 0
-        
     def setup_timeline_tab(self):
         """Setup the timeline analysis tab"""
         # Create main frame
@@ -409,35 +433,9 @@ class TaskManagerWindow:
                 self.network_history.append(network)
                 self.network_history = self.network_history[-60:]
                 
-                # Update system metrics display
-                self.cpu_var.set(f"CPU: {cpu}%")
-                self.memory_var.set(f"Memory: {memory}%")
-                self.disk_var.set(f"Disk: {disk} MB/s")
-                self.network_var.set(f"Network: {network} Mbps")
-                
-                # Update progress bars
-                self.cpu_progress['value'] = cpu
-                self.memory_progress['value'] = memory
-                self.disk_progress['value'] = disk
-                self.network_progress['value'] = network
-                
-                # Update graphs
-                x = list(range(len(self.cpu_history)))
-                
-                self.cpu_line.set_data(x, self.cpu_history)
-                self.memory_line.set_data(x, self.memory_history)
-                self.disk_line.set_data(x, self.disk_history)
-                self.network_line.set_data(x, self.network_history)
-                
-                # Adjust y-axis limits if needed
-                self.cpu_ax.set_xlim(0, len(x) - 1)
-                self.memory_ax.set_xlim(0, len(x) - 1)
-                self.disk_ax.set_xlim(0, len(x) - 1)
-                self.network_ax.set_xlim(0, len(x) - 1)
-                
-                # Redraw canvas
-                self.perf_canvas.draw()
-                
+                if self.is_built(self.performance_tab):
+                    self.update_performance_tab(cpu, memory, disk, network)
+                    
                 # Update process list
                 self.update_process_list()
                 
@@ -461,11 +459,44 @@ class TaskManagerWindow:
             except Exception as e:
                 print(f"Error updating metrics: {e}")
                 
+    def update_performance_tab(self, cpu, memory, disk, network):
+        # Update system metrics display
+        self.cpu_var.set(f"CPU: {cpu}%")
+        self.memory_var.set(f"Memory: {memory}%")
+        self.disk_var.set(f"Disk: {disk} MB/s")
+        self.network_var.set(f"Network: {network} Mbps")
+        
+        # Update progress bars
+        self.cpu_progress['value'] = cpu
+        self.memory_progress['value'] = memory
+        self.disk_progress['value'] = disk
+        self.network_progress['value'] = network
+        
+        # Update graphs
+        x = list(range(len(self.cpu_history)))
+        
+        self.cpu_line.set_data(x, self.cpu_history)
+        self.memory_line.set_data(x, self.memory_history)
+        self.disk_line.set_data(x, self.disk_history)
+        self.network_line.set_data(x, self.network_history)
+        
+        # Adjust y-axis limits if needed
+        self.cpu_ax.set_xlim(0, len(x) - 1)
+        self.memory_ax.set_xlim(0, len(x) - 1)
+        self.disk_ax.set_xlim(0, len(x) - 1)
+        self.network_ax.set_xlim(0, len(x) - 1)
+        
+        # Redraw canvas
+        self.perf_canvas.draw()
+        
     def update_process_list(self):
-        # Clear existing items
-        for item in self.processes_tree.get_children():
-            self.processes_tree.delete(item)
+        # The process data feeds other tabs too, so it is sampled even when this tab is not built
+        shown = self.is_built(self.processes_tab)
         
+        # Clear existing items
+        if shown:
+            self.processes_tree.delete(*self.processes_tree.get_children())
+            
         # Get processes from scheduler if available, otherwise use random data
         processes = []
         if self.scheduler and hasattr(self.scheduler, 'processes'):
@@ -571,12 +602,14 @@ class TaskManagerWindow:
                 self.process_data[pid]['disk'] = disk
                 self.process_data[pid]['network'] = network
                 self.process_data[pid]['status'] = status
-            
-            self.processes_tree.insert('', 'end', values=(pid, name, status, f"{cpu}%", f"{memory} MB", f"{disk} MB/s", f"{network} Mbps"))
-        
+                
+            if shown:
+                self.processes_tree.insert('', 'end', values=(pid, name, status, f"{cpu}%", f"{memory} MB", f"{disk} MB/s", f"{network} Mbps"))
+                
         # Update process graphs
-        self.update_process_graphs()
-    
+        if shown:
+            self.update_process_graphs()
+            
     def update_process_graphs(self):
         """Update the process-specific performance graphs"""
         # Clear previous lines
@@ -675,7 +708,10 @@ class TaskManagerWindow:
                 self.tat_history = self.tat_history[-max_points:]
                 self.wt_history = self.wt_history[-max_points:]
                 self.rt_history = self.rt_history[-max_points:]
-            
+                
+            if not self.is_built(self.metrics_tab):
+                return
+                
             # Update plot data
             self.tat_line.set_data(self.time_points, self.tat_history)
             self.wt_line.set_data(self.time_points, self.wt_history)
@@ -695,6 +731,8 @@ class TaskManagerWindow:
             
     def update_process_queues(self):
         """Update process queues visualization"""
+        if not self.is_built(self.queue_tab):
+            return
         try:
             # Clear canvas
             self.queue_canvas.delete('all')
@@ -828,8 +866,6 @@ class TaskManagerWindow:
     def update_3d_visualization(self):
         """Update the 3D visualization with real-time data"""
         try:
-            self.ax_3d.clear()
-            
             # Update process history
             for pid, data in self.process_data.items():
                 if pid not in self.process_history:
@@ -851,6 +887,13 @@ class TaskManagerWindow:
                     self.process_history[pid]['times'] = self.process_history[pid]['times'][-30:]
                     self.process_history[pid]['cpu_usage'] = self.process_history[pid]['cpu_usage'][-30:]
                     self.process_history[pid]['process_id'] = self.process_history[pid]['process_id'][-30:]
+                    
+            # The timeline follows this clock, so it ticks even when the 3D tab is not built
+            self.current_time += 1
+            if not self.is_built(self.visualization_3d_tab):
+                return
+                
+            self.ax_3d.clear()
             
             # Plot 3D lines for each process
             colors = ['red', 'green', 'blue', 'cyan', 'magenta', 'yellow']
@@ -895,14 +938,13 @@ class TaskManagerWindow:
             # Update canvas
             self.canvas_3d.draw()
             
-            # Increment time
-            self.current_time += 1
-            
         except Exception as e:
             print(f"Error updating 3D visualization: {e}")
             
     def update_timeline(self):
         """Update the timeline visualization"""
+        if not self.is_built(self.timeline_tab):
+            return
         try:
             self.timeline_canvas.delete("all")
             
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+from cache import ResultCache
+from scheduler import ALGORITHMS, Scheduler
+from synthetic import generate_workload
+
+@pytest.fixture(scope="module")
+def table():
+    return generate_workload(n=500, rate=0.1, mean_burst=8, priorities=3, seed=7)
+
+def run(table, algorithm, cache, **options):
+    scheduler = Scheduler(cache=cache)
+    scheduler.set_processes(table)
+    scheduler.set_algorithm(algorithm, 4)
+    result = scheduler.run(**options)
+    return scheduler, result
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_hit_matches_uncached_run(table, algorithm, tmp_path):
+    expected, schedule = run(table, algorithm, None, columnar=True)
+    metrics = expected.get_metrics()
+    
+    cache = ResultCache(directory=str(tmp_path))
+    run(table, algorithm, cache, columnar=True)
+    assert (cache.hits, cache.misses) == (0, 1)
+    
+    # A new cache on the same directory finds the run on disk
+    reloaded = ResultCache(directory=str(tmp_path))
+    for _ in range(2):
+        scheduler, found = run(table, algorithm, reloaded, columnar=True)
+        np.testing.assert_array_equal(found.process_index, schedule.process_index)
+        np.testing.assert_array_equal(found.start, schedule.start)
+        np.testing.assert_array_equal(found.end, schedule.end)
+        np.testing.assert_array_equal(scheduler.table.completion_time, expected.table.completion_time)
+        assert scheduler.get_metrics() == metrics
+    assert (reloaded.hits, reloaded.misses) == (2, 0)
+
+def test_metrics_only_round_trip(table, tmp_path):
+    _, expected = run(table, "Round Robin", None, metrics_only=True)
+    cache = ResultCache(directory=str(tmp_path))
+    assert run(table, "Round Robin", cache, metrics_only=True)[1] == expected
+    assert run(table, "Round Robin", cache, metrics_only=True)[1] == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_other_quantum_misses(table):
+    cache = ResultCache()
+    run(table, "Round Robin", cache, metrics_only=True)
+    scheduler = Scheduler(cache=cache)
+    scheduler.set_processes(table)
+    scheduler.set_algorithm("Round Robin", 5)
+    scheduler.run(metrics_only=True)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+def test_damaged_file_is_a_miss(table, tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    _, expected = run(table, "SJF", cache, metrics_only=True)
+    for name in os.listdir(tmp_path):
+        with open(tmp_path / name, "wb") as file:
+            file.write(b"not an npz file")
+            
+    reloaded = ResultCache(directory=str(tmp_path))
+    assert run(table, "SJF", reloaded, metrics_only=True)[1] == expected
+    assert (reloaded.hits, reloaded.misses) == (0, 1)
+
+def test_memory_tier_is_bounded(table):
+    cache = ResultCache(max_memory_bytes=20000)
+    for algorithm in ALGORITHMS:
+        run(table, algorithm, cache, metrics_only=True)
+    assert 0 < len(cache) < len(ALGORITHMS)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from cluster import DISPATCHERS, _NodeShard, simulate_cluster
+from scheduler import ALGORITHMS, ProcessTable, Scheduler
+from synthetic import generate_workload
+
+@pytest.fixture(scope="module")
+def table():
+    return generate_workload(n=2000, rate=0.5, mean_burst=10, priorities=4, seed=5)
+
+def reference(table, algorithm):
+    """Start and completion times from the single-CPU engine"""
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(table)
+    scheduler.set_algorithm(algorithm, 3)
+    scheduler.run(event_driven=True, fast_forward=True, metrics_only=True)
+    return scheduler.table.start_time, scheduler.table.completion_time
+
+@pytest.mark.parametrize("dispatcher", DISPATCHERS)
+def test_same_result_for_any_worker_count(table, dispatcher):
+    results = [simulate_cluster(table, 5, "Round Robin", 3, dispatcher, window=20, workers=workers, seed=1)
+               for workers in (0, 1, 3)]
+    for result in results[1:]:
+        np.testing.assert_array_equal(result.node, results[0].node)
+        np.testing.assert_array_equal(result.table.start_time, results[0].table.start_time)
+        np.testing.assert_array_equal(result.table.completion_time, results[0].table.completion_time)
+        assert result.metrics == results[0].metrics
+        assert result.node_metrics == results[0].node_metrics
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_nodes_schedule_like_scheduler(table, algorithm):
+    result = simulate_cluster(table, 4, algorithm, 3, "power-of-two", window=50, workers=0, seed=2)
+    assert sum(metrics['processes'] for metrics in result.node_metrics) == len(table)
+    for node in range(4):
+        # A node serves the processes routed to it as a lone Scheduler would
+        indices = np.flatnonzero(result.node == node)
+        alone = ProcessTable(table.arrival_time[indices], table.burst_time[indices], table.priority[indices])
+        start, completion = reference(alone, algorithm)
+        np.testing.assert_array_equal(result.table.start_time[indices], start)
+        np.testing.assert_array_equal(result.table.completion_time[indices], completion)
+
+def test_single_node_is_scheduler(table):
+    result = simulate_cluster(table, 1, "SJF Preemptive", workers=0)
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(table)
+    scheduler.set_algorithm("SJF Preemptive")
+    expected = scheduler.run(event_driven=True, metrics_only=True)
+    for name, value in expected.items():
+        assert result.metrics[name] == pytest.approx(value), name
+
+def test_round_robin_needs_quantum_before_forking(table):
+    with pytest.raises(ValueError, match="time quantum"):
+        simulate_cluster(table, 2, "Round Robin", workers=1)
+
+def test_worker_error_is_raised(table, monkeypatch):
+    def fail(self, time, batches):
+        raise ValueError("node exploded")
+        
+    # Workers are forked, so they see the patched method too
+    monkeypatch.setattr(_NodeShard, "advance", fail)
+    with pytest.raises(RuntimeError, match="node exploded"):
+        simulate_cluster(table, 4, "FCFS", window=20, workers=2)
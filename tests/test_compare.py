@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from cache import ResultCache
+from compare import compare_algorithms, sweep_quantum, tune_quantum
+from scheduler import ALGORITHMS, Scheduler
+from synthetic import generate_workload
+
+@pytest.fixture(scope="module")
+def table():
+    return generate_workload(n=1500, rate=0.09, mean_burst=10, priorities=4, seed=3)
+
+def reference(table, algorithm, time_quantum):
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(table)
+    scheduler.set_algorithm(algorithm, time_quantum)
+    return scheduler.run(event_driven=True, fast_forward=True, metrics_only=True)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_compare_matches_scheduler(table, workers):
+    rows = compare_algorithms(table, ALGORITHMS, 4, workers, cache=None)
+    assert [row.pop('algorithm') for row in rows] == list(ALGORITHMS)
+    for algorithm, row in zip(ALGORITHMS, rows):
+        assert row == pytest.approx(reference(table, algorithm, 4))
+
+def test_pool_results_are_cached(table):
+    cache = ResultCache()
+    first = compare_algorithms(table, ALGORITHMS, 4, workers=2, cache=cache)
+    assert (cache.hits, cache.misses) == (0, len(ALGORITHMS))
+    assert compare_algorithms(table, ALGORITHMS, 4, workers=2, cache=cache) == first
+    assert cache.hits == len(ALGORITHMS)
+    
+    # Per-process results written back by the workers are replayed too
+    scheduler = Scheduler(cache=cache)
+    scheduler.set_processes(table)
+    scheduler.set_algorithm("SJF")
+    scheduler.run(metrics_only=True)
+    expected = Scheduler(cache=None)
+    expected.set_processes(table)
+    expected.set_algorithm("SJF")
+    expected.run(metrics_only=True)
+    np.testing.assert_array_equal(scheduler.table.completion_time, expected.table.completion_time)
+
+def test_sweep_matches_scheduler(table):
+    rows = sweep_quantum(table, [1, 3, 8, 20], workers=2, cache=None)
+    assert [row['time_quantum'] for row in rows] == [1, 3, 8, 20]
+    for row in rows:
+        quantum = row.pop('time_quantum')
+        assert row == pytest.approx(reference(table, "Round Robin", quantum))
+
+@pytest.mark.parametrize("points", [1, 3, 4, 8])
+@pytest.mark.parametrize("low, high", [(1, 60), (7, 9), (1, 200)])
+def test_tune_quantum_ends(table, points, low, high):
+    best, rows = tune_quantum(table, "avg_waiting", low, high, points, workers=1, cache=None)
+    quanta = [row['time_quantum'] for row in rows]
+    assert quanta == sorted(set(quanta)) and low <= quanta[0] and quanta[-1] <= high
+    # The best quantum is the best of those evaluated, and they were measured like Scheduler does
+    assert min(rows, key=lambda row: (row['avg_waiting'], -row['time_quantum']))['time_quantum'] == best
+    row = rows[quanta.index(best)]
+    assert row['avg_waiting'] == pytest.approx(reference(table, "Round Robin", best)['avg_waiting'])
+
+def test_unknown_algorithm(table):
+    with pytest.raises(ValueError):
+        compare_algorithms(table, ["Lottery"], cache=None)
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+import baseline
+from scheduler import ALGORITHMS, UNSET, Process, Scheduler
+from synthetic import generate_workload
+
+OPTIONS = [
+    {"event_driven": event_driven, "fast_forward": fast_forward, "compress": compress}
+    for event_driven in (False, True) for fast_forward in (False, True) for compress in (False, True)
+]
+
+@pytest.fixture(scope="module")
+def table():
+    return generate_workload(n=120, rate=0.2, mean_burst=6, priorities=4, seed=3)
+
+def scheduler_for(processes, algorithm):
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(processes)
+    scheduler.set_algorithm(algorithm, 3)
+    return scheduler
+
+def state(table):
+    return table.remaining_time, table.start_time, table.completion_time, table.response_time
+
+@pytest.mark.parametrize("options", OPTIONS)
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_matches_run(table, algorithm, options):
+    expected = scheduler_for(table, algorithm)
+    schedule = expected.run(**options)
+    scheduler = scheduler_for(table, algorithm)
+    slices = list(scheduler.iter_schedule(**options))
+    
+    assert [(s['process'].pid, s['start'], s['end']) for s in slices] == \
+        [(s['process'].pid, s['start'], s['end']) for s in schedule]
+    assert scheduler.context_switches == expected.context_switches
+    for found, wanted in zip(state(scheduler.table), state(expected.table)):
+        np.testing.assert_array_equal(found, wanted)
+
+@pytest.mark.parametrize("options", OPTIONS)
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_early_close_keeps_slices_handed_out(table, algorithm, options):
+    for count in (1, 7, 40):
+        scheduler = scheduler_for(table, algorithm)
+        slices = scheduler.iter_schedule(**options)
+        handed_out = [next(slices) for _ in range(count)]
+        slices.close()
+        
+        # Replay the slices handed out on a fresh copy of the state
+        remaining = table.burst_time.copy()
+        start = np.full(len(table), UNSET)
+        completion = np.full(len(table), UNSET)
+        for slot in handed_out:
+            index = slot['process']._index
+            remaining[index] -= slot['end'] - slot['start']
+            if start[index] == UNSET:
+                start[index] = slot['start']
+            if remaining[index] == 0:
+                completion[index] = slot['end']
+        np.testing.assert_array_equal(scheduler.table.remaining_time, remaining)
+        np.testing.assert_array_equal(scheduler.table.start_time, start)
+        np.testing.assert_array_equal(scheduler.table.completion_time, completion)
+
+def test_early_close_with_compress_does_not_run_ahead():
+    scheduler = scheduler_for([Process(1, 0, 5), Process(2, 0, 3)], "SJF Preemptive")
+    slices = scheduler.iter_schedule(compress=True)
+    slot = next(slices)
+    slices.close()
+    assert (slot['process'].pid, slot['start'], slot['end']) == (2, 0, 3)
+    
+    first, second = scheduler.table
+    assert (first.remaining_time, first.start_time, first.response_time) == (5, None, None)
+    assert (second.remaining_time, second.completion_time) == (0, 3)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_matches_original(table, algorithm):
+    processes = [baseline.Process(index, arrival_time, burst_time, priority)
+                 for index, (arrival_time, burst_time, priority) in enumerate(zip(
+                     table.arrival_time.tolist(), table.burst_time.tolist(), table.priority.tolist()))]
+    original = baseline.Scheduler()
+    original.set_processes(processes)
+    original.set_algorithm(algorithm, 3)
+    expected = [(s['process'].pid, s['start'], s['end']) for s in original.run()]
+    
+    scheduler = scheduler_for(table, algorithm)
+    assert [(s['process']._index, s['start'], s['end']) for s in scheduler.iter_schedule()] == expected
+    np.testing.assert_array_equal(scheduler.table.start_time, [p.start_time for p in original.processes])
+    np.testing.assert_array_equal(scheduler.table.completion_time, [p.completion_time for p in original.processes])
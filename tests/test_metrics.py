@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from metrics import MetricsAccumulator, QuantileSketch
+from scheduler import ALGORITHMS, Scheduler
+from synthetic import generate_workload
+
+QUANTILES = np.linspace(0, 1, 101)
+
+def samples(kind, rng, size=20000):
+    """Non-negative integer samples: heavy-tailed, light-tailed and mostly zero"""
+    if kind == "lognormal":
+        values = rng.lognormal(3, 2, size)
+    elif kind == "pareto":
+        values = rng.pareto(1.2, size) * 10
+    elif kind == "exponential":
+        values = rng.exponential(50, size)
+    else:
+        values = rng.integers(0, 5, size)
+    return np.floor(values).astype(np.int64)
+
+def assert_within(sketch, values, accuracy=0.01):
+    for q in QUANTILES:
+        exact = np.quantile(values, q, method='lower')
+        if exact == 0:
+            assert sketch.quantile(q) == 0, q
+        else:
+            assert abs(sketch.quantile(q) - exact) <= accuracy * exact * (1 + 1e-9), q
+
+@pytest.mark.parametrize("kind", ["lognormal", "pareto", "exponential", "small"])
+def test_sketch_error_bound(kind):
+    values = samples(kind, np.random.default_rng(1))
+    sketch = QuantileSketch()
+    sketch.add(values)
+    assert sketch.count == len(values)
+    assert sketch.max == values.max()
+    assert_within(sketch, values)
+
+def test_sketch_merge_equals_one_pass():
+    rng = np.random.default_rng(2)
+    parts = [samples(kind, rng, 5000) for kind in ("lognormal", "small", "exponential")]
+    merged = QuantileSketch()
+    for part in parts:
+        sketch = QuantileSketch()
+        sketch.add(part)
+        merged.merge(sketch)
+    values = np.concatenate(parts)
+    whole = QuantileSketch()
+    whole.add(values)
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    assert (merged.zero_count, merged.count, merged.max) == (whole.zero_count, whole.count, whole.max)
+    assert_within(merged, values)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_streaming_metrics_match_exact(algorithm):
+    table = generate_workload(n=5000, rate=0.12, mean_burst=8, bursts="pareto", priorities=4, seed=3)
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(table)
+    scheduler.set_algorithm(algorithm, 4)
+    scheduler.run(event_driven=True, fast_forward=True, metrics_only=True)
+    metrics = scheduler.get_metrics(chunk_size=999)
+    
+    results = scheduler.table
+    turnaround = results.completion_time - results.arrival_time
+    waiting = turnaround - results.burst_time
+    response = results.start_time - results.arrival_time
+    for name, values in (("waiting", waiting), ("response", response)):
+        assert metrics[f"max_{name}"] == values.max()
+        for q in (50, 95, 99):
+            exact = np.quantile(values, q / 100, method='lower')
+            assert metrics[f"p{q}_{name}"] == pytest.approx(exact, rel=0.01, abs=1e-9), (name, q)
+            
+    share = results.burst_time / turnaround
+    assert metrics['fairness'] == pytest.approx(share.sum() ** 2 / (len(share) * (share ** 2).sum()))
+    assert metrics['throughput'] == pytest.approx(len(table) / results.completion_time.max())
+
+def test_accumulator_skips_unfinished_processes():
+    accumulator = MetricsAccumulator()
+    accumulator.add(np.array([0, 1, 2]), np.array([4, 2, 3]), np.array([0, 4, -1]), np.array([4, 6, -1]))
+    metrics = accumulator.result()
+    assert metrics['avg_turnaround'] == 4.5
+    assert metrics['avg_response'] == 1.5
+    # The unfinished process still counts as work for the CPU
+    assert metrics['cpu_utilization'] == pytest.approx(9 / 6 * 100)
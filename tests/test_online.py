@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from online import OnlineScheduler
+from scheduler import ALGORITHMS, Process, Scheduler
+from synthetic import generate_workload
+
+def workload(n, seed):
+    table = generate_workload(n=n, rate=0.15, mean_burst=5, priorities=4, seed=seed)
+    return [Process(f"P{i}", int(a), int(b), int(p))
+            for i, (a, b, p) in enumerate(zip(table.arrival_time, table.burst_time, table.priority))]
+
+def reference(processes, algorithm):
+    """Start and completion times from the offline engine"""
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(processes)
+    scheduler.set_algorithm(algorithm, 3)
+    scheduler.run(event_driven=True, fast_forward=True, metrics_only=True)
+    return scheduler.table.start_time, scheduler.table.completion_time
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_matches_scheduler(algorithm):
+    processes = workload(300, seed=1)
+    online = OnlineScheduler(algorithm, 3)
+    for process in processes:
+        online.advance_to(process.arrival_time)
+        online.submit(process)
+    online.run_to_completion()
+    table = online.to_table()
+    start, completion = reference(processes, algorithm)
+    np.testing.assert_array_equal(table.start_time, start)
+    np.testing.assert_array_equal(table.completion_time, completion)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_checkpoint_restore_after_insert_and_remove(algorithm):
+    processes = workload(400, seed=2)
+    # Checkpoint often so edits rewind to a checkpoint well after time 0
+    online = OnlineScheduler(algorithm, 3, checkpoint_interval=8)
+    for process in processes[:300]:
+        online.submit(process)
+    online.advance_to(processes[250].arrival_time)
+    
+    # Edit the past: late additions arriving earlier, and removals
+    extra = [Process(f"X{i}", processes[40 * i + 30].arrival_time, 30 + i, i % 4) for i in range(5)]
+    for process in extra:
+        online.insert(process)
+    online.remove(10)
+    online.remove(120)
+    for process in processes[300:]:
+        online.submit(process)
+    online.run_to_completion()
+    
+    expected = processes[:300] + extra + processes[300:]
+    del expected[10]
+    del expected[120]
+    table = online.to_table()
+    assert list(table.pid) == [p.pid for p in expected]
+    start, completion = reference(expected, algorithm)
+    np.testing.assert_array_equal(table.start_time, start)
+    np.testing.assert_array_equal(table.completion_time, completion)
@@ -0,0 +1,244 @@
+import numpy as np
+import pytest
+
+import baseline
+from scheduler import ALGORITHMS, ColumnarSchedule, Process, ProcessTable, Scheduler
+from synthetic import generate_workload
+
+PREEMPTIVE = ("SJF Preemptive", "Priority Preemptive")
+
+def random_table(seed):
+    """Unsorted arrivals with many ties in arrival, burst and priority"""
+    rng = np.random.default_rng(seed)
+    return ProcessTable(rng.integers(0, 60, 120), rng.integers(1, 9, 120), rng.integers(0, 3, 120))
+
+@pytest.fixture(scope="module", params=["poisson-1", "poisson-2", "ties-1", "ties-2"])
+def table(request):
+    kind, seed = request.param.split("-")
+    if kind == "ties":
+        return random_table(int(seed))
+    return generate_workload(n=150, rate=0.3, mean_burst=5, priorities=4, seed=int(seed))
+
+def original_run(table, algorithm, time_quantum=3):
+    """The original scheduler after running the table, with row numbers as pids"""
+    processes = [baseline.Process(index, arrival_time, burst_time, priority)
+                 for index, (arrival_time, burst_time, priority) in enumerate(zip(
+                     table.arrival_time.tolist(), table.burst_time.tolist(), table.priority.tolist()))]
+    scheduler = baseline.Scheduler()
+    scheduler.set_processes(processes)
+    scheduler.set_algorithm(algorithm, time_quantum)
+    scheduler.run()
+    return scheduler
+
+def original(table, algorithm, time_quantum=3):
+    """Slices as (index, start, end) and the start and completion times from the original engines"""
+    scheduler = original_run(table, algorithm, time_quantum)
+    slices = [(slot['process'].pid, slot['start'], slot['end']) for slot in scheduler.schedule]
+    start = [process.start_time for process in scheduler.processes]
+    completion = [process.completion_time for process in scheduler.processes]
+    return slices, start, completion
+
+def merged(slices):
+    """Adjacent slices of the same process joined into one"""
+    result = []
+    for index, start, end in slices:
+        if result and result[-1][0] == index and result[-1][2] == start:
+            result[-1] = (index, result[-1][1], end)
+        else:
+            result.append((index, start, end))
+    return result
+
+def scheduler_for(table, algorithm, time_quantum=3):
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(table)
+    scheduler.set_algorithm(algorithm, time_quantum)
+    return scheduler
+
+def indexed(schedule):
+    """(index, start, end) of a list-of-dicts schedule"""
+    return [(slot['process']._index, slot['start'], slot['end']) for slot in schedule]
+
+def sliced(schedule):
+    """(index, start, end) of a ColumnarSchedule"""
+    return list(zip(schedule.process_index.tolist(), schedule.start.tolist(), schedule.end.tolist()))
+
+def assert_times(scheduler, start, completion):
+    np.testing.assert_array_equal(scheduler.table.start_time, start)
+    np.testing.assert_array_equal(scheduler.table.completion_time, completion)
+
+@pytest.mark.parametrize("algorithm", PREEMPTIVE)
+def test_time_stepped_preemption_matches_original(table, algorithm):
+    slices, start, completion = original(table, algorithm)
+    scheduler = scheduler_for(table, algorithm)
+    assert indexed(scheduler.run()) == slices
+    assert_times(scheduler, start, completion)
+
+@pytest.mark.parametrize("algorithm", PREEMPTIVE)
+def test_event_driven_preemption_matches_original(table, algorithm):
+    slices, start, completion = original(table, algorithm)
+    scheduler = scheduler_for(table, algorithm)
+    # Each event-driven slice runs until a preemption or completion
+    assert indexed(scheduler.run(event_driven=True)) == merged(slices)
+    assert_times(scheduler, start, completion)
+
+@pytest.mark.parametrize("algorithm", ("SJF", "Priority"))
+def test_non_preemptive_heap_matches_original(table, algorithm):
+    slices, start, completion = original(table, algorithm)
+    scheduler = scheduler_for(table, algorithm)
+    assert indexed(scheduler.run()) == slices
+    assert_times(scheduler, start, completion)
+
+@pytest.mark.parametrize("time_quantum", [1, 2, 5])
+def test_round_robin_matches_original(table, time_quantum):
+    slices, start, completion = original(table, "Round Robin", time_quantum)
+    scheduler = scheduler_for(table, "Round Robin", time_quantum)
+    assert indexed(scheduler.run()) == slices
+    assert_times(scheduler, start, completion)
+
+def assert_fast_forward_matches_original(table, time_quantum):
+    slices, start, completion = original(table, "Round Robin", time_quantum)
+    scheduler = scheduler_for(table, "Round Robin", time_quantum)
+    assert indexed(scheduler.run(fast_forward=True)) == slices
+    assert_times(scheduler, start, completion)
+    assert indexed(scheduler.round_robin(time_quantum, fast_forward=True)) == slices
+    columnar = scheduler.run(fast_forward=True, columnar=True)
+    assert sliced(columnar) == slices
+    assert indexed(scheduler.iter_schedule(fast_forward=True)) == slices
+    assert_times(scheduler, start, completion)
+    
+    scheduler.run(fast_forward=True, metrics_only=True)
+    assert_times(scheduler, start, completion)
+
+@pytest.mark.parametrize("time_quantum", [1, 3])
+def test_round_robin_fast_forward_matches_original(table, time_quantum):
+    assert_fast_forward_matches_original(table, time_quantum)
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("time_quantum", [1, 3])
+def test_round_robin_fast_forward_long_bursts(seed, time_quantum):
+    # Few processes with long bursts, so most of the run is fast-forwarded
+    rng = np.random.default_rng(seed)
+    assert_fast_forward_matches_original(ProcessTable(rng.integers(0, 30, 8), rng.integers(50, 400, 8)), time_quantum)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_compress_merges_original_slices(table, algorithm):
+    slices, start, completion = original(table, algorithm)
+    scheduler = scheduler_for(table, algorithm)
+    full = scheduler.run()
+    switches = scheduler.context_switches
+    expected = merged(slices)
+    assert indexed(Scheduler.compress_schedule(full)) == expected
+    for options in ({}, {"event_driven": True, "fast_forward": True}):
+        assert indexed(scheduler.run(compress=True, **options)) == expected
+        assert scheduler.context_switches == switches
+        columnar = scheduler.run(compress=True, columnar=True, **options)
+        assert sliced(columnar) == expected
+        assert_times(scheduler, start, completion)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_columnar_matches_original(table, algorithm):
+    slices, start, completion = original(table, algorithm)
+    scheduler = scheduler_for(table, algorithm)
+    schedule = scheduler.run(columnar=True)
+    assert sliced(schedule) == slices
+    assert_times(scheduler, start, completion)
+    assert schedule.makespan == max(completion)
+    np.testing.assert_array_equal(schedule.pids[schedule.process_index], table.pid[[s[0] for s in slices]])
+    
+    # Same switches as the list form, and the conversions both ways keep every slice
+    switches = scheduler.context_switches
+    assert indexed(schedule.to_list(scheduler.table)) == slices
+    assert sliced(ColumnarSchedule.from_slices(slices, table.pid)) == slices
+    scheduler.run()
+    assert scheduler.context_switches == switches
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_process_table_matches_original(table, algorithm):
+    slices, start, completion = original(table, algorithm)
+    start, completion = np.array(start), np.array(completion)
+    before = [column.copy() for column in (table.remaining_time, table.start_time, table.completion_time)]
+    scheduler = scheduler_for(table, algorithm)
+    scheduler.run(event_driven=True, fast_forward=True)
+    
+    # The run works on a copy, sharing the workload columns but not the state
+    assert np.shares_memory(scheduler.table.arrival_time, table.arrival_time)
+    for column, saved in zip((table.remaining_time, table.start_time, table.completion_time), before):
+        np.testing.assert_array_equal(column, saved)
+        
+    results = scheduler.table
+    np.testing.assert_array_equal(results.remaining_time, 0)
+    np.testing.assert_array_equal(results.response_time, start - table.arrival_time)
+    views = list(results)
+    assert [view.start_time for view in views] == start.tolist()
+    assert [view.turnaround_time for view in views] == (completion - table.arrival_time).tolist()
+    assert [view.waiting_time for view in views] == (completion - table.arrival_time - table.burst_time).tolist()
+    
+    # A list of Process objects is loaded into a table and gives the same results
+    processes = [Process(view.pid, view.arrival_time, view.burst_time, view.priority) for view in views]
+    from_list = scheduler_for(processes, algorithm)
+    from_list.run()
+    assert_times(from_list, start, completion)
+
+def test_process_views(table):
+    copy = table.copy()
+    first = copy[0]
+    assert not isinstance(first, Process)
+    assert not hasattr(first, '__dict__')
+    # Views are made on demand rather than kept, and compare by row
+    assert first is not copy[0]
+    assert first == copy[0] and first != copy[1] and first != table[0]
+    assert len({first, copy[0], copy[1]}) == 2
+    
+    first.start_time = 7
+    assert copy.start_time[0] == 7 and copy[0].start_time == 7
+    first.reset()
+    assert copy[0].start_time is None and copy.remaining_time[0] == copy.burst_time[0]
+    assert copy[-1] == copy[len(copy) - 1]
+    with pytest.raises(IndexError):
+        copy[len(copy)]
+
+def test_vectorized_fcfs_matches_original(table):
+    slices, start, completion = original(table, "FCFS")
+    scheduler = scheduler_for(table, "FCFS")
+    assert sliced(scheduler.run(columnar=True)) == slices
+    assert_times(scheduler, start, completion)
+    scheduler.run(metrics_only=True)
+    assert_times(scheduler, start, completion)
+    np.testing.assert_array_equal(scheduler.table.remaining_time, 0)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_metrics_match_original(table, algorithm):
+    scheduler = scheduler_for(table, algorithm)
+    scheduler.run(columnar=True)
+    metrics = scheduler.get_metrics()
+    for name, value in original_run(table, algorithm).get_metrics().items():
+        assert metrics[name] == pytest.approx(value), name
+    # Reading the table in small chunks gives the same figures
+    assert scheduler.get_metrics(chunk_size=7) == pytest.approx(metrics)
+
+def switches(slices):
+    return sum(1 for previous, current in zip(slices, slices[1:]) if previous[0] != current[0])
+
+@pytest.mark.parametrize("options", [{}, {"event_driven": True, "fast_forward": True}])
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_metrics_only_matches_full_run(table, algorithm, options):
+    slices, start, completion = original(table, algorithm)
+    scheduler = scheduler_for(table, algorithm)
+    scheduler.run(**options)
+    expected = scheduler.get_metrics()
+    assert expected['context_switches'] == switches(slices)
+    
+    metrics = scheduler.run(metrics_only=True, **options)
+    assert scheduler.schedule == []
+    assert metrics == expected
+    assert_times(scheduler, start, completion)
+
+@pytest.mark.parametrize("time_quantum", [1, 4])
+def test_metrics_only_counts_switches_in_fast_forwarded_rounds(time_quantum):
+    # A lone process runs whole blocks of rounds with no switch, then a few share the CPU
+    table = ProcessTable([0, 500, 500, 520, 2000], [300, 120, 200, 90, 50])
+    slices, start, completion = original(table, "Round Robin", time_quantum)
+    scheduler = scheduler_for(table, "Round Robin", time_quantum)
+    scheduler.run(fast_forward=True, metrics_only=True)
+    assert scheduler.context_switches == switches(slices)
+    assert_times(scheduler, start, completion)
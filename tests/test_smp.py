@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from scheduler import ALGORITHMS, Scheduler
+from smp import MulticoreScheduler
+from synthetic import generate_workload
+
+@pytest.fixture(scope="module")
+def table():
+    return generate_workload(n=600, rate=0.12, mean_burst=8, priorities=4, seed=11)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("balance_interval", [None, 50])
+def test_single_core_matches_scheduler(table, algorithm, balance_interval):
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(table)
+    scheduler.set_algorithm(algorithm, 3)
+    expected = scheduler.run(event_driven=True, fast_forward=True, compress=True, columnar=True)
+    
+    multicore = MulticoreScheduler(algorithm, 1, 3, balance_interval=balance_interval)
+    multicore.set_processes(table)
+    schedule = multicore.run().compress()
+    np.testing.assert_array_equal(schedule.process_index, expected.process_index)
+    np.testing.assert_array_equal(schedule.start, expected.start)
+    np.testing.assert_array_equal(schedule.end, expected.end)
+    
+    metrics = multicore.get_metrics()
+    for name, value in scheduler.get_metrics().items():
+        assert metrics[name] == pytest.approx(value), name
+    assert metrics['migrations'] == 0
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_cores_never_overlap(table, algorithm):
+    affinity = np.where(np.arange(len(table)) % 5 == 0, 2, -1)
+    multicore = MulticoreScheduler(algorithm, 4, 3, balance_interval=20)
+    multicore.set_processes(table, affinity)
+    schedule = multicore.run()
+    
+    # Every process gets exactly its burst, and no core runs two slices at once
+    served = np.bincount(schedule.process_index, schedule.end - schedule.start, minlength=len(table))
+    np.testing.assert_array_equal(served, table.burst_time)
+    for core in range(4):
+        on_core = schedule.core == core
+        starts, ends = schedule.start[on_core], schedule.end[on_core]
+        assert np.all(starts[1:] >= ends[:-1])
+    pinned = np.isin(schedule.process_index, np.flatnonzero(affinity == 2))
+    assert np.all(schedule.core[pinned] == 2)
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from workload import read_workload
+
+def test_reads_json_lines(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text('{"pid": "A", "arrival": 0, "burst": 3}\n\n{"arrival": 2, "burst": 1, "priority": 4}\n')
+    table = read_workload(str(path))
+    assert table.pid.tolist() == ["A", 2]
+    np.testing.assert_array_equal(table.arrival_time, [0, 2])
+    np.testing.assert_array_equal(table.burst_time, [3, 1])
+    np.testing.assert_array_equal(table.priority, [0, 4])
+
+@pytest.mark.parametrize("line", ["[1, 2]", "3", '"text"', "null"])
+def test_json_line_that_is_not_an_object(tmp_path, line):
+    path = tmp_path / "trace.jsonl"
+    path.write_text('{"arrival": 0, "burst": 3}\n\n' + line + "\n")
+    with pytest.raises(ValueError, match="line 3"):
+        read_workload(str(path))
@@ -0,0 +1,102 @@
+"""Retrain the algorithm recommender model bundled as model.npz.
+
+    python train_model.py --workloads 3000 --seed 0
+
+Random synthetic workloads are labelled with the algorithm that does best on
+each objective when simulated, and one decision tree per objective is fitted
+on their features (see model.py). A fifth of the workloads is held out to
+report accuracy and regret, then the trees are refitted on all of them.
+"""
+import argparse
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from compare import HIGHER_IS_BETTER
+from model import FEATURES, MODEL_PATH, DecisionTree, RecommenderModel, extract_features
+from scheduler import ALGORITHMS, Scheduler
+from synthetic import ARRIVAL_MODELS, BURST_MODELS, generate_workload
+
+# Objectives with a tree of their own (see model.ALIASES for the others)
+OBJECTIVES = ("avg_waiting", "avg_response", "p99_waiting", "p99_response", "fairness")
+
+def sample_workload(seed):
+    """Draw workload settings covering light to overloaded systems, then the workload itself"""
+    rng = np.random.default_rng(seed)
+    mean_burst = math.exp(rng.uniform(math.log(2), math.log(100)))
+    settings = {
+        'n': int(math.exp(rng.uniform(math.log(200), math.log(4000)))),
+        'arrivals': ARRIVAL_MODELS[rng.integers(len(ARRIVAL_MODELS))],
+        'rate': rng.uniform(0.3, 1.3) / mean_burst,
+        'burstiness': math.exp(rng.uniform(0, math.log(50))),
+        'bursts': BURST_MODELS[rng.integers(len(BURST_MODELS))],
+        'mean_burst': mean_burst,
+        'pareto_shape': rng.uniform(1.2, 3.0),
+        'lognormal_sigma': rng.uniform(0.2, 2.0),
+        'priorities': int(rng.integers(1, 11)),
+        'zipf_exponent': rng.uniform(0, 2)
+    }
+    time_quantum = max(int(round(math.exp(rng.uniform(0, math.log(4 * mean_burst))))), 1)
+    return generate_workload(seed=rng, **settings), time_quantum
+
+def label(seed):
+    """Features of one random workload and each algorithm's value of every objective"""
+    table, time_quantum = sample_workload(seed)
+    scheduler = Scheduler(cache=None)
+    scheduler.set_processes(table)
+    values = np.empty((len(ALGORITHMS), len(OBJECTIVES) + 1))
+    for row, algorithm in enumerate(ALGORITHMS):
+        scheduler.set_algorithm(algorithm, time_quantum)
+        metrics = scheduler.run(event_driven=True, fast_forward=True, metrics_only=True)
+        values[row] = [metrics[name] for name in OBJECTIVES] + [metrics['context_switches']]
+    return extract_features(table, time_quantum), values
+
+def best(values, column):
+    """Index of the best algorithm on one objective, ties going to fewer context switches"""
+    sign = -1 if OBJECTIVES[column] in HIGHER_IS_BETTER else 1
+    return min(range(len(ALGORITHMS)), key=lambda k: (sign * values[k, column], values[k, -1]))
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workloads", type=int, default=3000, help="number of labelled workloads")
+    parser.add_argument("--max-depth", type=int, default=8)
+    parser.add_argument("--min-leaf", type=int, default=10, help="fewest workloads in a leaf")
+    parser.add_argument("--workers", type=int, default=None, help="parallel processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=MODEL_PATH)
+    args = parser.parse_args(argv)
+    
+    seeds = np.random.SeedSequence(args.seed).spawn(args.workloads)
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            samples = list(pool.map(label, seeds, chunksize=16))
+    else:
+        samples = [label(seed) for seed in seeds]
+    X = np.array([features for features, _ in samples])
+    values = np.array([found for _, found in samples])
+    
+    held_out = np.arange(len(X)) % 5 == 0
+    trees = {}
+    for column, objective in enumerate(OBJECTIVES):
+        y = np.array([best(found, column) for found in values])
+        tree = DecisionTree.fit(X[~held_out], y[~held_out], len(ALGORITHMS), args.max_depth, args.min_leaf)
+        # Regret: how much worse the predicted algorithm is than the best one, relative to the best
+        predicted = tree.predict(X[held_out])
+        chosen = values[held_out, predicted, column]
+        ideal = values[held_out, y[held_out], column]
+        regret = np.abs(chosen - ideal) / np.maximum(np.abs(ideal), 1e-9)
+        print(f"{objective:14} accuracy {np.mean(predicted == y[held_out]):.1%}  "
+              f"mean regret {regret.mean():.2%}  worst {regret.max():.1%}  "
+              f"classes {np.bincount(y, minlength=len(ALGORITHMS)).tolist()}")
+        trees[objective] = DecisionTree.fit(X, y, len(ALGORITHMS), args.max_depth, args.min_leaf)
+        
+    RecommenderModel(trees).save(args.output)
+    print(f"Wrote {args.output} ({len(X)} workloads, features: {', '.join(FEATURES)})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
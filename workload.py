@@ -0,0 +1,280 @@
+import csv
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from itertools import islice
+
+import numpy as np
+
+from scheduler import UNSET, ColumnarSchedule, ProcessTable
+
+# Binary workload file layout (all little-endian):
+#
+#   offset  size  field
+#        0     8  magic b"CPUWKLD\0"
+#        8     4  format version (uint32)
+#       12     4  header size in bytes (uint32), where the columns start
+#       16     8  number of processes n (uint64)
+#       24    64  SHA-256 of the columns as hex, i.e. ProcessTable.digest()
+#       88    40  reserved, zero
+#      128        arrival_time, burst_time, priority, pid: n int64 each, in that order
+MAGIC = b"CPUWKLD\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQ64s40x")
+COLUMNS = ("arrival_time", "burst_time", "priority", "pid")
+
+def save_workload(path: str, table: ProcessTable):
+    """Write a ProcessTable's workload columns as a binary workload file"""
+    if table.pid.dtype == object:
+        raise ValueError("Binary workload files need integer pids")
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, HEADER.size, len(table), table.digest().encode()))
+        for name in COLUMNS:
+            np.ascontiguousarray(getattr(table, name), dtype="<i8").tofile(file)
+
+def read_header(path: str):
+    """Return (number of processes, header size, digest) of a binary workload file"""
+    with open(path, "rb") as file:
+        raw = file.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path} is too short to be a workload file")
+    magic, version, header_size, count, digest = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a workload file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported workload file version {version}")
+    return count, header_size, digest.decode()
+
+def load_workload(path: str, mode: str = "r") -> ProcessTable:
+    """Open a binary workload file as a ProcessTable without reading it.
+    
+    The workload columns are np.memmap views onto the file, so only the run
+    state arrays are allocated and pages are read as the simulation touches
+    them (the simulation itself still needs memory of its own, see
+    ProcessTable). The digest stored in the header is reused as the table's cache key.
+    `mode` is passed to np.memmap ("r" for read-only, "c" for copy-on-write).
+    """
+    count, offset, digest = read_header(path)
+    columns = []
+    for _ in COLUMNS:
+        columns.append(np.memmap(path, dtype="<i8", mode=mode, offset=offset, shape=(count,)))
+        offset += 8 * count
+    table = ProcessTable(*columns)
+    table._digest = digest
+    return table
+
+# Processes parsed per batch by the text readers
+BATCH_SIZE = 1 << 16
+
+# Field names accepted in CSV headers and JSON objects
+FIELD_NAMES = {
+    "pid": "pid",
+    "arrival": "arrival_time",
+    "arrival_time": "arrival_time",
+    "burst": "burst_time",
+    "burst_time": "burst_time",
+    "priority": "priority"
+}
+
+def _is_json_lines(path):
+    return path.lower().endswith((".jsonl", ".ndjson"))
+
+def _records(path):
+    """Yield each process of a CSV or JSON Lines file as a dict of raw values"""
+    with open(path, newline="") as file:
+        if _is_json_lines(path):
+            rows = _json_objects(file, path)
+        else:
+            rows = csv.DictReader(file)
+        for row in rows:
+            yield {FIELD_NAMES[key.strip().lower()]: value for key, value in row.items()
+                   if key is not None and key.strip().lower() in FIELD_NAMES}
+
+def _json_objects(file, path):
+    """Parse each non-blank line of a JSON Lines file, which must hold an object"""
+    for number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError(f"{path}: line {number} holds a {type(row).__name__}, not a JSON object")
+        yield row
+
+def _pid(value):
+    """Numeric pids become ints, anything else stays as it is"""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return value.strip()
+    return value
+
+def iter_batches(path: str, batch_size: int = BATCH_SIZE):
+    """Parse a CSV or JSON Lines workload in batches of `batch_size` processes.
+    
+    Yields (pids, arrival_time, burst_time, priority) with the pids as a list
+    and the rest as int64 arrays, so memory is bounded by the batch size.
+    Missing priorities default to 0 and missing pids to the row number.
+    """
+    records = _records(path)
+    first = 0
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        arrival = np.empty(len(batch), dtype=np.int64)
+        burst = np.empty(len(batch), dtype=np.int64)
+        priority = np.zeros(len(batch), dtype=np.int64)
+        pids = []
+        for offset, record in enumerate(batch):
+            try:
+                arrival[offset] = int(record["arrival_time"])
+                burst[offset] = int(record["burst_time"])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"{path}: process {first + offset + 1} needs integer "
+                                 f"arrival_time and burst_time") from None
+            if record.get("priority") not in (None, ""):
+                priority[offset] = int(record["priority"])
+            pid = record.get("pid")
+            pids.append(first + offset + 1 if pid in (None, "") else _pid(pid))
+        first += len(batch)
+        yield pids, arrival, burst, priority
+
+def read_workload(path: str, batch_size: int = BATCH_SIZE) -> ProcessTable:
+    """Load a CSV, JSON Lines or binary (.cpuw) workload into a ProcessTable"""
+    if not path.lower().endswith((".csv", ".jsonl", ".ndjson")):
+        return load_workload(path)
+    arrival, burst, priority = array('q'), array('q'), array('q')
+    # Integer pids are packed too; the first other pid switches to a list
+    pids = array('q')
+    for batch_pids, batch_arrival, batch_burst, batch_priority in iter_batches(path, batch_size):
+        arrival.frombytes(batch_arrival.tobytes())
+        burst.frombytes(batch_burst.tobytes())
+        priority.frombytes(batch_priority.tobytes())
+        if isinstance(pids, array) and not all(isinstance(pid, int) for pid in batch_pids):
+            pids = pids.tolist()
+        pids.extend(batch_pids)
+    if isinstance(pids, array):
+        pids = np.frombuffer(pids, dtype=np.int64)
+    return ProcessTable(
+        np.frombuffer(arrival, dtype=np.int64),
+        np.frombuffer(burst, dtype=np.int64),
+        np.frombuffer(priority, dtype=np.int64),
+        pids
+    )
+
+def convert_workload(source: str, destination: str, batch_size: int = BATCH_SIZE) -> int:
+    """Stream a CSV or JSON Lines workload into a binary workload file.
+    
+    Each column is spooled to its own temporary file and then appended to the
+    destination, so memory stays bounded by the batch size however large the
+    workload is. Returns the number of processes.
+    """
+    directory = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(destination)))
+    spools = []
+    try:
+        for name in COLUMNS:
+            spools.append(open(os.path.join(directory, name), "w+b"))
+        count = 0
+        for pids, arrival, burst, priority in iter_batches(source, batch_size):
+            if not all(isinstance(pid, int) for pid in pids):
+                raise ValueError("Binary workload files need integer pids")
+            columns = (arrival, burst, priority, np.array(pids, dtype=np.int64))
+            for spool, column in zip(spools, columns):
+                column.astype("<i8", copy=False).tofile(spool)
+            count += len(pids)
+            
+        # Same hash as ProcessTable.digest(), fed from the spooled columns
+        digest = hashlib.sha256(str(count).encode())
+        for spool in spools:
+            spool.seek(0)
+            for chunk in iter(lambda: spool.read(1 << 20), b""):
+                digest.update(chunk)
+        with open(destination, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, HEADER.size, count, digest.hexdigest().encode()))
+            for spool in spools:
+                spool.seek(0)
+                shutil.copyfileobj(spool, file, 1 << 20)
+        return count
+    finally:
+        for spool in spools:
+            spool.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+class _RowWriter:
+    """Writes rows (lists) as CSV with a header line, or as JSON Lines objects"""
+    
+    def __init__(self, path, fields):
+        self.fields = fields
+        self.json_lines = _is_json_lines(path)
+        self.file = open(path, "w", newline="")
+        if not self.json_lines:
+            self.csv = csv.writer(self.file)
+            self.csv.writerow(fields)
+            
+    def write(self, rows):
+        if self.json_lines:
+            self.file.writelines(json.dumps(dict(zip(self.fields, row))) + "\n" for row in rows)
+        else:
+            # None (a time that never happened) is written as an empty cell
+            self.csv.writerows(rows)
+            
+    def close(self):
+        self.file.close()
+
+def _optional(values, present):
+    """List of values with None where `present` is False"""
+    return [value if keep else None for value, keep in zip(values.tolist(), present.tolist())]
+
+def export_results(path: str, table: ProcessTable, chunk_size: int = BATCH_SIZE):
+    """Write per-process results of the last run as CSV or JSON Lines"""
+    writer = _RowWriter(path, ["pid", "arrival_time", "burst_time", "priority", "start_time",
+                               "completion_time", "turnaround_time", "waiting_time", "response_time"])
+    try:
+        for lo in range(0, len(table), chunk_size):
+            hi = lo + chunk_size
+            arrival, burst = table.arrival_time[lo:hi], table.burst_time[lo:hi]
+            start, completion = table.start_time[lo:hi], table.completion_time[lo:hi]
+            started, done = start != UNSET, completion != UNSET
+            turnaround = completion - arrival
+            writer.write(zip(
+                table.pid[lo:hi].tolist(),
+                arrival.tolist(),
+                burst.tolist(),
+                table.priority[lo:hi].tolist(),
+                _optional(start, started),
+                _optional(completion, done),
+                _optional(turnaround, done),
+                _optional(turnaround - burst, done),
+                _optional(start - arrival, started)
+            ))
+    finally:
+        writer.close()
+
+def export_schedule(path: str, schedule, chunk_size: int = BATCH_SIZE):
+    """Write a schedule (ColumnarSchedule or list of dicts) as CSV or JSON Lines.
+    
+    Multicore schedules get a fourth column with the core of each slice.
+    """
+    lanes = getattr(schedule, 'core', None)
+    writer = _RowWriter(path, ["pid", "start", "end"] + ([] if lanes is None else ["core"]))
+    try:
+        if isinstance(schedule, ColumnarSchedule):
+            pids = schedule.pids
+            if not isinstance(pids, np.ndarray):
+                pids = np.array(pids, dtype=object)
+            for lo in range(0, len(schedule), chunk_size):
+                hi = lo + chunk_size
+                columns = [pids[schedule.process_index[lo:hi]].tolist(),
+                           schedule.start[lo:hi].tolist(), schedule.end[lo:hi].tolist()]
+                if lanes is not None:
+                    columns.append(lanes[lo:hi].tolist())
+                writer.write(zip(*columns))
+        else:
+            writer.write([slot['process'].pid, slot['start'], slot['end']] for slot in schedule)
+    finally:
+        writer.close()